@@ -1,6 +1,29 @@
-from src.app import create_app
+import os
+import sys
+from src.utils.startup_profiler import StartupProfiler
 
-application = create_app()
+# --profile-startup [report.json] → profile cold start, print report, exit
+# PROFILE_STARTUP=report.json → same report, but keep serving (gunicorn)
+PROFILE_FLAG = '--profile-startup'
+profile_only = PROFILE_FLAG in sys.argv
+profile_path = os.environ.get('PROFILE_STARTUP')
+if profile_only:
+    nxt = sys.argv[sys.argv.index(PROFILE_FLAG) + 1:][:1]
+    profile_path = nxt[0] if nxt and not nxt[0].startswith('-') else 'startup_profile.json'
+
+profiler = StartupProfiler(enabled=bool(profile_path)).start()
+with profiler.phase('import_app'):
+    from src.app import create_app
+
+application = create_app(profiler=profiler)
+
+if profiler.enabled:
+    profiler.stop()
+    profiler.write_report(profile_path)
 
 if __name__ == "__main__":
+    if profile_only:
+        print(profiler.format_report())
+        print(f"\nreport written to {profile_path}")
+        sys.exit(0)
     application.run()
@@ -0,0 +1,25 @@
+"""gunicorn settings picked up automatically from the working directory (`gunicorn application:application`).
+
+Only the metrics / live-event plumbing lives here -- bind / workers still come from the command line or GUNICORN_CMD_ARGS.
+"""
+import os
+import shutil
+import tempfile
+
+# every worker writes its prometheus samples here; /metrics merges them | must be set before the app is imported
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'banking-prometheus'))
+# live events committed in one worker must reach SSE streams held by the others
+os.environ.setdefault('EVENT_BROKER', 'sqlite')
+
+
+def on_starting(server): # stale files from a previous run would be merged in as if still alive
+    path = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+    # an SSE stream holds a worker thread for minutes → at most half the threads (sync workers: none)
+    os.environ.setdefault('EVENT_MAX_STREAMS', str(server.cfg.threads // 2))
+
+
+def child_exit(server, worker): # drop the dead worker's live gauges (pool checked-out, bcrypt in flight)
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
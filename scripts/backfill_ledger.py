@@ -0,0 +1,26 @@
+"""Write ledger_entries for transactions posted before the ledger existed -- run once after upgrading.
+
+usage: python scripts/backfill_ledger.py [--chunk-size 1000]
+
+Safe to re-run: legs that already have an entry are skipped.
+"""
+import os, sys, json, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.LedgerManager import LedgerManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chunk-size', type=int, default=None, help='accounts per db transaction (default: LEDGER_BACKFILL_CHUNK_SIZE or 1000)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        res = LedgerManager(chunk_size=args.chunk_size).backfill()
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Transfers/sec on SQLite -- default journaling vs SQLITE_PRODUCTION_MODE.
+
+usage: python scripts/bench_sqlite_transfers.py [--threads 8] [--seconds 10] [--accounts 50] [--with-hash-store]
+
+Each mode gets a fresh sqlite file; worker threads run AccountManager.transfer between random
+accounts (each thread in its own app context, like threaded gunicorn workers). The JSON hash
+store is stubbed out unless --with-hash-store, so the numbers measure the database path only.
+"""
+import os, sys, json, time, random, argparse, tempfile, threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import logging
+logging.disable(logging.WARNING)
+
+import src.managers.AccountManager as account_manager_mod
+from src.app import create_app
+from src.models import db, User, Account
+
+
+def seed(app, n_accounts):
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        accs = [Account(user_id=user.user_id, account_type='Checking', balance=1_000_000) for _ in range(n_accounts)]
+        db.session.add_all(accs)
+        db.session.commit()
+        return [a.account_id for a in accs]
+
+
+def run_mode(tuned, args):
+    tmp = tempfile.mkdtemp(prefix='bench_sqlite_')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ['SQLITE_PRODUCTION_MODE'] = '1' if tuned else '0'
+    app = create_app()
+    app.config.update(TESTING=True, DATA_FOLDER=tmp)
+    acc_ids = seed(app, args.accounts)
+
+    ok, errors, samples = [0], {}, []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def worker(seed_):
+        rnd = random.Random(seed_)
+        manager = account_manager_mod.AccountManager()
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                src, dst = rnd.sample(acc_ids, 2)
+                t0 = time.perf_counter()
+                try:
+                    manager.transfer(src, dst, 1.0, 'bench')
+                    with lock: ok[0] += 1; samples.append(time.perf_counter() - t0)
+                except Exception as e:
+                    key = str(e).splitlines()[0][:80]
+                    with lock: errors[key] = errors.get(key, 0) + 1
+                finally:
+                    db.session.remove()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    started = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        for engine in db.engines.values(): engine.dispose()
+    samples.sort()
+    pct = lambda p: round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2) if samples else None
+    return {
+        'mode': 'production' if tuned else 'default',
+        'threads': args.threads,
+        'transfers': ok[0],
+        'transfers_per_sec': round(ok[0] / elapsed, 1),
+        'p50_ms': pct(0.50),
+        'p95_ms': pct(0.95),
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--accounts', type=int, default=50)
+    parser.add_argument('--with-hash-store', action='store_true')
+    args = parser.parse_args()
+    if not args.with_hash_store: account_manager_mod.record_transaction_hash = lambda *a, **k: True
+
+    results = [run_mode(False, args), run_mode(True, args)]
+    before, after = results
+    print(json.dumps({
+        'results': results,
+        'speedup': round(after['transfers_per_sec'] / before['transfers_per_sec'], 2) if before['transfers_per_sec'] else None,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Fingerprint the SPA assets -- run as part of the build / deploy step, before precompress_static.py.
+
+usage: python scripts/build_static.py [--clean]
+
+Copies static/js/*.js, static/js/components/*.js and static/css/style.css to static/build/ under
+content-hashed names (js/app.js → js/app.<hash>.js), writes build/index.html with its references
+rewritten, and lists everything in build/manifest.json. The app loads the manifest at startup and
+serves the hashed files with `Cache-Control: public, max-age=31536000, immutable`. A changed file gets a
+new name, so browsers never need to revalidate. Without a build, static/ is served as-is.
+"""
+import os, sys, re, json, glob, shutil, hashlib, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.static_assets import BUILD_DIR, MANIFEST
+
+STATIC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
+PATTERNS = ('js/*.js', 'js/components/*.js', 'css/style.css')
+
+
+def fingerprint(rel, data):
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clean', action='store_true', help='remove static/build and serve the sources again')
+    args = parser.parse_args()
+
+    out = os.path.join(STATIC, BUILD_DIR)
+    if args.clean:
+        shutil.rmtree(out, ignore_errors=True)
+        print(json.dumps({'cleaned': out}, indent=2))
+        return
+
+    tmp = out + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    assets = {}
+    for pattern in PATTERNS:
+        for path in sorted(glob.glob(os.path.join(STATIC, pattern))):
+            rel = os.path.relpath(path, STATIC).replace(os.sep, '/')
+            with open(path, 'rb') as f: data = f.read()
+            assets[rel] = fingerprint(rel, data)
+            os.makedirs(os.path.dirname(os.path.join(tmp, assets[rel])), exist_ok=True)
+            with open(os.path.join(tmp, assets[rel]), 'wb') as f: f.write(data)
+
+    with open(os.path.join(STATIC, 'index.html')) as f: html = f.read()
+    refs = re.compile(r'''((?:src|href)=["'])/?(%s)(["'])''' % '|'.join(re.escape(rr) for rr in sorted(assets, key=len, reverse=True)))
+    html, rewritten = refs.subn(lambda m: f"{m.group(1)}{assets[m.group(2)]}{m.group(3)}", html)
+    with open(os.path.join(tmp, 'index.html'), 'w') as f: f.write(html)
+    with open(os.path.join(tmp, MANIFEST), 'w') as f: json.dump({'index': 'index.html', 'assets': assets}, f, indent=2)
+
+    shutil.rmtree(out, ignore_errors=True)
+    os.replace(tmp, out) # a running app keeps its loaded manifest until restart
+    print(json.dumps({'assets': assets, 'references_rewritten': rewritten, 'out': out}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Write monthly account statements -- run from cron / a scheduled task early on the 1st (UTC).
+
+usage: python scripts/generate_statements.py [--period YYYY-MM] [--workers N] [--chunk-size 500] [--regenerate]
+
+Files land in data/statements/<period>/<account_id>.json. An interrupted run resumes from its cursor.
+"""
+import os, sys, json, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.StatementManager import StatementManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--period', default=None, help='YYYY-MM (default: last full month)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: STATEMENT_WORKERS or cpu count)')
+    parser.add_argument('--chunk-size', type=int, default=None, help='accounts per worker task')
+    parser.add_argument('--regenerate', action='store_true', help='rewrite a period that already completed')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        res = StatementManager(workers=args.workers, chunk_size=args.chunk_size).generate(args.period, regenerate=args.regenerate)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""Load test -- seed a throwaway database, serve it with gunicorn and drive a request mix at fixed concurrency.
+
+usage: python scripts/load_test.py [--users 50] [--accounts-per-user 2] [--transactions 20000]
+                                   [--concurrency 16] [--seconds 30] [--workers 4] [--threads 1]
+                                   [--mix login=1,list=4,dashboard=4,deposit=3,transfer=3,multi_transfer=1,loan_payment=1]
+                                   [--seed 42] [--out load_report.json]
+
+Every op is a real HTTP call against `gunicorn application:application` (gunicorn.conf.py included), on a
+fresh sqlite file in SQLITE_PRODUCTION_MODE unless --database-url is given. The report has throughput,
+p50/p95/p99 latency and the mean X-Query-Count per op. Same --seed + same args → same data and op sequence,
+so runs are comparable across commits.
+"""
+import os, sys, json, time, random, argparse, tempfile, threading, subprocess, socket, shutil
+from datetime import datetime, timedelta
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import logging
+logging.disable(logging.WARNING)
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PASSWORD = 'loadtest123'
+DEFAULT_MIX = 'login=1,list=4,dashboard=4,deposit=3,transfer=3,multi_transfer=1,loan_payment=1'
+
+
+def seed(args, env):
+    """ users / accounts / history / one active loan per user -- bulk inserts, one bcrypt hash for everybody """
+    os.environ.update(env)
+    from sqlalchemy import insert
+    from src.app import create_app
+    from src.models import db, User, Account, Transaction, LedgerEntry, Loan
+
+    rnd = random.Random(args.seed)
+    app = create_app()
+    with app.app_context():
+        pw_hash = User('x', PASSWORD, 'x', 'x').password
+        now = datetime.utcnow()
+        users, accounts, txs, entries, loans = [], [], [], [], []
+        for u in range(args.users):
+            uid = f"load-user-{u:05d}"
+            users.append({'user_id': uid, 'username': f"load{u}", 'password': pw_hash, 'email': f"load{u}@example.com", 'full_name': f"Load User {u}", 'role': 'user', 'created_at': now})
+            own = []
+            for a in range(args.accounts_per_user):
+                acc_id = f"load-acc-{u:05d}-{a:02d}"
+                own.append(acc_id)
+                accounts.append({'account_id': acc_id, 'user_id': uid, 'account_number': f"{9 * 10**9 + u * 100 + a:010d}", 'account_type': 'Checking' if a == 0 else 'Savings',
+                                 'balance': 0.0, 'created_at': now - timedelta(days=120), 'active': True})
+            loans.append({'loan_id': f"load-loan-{u:05d}", 'user_id': uid, 'loan_type': 'Personal', 'amount': 1_000_000, 'interest_rate': 5, 'term_months': 60,
+                          'status': 'active', 'created_at': now - timedelta(days=100), 'approved_at': now - timedelta(days=99), 'balance': 1_000_000})
+
+        # history -- one large opening deposit per account, then random deposits spread over 90 days
+        history = [(acc['account_id'], 1_000_000.0, acc['created_at']) for acc in accounts]
+        history += [(rnd.choice(accounts)['account_id'], round(rnd.uniform(1, 500), 2), now - timedelta(seconds=rnd.randint(60, 90 * 86400))) for _ in range(args.transactions)]
+        balances = {}
+        for i, (acc_id, amount, at) in enumerate(sorted(history, key=lambda hh: hh[2])):
+            tx_id = f"load-tx-{i:08d}"
+            balances[acc_id] = round(balances.get(acc_id, 0.0) + amount, 2)
+            txs.append({'transaction_id': tx_id, 'account_id': acc_id, 'transaction_type': 'deposit', 'amount': amount, 'description': 'seed deposit', 'destination_account_id': None, 'created_at': at})
+            entries.append({'account_id': acc_id, 'transaction_id': tx_id, 'entry_type': 'deposit', 'amount': amount, 'balance_after': balances[acc_id], 'created_at': at})
+        for acc in accounts: acc['balance'] = balances[acc['account_id']]
+
+        for model, rows in ((User, users), (Account, accounts), (Loan, loans), (Transaction, txs), (LedgerEntry, entries)):
+            for i in range(0, len(rows), 5000): db.session.execute(insert(model), rows[i:i + 5000])
+        db.session.commit()
+        for engine in db.engines.values(): engine.dispose()
+    return [{'username': uu['username'], 'accounts': [aa['account_id'] for aa in accounts if aa['user_id'] == uu['user_id']], 'loan_id': f"load-loan-{u:05d}"} for u, uu in enumerate(users)]
+
+
+def free_port():
+    with socket.socket() as ss:
+        ss.bind(('127.0.0.1', 0))
+        return ss.getsockname()[1]
+
+
+def start_server(args, env, port):
+    cmd = [sys.executable, '-m', 'gunicorn', '-w', str(args.workers), '--threads', str(args.threads), '-b', f"127.0.0.1:{port}", '--log-level', 'warning', 'application:application']
+    proc = subprocess.Popen(cmd, cwd=ROOT, env={**os.environ, **env})
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).ok: return proc
+        except requests.RequestException: pass
+        if proc.poll() is not None: raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("gunicorn did not become healthy within 60s")
+
+
+class VirtualUser:
+    """ one logged-in client per driver thread -- request(op) sends one op of the mix """
+
+    def __init__(self, base, user, everyone, rnd):
+        self.base, self.user, self.everyone, self.rnd = base, user, everyone, rnd
+        self.http = requests.Session()
+        self.login()
+
+    def login(self):
+        resp = self.http.post(f"{self.base}/api/v1/users/login", json={'username': self.user['username'], 'password': PASSWORD})
+        if resp.ok: self.http.headers['Authorization'] = f"Bearer {resp.json()['token']}"
+        return resp
+
+    def other(self, account_id): # random destination that isn't the source
+        while True:
+            acc = self.rnd.choice(self.everyone)
+            if acc != account_id: return acc
+
+    def request(self, op):
+        rnd, own = self.rnd, self.user['accounts']
+        if op == 'login': return self.login()
+        if op == 'list': return self.http.get(f"{self.base}/api/v1/accounts/user/transactions")
+        if op == 'dashboard': return self.http.get(f"{self.base}/api/v1/dashboard/summary")
+        if op == 'deposit': return self.http.post(f"{self.base}/api/v1/accounts/{rnd.choice(own)}/deposit", json={'amount': round(rnd.uniform(1, 100), 2)})
+        if op == 'transfer':
+            src = rnd.choice(own)
+            return self.http.post(f"{self.base}/api/v1/accounts/transfer", json={'from_account_id': src, 'to_account_id': self.other(src), 'amount': round(rnd.uniform(1, 20), 2)})
+        if op == 'multi_transfer':
+            src = rnd.choice(own)
+            transfers = [{'to_account_id': self.other(src), 'amount': round(rnd.uniform(1, 10), 2)} for _ in range(3)]
+            return self.http.post(f"{self.base}/api/v1/accounts/multi-transfer", json={'from_account_id': src, 'transfers': transfers})
+        if op == 'loan_payment': return self.http.post(f"{self.base}/api/v1/loans/{self.user['loan_id']}/payment", json={'amount': 1.0, 'account_id': own[0]})
+        raise ValueError(f"unknown op {op}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def drive(args, base, users):
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    everyone = [acc for uu in users for acc in uu['accounts']]
+    samples = {name: [] for name in names} # (ms, status, query count)
+    lock = threading.Lock()
+    vusers = [VirtualUser(base, users[i % len(users)], everyone, random.Random(args.seed * 1000 + i)) for i in range(args.concurrency)] # logins not timed
+    deadline = time.perf_counter() + args.seconds
+
+    def loop(vu):
+        while time.perf_counter() < deadline:
+            op = vu.rnd.choices(names, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                resp = vu.request(op)
+                status, queries = resp.status_code, int(resp.headers.get('X-Query-Count', 0))
+            except requests.RequestException: status, queries = 0, 0
+            with lock: samples[op].append(((time.perf_counter() - t0) * 1000, status, queries))
+
+    threads = [threading.Thread(target=loop, args=(vu,)) for vu in vusers]
+    started = time.perf_counter()
+    for tt in threads: tt.start()
+    for tt in threads: tt.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    def pct(values, p): return round(values[min(len(values) - 1, int(p * len(values)))], 2) if values else None
+    ops, total = {}, 0
+    for name, rows in samples.items():
+        ms = sorted(rr[0] for rr in rows)
+        ok = [rr for rr in rows if 200 <= rr[1] < 300]
+        errors = {}
+        for rr in rows:
+            if not 200 <= rr[1] < 300: errors[str(rr[1])] = errors.get(str(rr[1]), 0) + 1
+        total += len(rows)
+        ops[name] = {
+            'requests': len(rows), 'per_sec': round(len(rows) / elapsed, 1), 'errors': errors,
+            'p50_ms': pct(ms, .50), 'p95_ms': pct(ms, .95), 'p99_ms': pct(ms, .99),
+            'queries_per_op': round(sum(rr[2] for rr in ok) / len(ok), 2) if ok else None,
+        }
+    return {'requests': total, 'per_sec': round(total / elapsed, 1), 'ops': ops}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--accounts-per-user', type=int, default=2)
+    parser.add_argument('--transactions', type=int, default=20000, help='seeded history rows')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads, each a logged-in user')
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers')
+    parser.add_argument('--threads', type=int, default=1, help='gunicorn threads per worker')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='op=weight list')
+    parser.add_argument('--database-url', default=None, help='seed + serve this database instead of a temp sqlite file (it must be empty)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='load_test_')
+    env = {
+        'DATABASE_URL': args.database_url or f"sqlite:///{os.path.join(tmp, 'load.db')}",
+        'SQLITE_PRODUCTION_MODE': '1',
+        'DATA_FOLDER': tmp,
+        'PROMETHEUS_MULTIPROC_DIR': os.path.join(tmp, 'prometheus'),
+        'SLOW_QUERY_MS': '0',
+    }
+    os.makedirs(env['PROMETHEUS_MULTIPROC_DIR'])
+    proc = None
+    try:
+        t0 = time.perf_counter()
+        users = seed(args, env)
+        seeded_in = time.perf_counter() - t0
+        port = free_port()
+        proc = start_server(args, env, port)
+        samples, elapsed = drive(args, f"http://127.0.0.1:{port}", users)
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=30)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    report = {
+        'run_at': datetime.utcnow().isoformat(),
+        'config': {kk: vv for kk, vv in vars(args).items() if kk not in ('out', 'database_url')},
+        'seed_seconds': round(seeded_in, 1),
+        'duration_seconds': round(elapsed, 1),
+        **summarize(samples, elapsed),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f: f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+"""Micro-benchmarks for manager / store hot paths, with a stored baseline and a regression check.
+
+usage: python scripts/microbench.py [--only account,hash_store] [--rows 1000,10000,100000] [--hash-sizes 1000,4000,16000]
+                                    [--save] [--compare] [--threshold 0.25] [--baseline scripts/microbench_baseline.json]
+
+Each case reports the median time per call (us) over --repeat runs on a fresh sqlite file in SQLITE_PRODUCTION_MODE.
+The hash store is stubbed out of the AccountManager cases and measured on its own at growing file sizes.
+
+--save writes the results to the baseline file. --compare flags every case slower than baseline x (1 + threshold).
+Both also run the scaling checks: the cost of one call must stay flat as the data grows (log-log slope below
+the budget), e.g. one hash store write at 16k entries vs 1k. Exit status 1 on any regression or failed scaling check.
+"""
+import os, sys, json, math, time, random, argparse, tempfile, statistics, shutil
+from datetime import datetime, timedelta
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+import logging
+logging.disable(logging.WARNING)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'microbench_baseline.json')
+SCALING_BUDGET = 0.2 # max log-log slope of per-call cost vs data size → 0 = flat, 1 = linear per call (quadratic overall)
+
+
+def per_call_us(fn, number, repeat): # median over `repeat` runs of `number` calls
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number): fn()
+        runs.append((time.perf_counter() - t0) / number * 1e6)
+    return round(statistics.median(runs), 2)
+
+
+def slope(points): # least squares slope of log(cost) over log(size)
+    xs, ys = [math.log(nn) for nn, _ in points], [math.log(max(cc, 1e-9)) for _, cc in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    den = sum((xx - mx) ** 2 for xx in xs)
+    return round(sum((xx - mx) * (yy - my) for xx, yy in zip(xs, ys)) / den, 3) if den else 0.0
+
+
+def bench_account(app, args, results):
+    from src.models import db, User, Account
+    from src.managers.AccountManager import AccountManager
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        accs = [Account(user_id=user.user_id, account_type='Checking', balance=10_000_000) for _ in range(10)]
+        db.session.add_all(accs)
+        db.session.commit()
+        ids = [aa.account_id for aa in accs]
+        manager, rnd = AccountManager(), random.Random(args.seed)
+        n, r = args.number, args.repeat
+        results['account.deposit'] = per_call_us(lambda: manager.deposit(rnd.choice(ids), 1.0), n, r)
+        results['account.withdraw'] = per_call_us(lambda: manager.withdraw(rnd.choice(ids), 1.0), n, r)
+        results['account.transfer'] = per_call_us(lambda: manager.transfer(*rnd.sample(ids, 2), 1.0), n, r)
+        results['account.multi_transfer[3]'] = per_call_us(lambda: manager.multi_transfer(ids[0], [{'to_account_id': dd, 'amount': 1.0} for dd in rnd.sample(ids[1:], 3)]), n, r)
+
+
+def bench_transactions(app, args, results, scaling):
+    """ get_transactions for one 50-row account while the table grows -- indexed → per call cost stays flat """
+    from sqlalchemy import insert
+    from src.models import db, User, Account, Transaction
+    from src.managers.AccountManager import AccountManager
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        accs = [Account(user_id=user.user_id, account_type='Savings', balance=0) for _ in range(20)]
+        db.session.add_all(accs)
+        db.session.commit()
+        target, others = accs[0].account_id, [aa.account_id for aa in accs[1:]]
+        manager, rnd, now, written, points = AccountManager(), random.Random(args.seed), datetime.utcnow(), 0, []
+        for size in args.rows:
+            rows = [{'transaction_id': f"bench-tx-{written + i:09d}", 'account_id': target if written + i < 50 else rnd.choice(others), 'transaction_type': 'deposit',
+                     'amount': 1.0, 'description': 'bench', 'destination_account_id': None, 'created_at': now - timedelta(seconds=written + i)} for i in range(size - written)]
+            for i in range(0, len(rows), 10000): db.session.execute(insert(Transaction), rows[i:i + 10000])
+            db.session.commit()
+            written = size
+            cost = per_call_us(lambda: manager.get_transactions(account_id=target), args.number, args.repeat)
+            results[f"account.get_transactions[{size}]"] = cost
+            points.append((size, cost))
+        scaling.append(('account.get_transactions', points))
+
+
+def bench_hash_store(app, args, results, scaling):
+    """ record / find against a store prefilled with n entries -- every call re-reads (and record re-writes) the whole file """
+    import src.utils.tx_hash_store as store
+    from src.utils.json_utils import save_json
+    with app.app_context():
+        record_points, find_points = [], []
+        for size in args.hash_sizes:
+            save_json(store.HASHES_FILE, [store._make_entry(f"bench-hash-{i:09d}") for i in range(size)])
+            counter = iter(range(10 ** 9))
+            record = per_call_us(lambda: store.record_transaction_hash(f"bench-new-{next(counter)}", from_account_id='a', to_account_id='b'), args.store_number, args.repeat)
+            find = per_call_us(lambda: store.find_transaction_hash(f"bench-hash-{size // 2:09d}"), args.store_number, args.repeat)
+            results[f"hash_store.record[{size}]"], results[f"hash_store.find[{size}]"] = record, find
+            record_points.append((size, record))
+            find_points.append((size, find))
+        scaling += [('hash_store.record', record_points), ('hash_store.find', find_points)]
+
+
+def bench_models(app, args, results):
+    from src.models import User, Account, Transaction, Loan, LedgerEntry
+    now = datetime.utcnow()
+    with app.app_context():
+        user = User('bench', 'bench-password', 'bench@example.com', 'Bench User')
+        user.user_id, user.created_at = 'u1', now
+        results['user.verify_password'] = per_call_us(lambda: user.verify_password('bench-password'), 3, args.repeat)
+        samples = {
+            'user': user,
+            'account': Account('u1', 'Checking', 100.0, '1234567890'),
+            'transaction': Transaction(transaction_id='t1', account_id='a1', transaction_type='deposit', amount=10.0, description='bench', created_at=now),
+            'loan': Loan(user_id='u1', loan_type='Personal', amount=1000.0, interest_rate=5.0, term_months=12, purpose='bench'),
+            'ledger_entry': LedgerEntry(entry_id=1, account_id='a1', transaction_id='t1', entry_type='deposit', amount=10.0, balance_after=100.0, created_at=now),
+        }
+        samples['account'].account_id, samples['account'].created_at, samples['account'].active = 'a1', now, True
+        samples['loan'].created_at = now
+        for name, obj in samples.items():
+            results[f"{name}.to_dict"] = per_call_us(obj.to_dict, args.number * 20, args.repeat)
+
+
+def run(args):
+    tmp = tempfile.mkdtemp(prefix='microbench_')
+    os.environ.update({'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'bench.db')}", 'SQLITE_PRODUCTION_MODE': '1', 'DATA_FOLDER': tmp, 'SLOW_QUERY_MS': '0'})
+    import src.managers.AccountManager as account_manager_mod
+    from src.app import create_app
+    from src.models import db
+
+    app = create_app()
+    app.config.update(TESTING=True, DATA_FOLDER=tmp)
+    results, scaling = {}, []
+    try:
+        wanted = lambda group: not args.only or group in args.only
+        if wanted('account'):
+            real = account_manager_mod.record_transaction_hash
+            account_manager_mod.record_transaction_hash = lambda *a, **k: True # measured below, on its own
+            try:
+                bench_account(app, args, results)
+                bench_transactions(app, args, results, scaling)
+            finally: account_manager_mod.record_transaction_hash = real
+        if wanted('hash_store'): bench_hash_store(app, args, results, scaling)
+        if wanted('models'): bench_models(app, args, results)
+    finally:
+        with app.app_context():
+            for engine in db.engines.values(): engine.dispose()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    checks = [{'case': name, 'sizes': [nn for nn, _ in points], 'slope': slope(points), 'budget': SCALING_BUDGET, 'ok': slope(points) <= SCALING_BUDGET}
+              for name, points in scaling if len(points) > 1]
+    return results, checks
+
+
+def compare(results, baseline, threshold):
+    rows = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if base is None: continue
+        ratio = round(cur / base, 2) if base else None
+        rows.append({'case': name, 'baseline_us': base, 'current_us': cur, 'ratio': ratio, 'regression': bool(ratio and ratio > 1 + threshold)})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--only', default=None, help='comma list of groups: account, hash_store, models')
+    parser.add_argument('--rows', default='1000,10000,100000', help='transactions table sizes for get_transactions (add 1000000 for the full run)')
+    parser.add_argument('--hash-sizes', default='1000,4000,16000', help='hash store sizes (entries) for record / find')
+    parser.add_argument('--number', type=int, default=50, help='calls per timed run')
+    parser.add_argument('--store-number', type=int, default=5, help='calls per timed run for the hash store cases')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per case → median')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--compare', action='store_true', help='compare against the baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed slowdown vs baseline (0.25 → 25%%)')
+    args = parser.parse_args()
+    args.only = set(args.only.split(',')) if args.only else None
+    args.rows = [int(nn) for nn in args.rows.split(',')]
+    args.hash_sizes = [int(nn) for nn in args.hash_sizes.split(',')]
+
+    results, checks = run(args)
+    report = {'run_at': datetime.utcnow().isoformat(), 'unit': 'us per call', 'results': results, 'scaling': checks}
+    failed = [cc['case'] for cc in checks if not cc['ok']]
+
+    if args.compare:
+        if not os.path.exists(args.baseline): sys.exit(f"no baseline at {args.baseline} -- run with --save first")
+        with open(args.baseline) as f: baseline = json.load(f)['results']
+        report['comparison'] = compare(results, baseline, args.threshold)
+        failed += [rr['case'] for rr in report['comparison'] if rr['regression']]
+    if args.save:
+        with open(args.baseline, 'w') as f: json.dump({'saved_at': report['run_at'], 'unit': report['unit'], 'results': results}, f, indent=2)
+        report['saved_to'] = args.baseline
+
+    report['failed'] = failed
+    print(json.dumps(report, indent=2))
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+"""Monthly savings interest posting -- run from cron / a scheduled task after month end.
+
+usage: python scripts/post_savings_interest.py [--period YYYY-MM] [--rate 2.0] [--chunk-size 2000]
+
+Safe to re-run: a posted period is skipped and an interrupted one resumes from its cursor.
+"""
+import os, sys, json, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.SavingsInterestManager import SavingsInterestManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--period', default=None, help='YYYY-MM (default: last full month)')
+    parser.add_argument('--rate', type=float, default=None, help='annual %% (default: SAVINGS_INTEREST_RATE or 2.0)')
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        res = SavingsInterestManager(annual_rate=args.rate, chunk_size=args.chunk_size).run(args.period)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Precompress the SPA in static/ -- run as part of the build / deploy step.
+
+usage: python scripts/precompress_static.py [--min-size 500] [--clean]
+
+Writes `<file>.gz` (gzip -9) and, with the brotli package installed, `<file>.br` (quality 11) next to every
+text asset. The app serves them with the matching Content-Encoding. A variant is only kept when it is smaller,
+and one older than its asset is ignored at request time, so forgetting to rerun this never serves stale files.
+--clean removes all variants.
+"""
+import os, sys, json, gzip, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.compression import VARIANTS, brotli
+
+STATIC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'static'))
+SUFFIXES = ('.html', '.css', '.js', '.json', '.svg', '.txt', '.map')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--min-size', type=int, default=int(os.environ.get('COMPRESS_MIN_SIZE', 500)))
+    parser.add_argument('--clean', action='store_true')
+    args = parser.parse_args()
+
+    encoders = {'gzip': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli: encoders['br'] = lambda data: brotli.compress(data, quality=11)
+    files, raw, sent = [], 0, {ee: 0 for ee in encoders}
+    for root, _, names in os.walk(STATIC):
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if name.endswith(tuple(VARIANTS.values())):
+                if args.clean: os.remove(path)
+                continue
+            if args.clean or not name.endswith(SUFFIXES): continue
+            with open(path, 'rb') as f: data = f.read()
+            if len(data) < args.min_size: continue
+            row = {'file': os.path.relpath(path, STATIC).replace(os.sep, '/'), 'bytes': len(data)}
+            raw += len(data)
+            for encoding, encode in encoders.items():
+                body, out = encode(data), path + VARIANTS[encoding]
+                if len(body) < len(data):
+                    with open(out, 'wb') as f: f.write(body)
+                    row[encoding] = len(body)
+                elif os.path.exists(out): os.remove(out)
+                sent[encoding] += row.get(encoding, len(data))
+            files.append(row)
+
+    print(json.dumps({'files': files, 'bytes': raw, 'compressed': sent, 'brotli': bool(brotli)} if not args.clean else {'cleaned': STATIC}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+"""Reconcile account balances against their transactions -- run from cron / a scheduled task.
+
+usage: python scripts/reconcile_ledger.py [--full] [--workers N] [--partitions N] [--out report.json]
+
+Incremental by default: only accounts that changed since the last run are rechecked.
+Exit code 1 when discrepancies are found.
+"""
+import os, sys, json, argparse
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.ReconciliationManager import ReconciliationManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--full', action='store_true', help='recheck every account')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: RECONCILE_WORKERS or cpu count)')
+    parser.add_argument('--partitions', type=int, default=None, help='account_id ranges (default: 2 x workers)')
+    parser.add_argument('--out', default=None, help='write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        report = ReconciliationManager(workers=args.workers, partitions=args.partitions).run(full=args.full)
+    if args.out:
+        with open(args.out, 'w') as f: json.dump(report, f, indent=2)
+        print(f"checked {report['accounts_checked']} accounts | {report['discrepancy_count']} discrepancies → {args.out}")
+    else: print(json.dumps(report, indent=2))
+    sys.exit(1 if report['discrepancy_count'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Roll the daily balance snapshots forward -- run from cron / a scheduled task shortly after midnight UTC.
+
+usage: python scripts/refresh_balance_snapshots.py [--through YYYY-MM-DD] [--rebuild] [--chunk-size 2000]
+
+Only transactions after the current watermark are read; --rebuild recomputes every snapshot from scratch.
+"""
+import os, sys, json, argparse
+from datetime import date
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.BalanceSnapshotManager import BalanceSnapshotManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--through', type=date.fromisoformat, default=None, help='last day to snapshot (default: yesterday)')
+    parser.add_argument('--rebuild', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        res = BalanceSnapshotManager(chunk_size=args.chunk_size).refresh(args.through, rebuild=args.rebuild)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == '__main__':
+    main()
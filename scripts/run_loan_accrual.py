@@ -0,0 +1,29 @@
+"""Daily loan interest accrual -- run from cron / a scheduled task.
+
+usage: python scripts/run_loan_accrual.py [--as-of YYYY-MM-DD] [--chunk-size 5000] [--default-after N]
+
+Safe to re-run: a completed date is skipped and an interrupted one resumes from its cursor.
+"""
+import os, sys, json, argparse
+from datetime import date
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.app import create_app
+from src.managers.LoanAccrualManager import LoanAccrualManager
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--as-of', type=date.fromisoformat, default=None)
+    parser.add_argument('--chunk-size', type=int, default=None)
+    parser.add_argument('--default-after', type=int, default=None, help='missed payments before a loan is defaulted (0 disables)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        res = LoanAccrualManager(chunk_size=args.chunk_size, default_after_missed=args.default_after).run(args.as_of)
+    print(json.dumps(res, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,27 @@
-from flask import Blueprint, request, jsonify
+from datetime import date, datetime, timedelta
+from flask import Blueprint, request, jsonify, send_file
 from flask_jwt_extended import jwt_required
 from src.managers.AccountManager import AccountManager
+from src.managers.SavingsInterestManager import SavingsInterestManager
+from src.managers.BalanceSnapshotManager import BalanceSnapshotManager
+from src.managers.ReconciliationManager import ReconciliationManager
+from src.managers.LedgerManager import LedgerManager
+from src.managers.StatementManager import StatementManager
 from src.utils.jwt_auth import admin_required, get_current_user
+from src.utils.db_routing import replica_reads
+from src.utils.etags import etagged, caller_scope
 from src.utils.tx_hash_store import list_transaction_hashes, find_transaction_hash
 
 account_bp = Blueprint('accounts', __name__)
 account_manager = AccountManager()
+interest_manager = SavingsInterestManager()
+snapshot_manager = BalanceSnapshotManager()
+ledger_manager = LedgerManager()
 
 @account_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@etagged(caller_scope)
 def get_accounts():
     currUser = get_current_user()
     # admin can get access to ALL accs | regular users only get their accs
@@ -21,6 +34,7 @@ def get_accounts():
 
 @account_bp.route('/<account_id>', methods=['GET'])
 @jwt_required()
+@etagged(lambda account_id, **_: account_manager.get_account_owner(account_id))
 def get_account(account_id):
     currUser = get_current_user()
     acc = account_manager.get_account_by_id(account_id)
@@ -50,7 +64,7 @@ def create_account():
 @jwt_required()
 def update_account(account_id):
     currUser = get_current_user()
-    acc = account_manager.get_account_by_id(account_id)
+    acc = account_manager.get_account_ref(account_id)
     if not acc: return jsonify(error="account not found"), 404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403 # check if user has access to this acc
 
@@ -65,7 +79,7 @@ def update_account(account_id):
 @jwt_required()
 def close_account(account_id):
     currUser = get_current_user()
-    acc = account_manager.get_account_by_id(account_id)
+    acc = account_manager.get_account_ref(account_id)
     if not acc: return jsonify(error="account not found"), 404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"),403 # check if user has access to this acc
 
@@ -80,7 +94,7 @@ def close_account(account_id):
 @jwt_required()
 def deposit(account_id):
     currUser = get_current_user()
-    acc = account_manager.get_account_by_id(account_id)
+    acc = account_manager.get_account_ref(account_id)
     if not acc: return jsonify(error="account not found"),404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
 
@@ -100,7 +114,7 @@ def deposit(account_id):
 @jwt_required()
 def withdraw(account_id):
     currUser = get_current_user()
-    acc = account_manager.get_account_by_id(account_id)
+    acc = account_manager.get_account_ref(account_id)
     if not acc: return jsonify(error="account not found"), 404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
 
@@ -123,9 +137,9 @@ def transfer():
     data = request.get_json()
     # Support both IDs and account numbers; IDs take precedence if provided
     if 'from_account_id' in data:
-        from_account = account_manager.get_account_by_id(data['from_account_id'])
+        from_account = account_manager.get_account_ref(data['from_account_id'])
     elif 'from_account_number' in data:
-        from_account = account_manager.get_account_by_number(data['from_account_number'])
+        from_account = account_manager.get_account_ref_by_number(data['from_account_number'])
         if from_account:
             data['from_account_id'] = from_account.account_id
     else:
@@ -133,9 +147,9 @@ def transfer():
 
     # Resolve destination
     if 'to_account_id' in data:
-        to_account = account_manager.get_account_by_id(data['to_account_id'])
+        to_account = account_manager.get_account_ref(data['to_account_id'])
     elif 'to_account_number' in data:
-        to_account = account_manager.get_account_by_number(data['to_account_number'])
+        to_account = account_manager.get_account_ref_by_number(data['to_account_number'])
         if to_account:
             data['to_account_id'] = to_account.account_id
     else:
@@ -174,7 +188,7 @@ def multi_transfer():
     for ff in required_fields:
         if ff not in data:
             return jsonify(error=f"missing required field: {ff}"), 400
-    from_account = account_manager.get_account_by_id(data['from_account_id'])
+    from_account = account_manager.get_account_ref(data['from_account_id'])
     if not from_account:
         return jsonify(error="source account not found"), 404
     if currUser['role'] != 'admin' and from_account.user_id != currUser['user_id']:
@@ -195,12 +209,12 @@ def transfer_by_account_number():
     for ff in required_fields:
         if ff not in data:
             return jsonify(error=f"missing required field: {ff}"), 400
-    from_account = account_manager.get_account_by_id(data['from_account_id'])
+    from_account = account_manager.get_account_ref(data['from_account_id'])
     if not from_account:
         return jsonify(error="source account not found"), 404
     if currUser['role'] != 'admin' and from_account.user_id != currUser['user_id']:
         return jsonify(error="unauthorized access to source account"), 403
-    dest = account_manager.get_account_by_number(data['to_account_number'])
+    dest = account_manager.get_account_ref_by_number(data['to_account_number'])
     if not dest:
         return jsonify(error="destination account not found"), 404
     if dest.account_id == from_account.account_id:
@@ -215,6 +229,81 @@ def transfer_by_account_number():
         return jsonify(error=str(e)), 400
 
 
+@account_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_cache_stats(): # acc ref cache hit/miss counters (this worker only)
+    return jsonify(account_cache=account_manager.get_cache_stats()), 200
+
+
+@account_bp.route('/interest/run', methods=['POST'])
+@jwt_required()
+@admin_required
+def run_savings_interest(): # body {period: YYYY-MM} optional -- defaults to last full month
+    data = request.get_json(silent=True) or {}
+    try: return jsonify(interest_manager.run(data.get('period'))), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/interest/runs', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_savings_interest_runs():
+    return jsonify(runs=[rr.to_dict() for rr in interest_manager.get_runs(request.args.get('limit', 30, type=int))]), 200
+
+
+@account_bp.route('/snapshots/refresh', methods=['POST'])
+@jwt_required()
+@admin_required
+def refresh_snapshots(): # body {through: YYYY-MM-DD, rebuild: bool} both optional -- default through yesterday
+    data = request.get_json(silent=True) or {}
+    try:
+        through = date.fromisoformat(data['through']) if data.get('through') else None
+        return jsonify(snapshot_manager.refresh(through, rebuild=bool(data.get('rebuild')))), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/reconcile', methods=['POST'])
+@jwt_required()
+@admin_required
+def reconcile(): # body {full: bool} -- default incremental | in-process, one worker: process pools belong to scripts/reconcile_ledger.py, not a web worker
+    data = request.get_json(silent=True) or {}
+    return jsonify(ReconciliationManager(workers=1).run(full=bool(data.get('full')))), 200
+
+
+@account_bp.route('/reconcile/discrepancies', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_discrepancies(): # accounts off as of their last check -- no recheck
+    res = []
+    for ss in ReconciliationManager(workers=1).get_state(ok=False):
+        res.append({'account_id': ss.account_id, 'balance': float(ss.balance), 'expected': float(ss.expected), 'difference': round(float(ss.balance) - float(ss.expected), 2), 'checked_at': ss.checked_at.isoformat()})
+    return jsonify(discrepancies=res), 200
+
+
+@account_bp.route('/statements/generate', methods=['POST'])
+@jwt_required()
+@admin_required
+def generate_statements(): # body {period: YYYY-MM, regenerate: bool} both optional -- default last full month | in-process, one worker: pools → scripts/generate_statements.py
+    data = request.get_json(silent=True) or {}
+    try: return jsonify(StatementManager(workers=1).generate(data.get('period'), regenerate=bool(data.get('regenerate')))), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/statements/runs', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_statement_runs():
+    return jsonify(runs=[rr.to_dict() for rr in StatementManager(workers=1).get_runs(request.args.get('limit', 30, type=int))]), 200
+
+
+@account_bp.route('/ledger/backfill', methods=['POST'])
+@jwt_required()
+@admin_required
+def backfill_ledger(): # legs of transactions written before ledger_entries existed | idempotent
+    return jsonify(ledger_manager.backfill()), 200
+
+
 # ===================== ADMIN HASH VIEW ROUTES ===================== #
 @account_bp.route('/transaction-hashes', methods=['GET'])
 @jwt_required()
@@ -237,9 +326,10 @@ def get_transaction_hash(transaction_id):
 
 @account_bp.route('/<account_id>/transactions', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_account_transactions(account_id):
     currUser = get_current_user()
-    acc = account_manager.get_account_by_id(account_id)
+    acc = account_manager.get_account_ref(account_id)
     if not acc: return jsonify(error="account not found"), 404
     if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
     transcs = account_manager.get_transactions(account_id=account_id)
@@ -248,8 +338,82 @@ def get_account_transactions(account_id):
     return jsonify(transactions=res),200
 
 
+@account_bp.route('/<account_id>/balance-at', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_balance_at(account_id): # ?date=YYYY-MM-DD closing balance of that day | today or later → live balance
+    currUser = get_current_user()
+    acc = account_manager.get_account_ref(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+    try:
+        on = date.fromisoformat(request.args['date']) if request.args.get('date') else datetime.utcnow().date()
+        balance, source = snapshot_manager.balance_at(account_id, on)
+        return jsonify(account_id=account_id, date=on.isoformat(), balance=balance, source=source), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/<account_id>/balance-history', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_balance_history(account_id): # ?from=YYYY-MM-DD&to=YYYY-MM-DD daily closing balances | default last 30 days
+    currUser = get_current_user()
+    acc = account_manager.get_account_ref(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+    try:
+        end = date.fromisoformat(request.args['to']) if request.args.get('to') else datetime.utcnow().date()
+        start = date.fromisoformat(request.args['from']) if request.args.get('from') else end - timedelta(days=29)
+        return jsonify(account_id=account_id, history=snapshot_manager.balance_history(account_id, start, end)), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/<account_id>/ledger', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_ledger(account_id): # ?limit=50&before=<entry_id> newest first | ?at=ISO datetime → balance at that instant
+    currUser = get_current_user()
+    acc = account_manager.get_account_ref(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+    try:
+        if request.args.get('at'):
+            at = datetime.fromisoformat(request.args['at'])
+            return jsonify(account_id=account_id, at=at.isoformat(), balance=ledger_manager.balance_at(account_id, at)), 200
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+        entries = ledger_manager.get_entries(account_id, limit=limit, before=request.args.get('before', type=int))
+        return jsonify(entries=[ee.to_dict() for ee in entries], next_before=entries[-1].entry_id if len(entries) == limit else None), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@account_bp.route('/<account_id>/statements', methods=['GET'])
+@jwt_required()
+def get_statement_periods(account_id):
+    currUser = get_current_user()
+    acc = account_manager.get_account_ref(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+    return jsonify(account_id=account_id, periods=StatementManager(workers=1).get_periods(account_id)), 200
+
+
+@account_bp.route('/<account_id>/statements/<period>', methods=['GET'])
+@jwt_required()
+def get_statement(account_id, period): # pre-generated file as-is -- no history query
+    currUser = get_current_user()
+    acc = account_manager.get_account_ref(account_id)
+    if not acc: return jsonify(error="account not found"), 404
+    if currUser['role'] != 'admin' and acc.user_id != currUser['user_id']: return jsonify(error="unauthorized access to account"), 403
+    try: path = StatementManager(workers=1).statement_path(account_id, period)
+    except ValueError as e: return jsonify(error=str(e)), 400
+    if not path: return jsonify(error="statement not found"), 404
+    resp = send_file(path, mimetype='application/json', max_age=3600)
+    resp.cache_control.public, resp.cache_control.private = False, True # one user's statement → browser cache only, never a shared proxy
+    return resp
+
+
 @account_bp.route('/user/transactions', methods=['GET'])
 @jwt_required()
+@replica_reads
 def get_user_transactions():
     currUser = get_current_user()
     transcs = account_manager.get_transactions(user_id=currUser['user_id'])
@@ -0,0 +1,34 @@
+from flask import Blueprint, request, jsonify, send_file
+from flask_jwt_extended import jwt_required
+from src.managers.DashboardManager import DashboardManager
+from src.utils.jwt_auth import admin_required
+from src.utils.db_routing import replica_reads
+from src.utils import request_profiler
+
+admin_bp = Blueprint('admin', __name__)
+dashboard_manager = DashboardManager()
+
+
+@admin_bp.route('/overview', methods=['GET'])
+@jwt_required()
+@admin_required
+@replica_reads
+def get_overview(): # ?days=14&top=10 -- totals, counts by status/type, daily volume, latest activity | cached ADMIN_OVERVIEW_TTL s
+    try: return jsonify(dashboard_manager.get_admin_overview(days=request.args.get('days', 14, type=int), top=request.args.get('top', 10, type=int))), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@admin_bp.route('/profiles', methods=['GET'])
+@jwt_required()
+@admin_required
+def list_profiles(): # collapsed stacks written by X-Profile requests / the continuous buffer of this host, newest first
+    return jsonify(profiles=request_profiler.list_profiles()), 200
+
+
+@admin_bp.route('/profiles/<name>', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_profile(name): # folded text → flamegraph.pl / speedscope
+    path = request_profiler.profile_path(name)
+    if not path: return jsonify(error="profile not found"), 404
+    return send_file(path, mimetype='text/plain')
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from flask import Blueprint, current_app, g, jsonify, request
+from flask.globals import app_ctx
+from flask_jwt_extended import jwt_required
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+from src.models import db
+
+batch_bp = Blueprint('batch', __name__)
+
+METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+NOT_BATCHABLE = {'batch.batch', 'events.stream'} # no nesting | streams never finish
+BATCH_FLAG = 'banking.batch' # environ key set on every sub-request
+PASS_HEADERS = ('ETag', 'Location', 'Retry-After')
+_pool = None
+
+
+@batch_bp.route('', methods=['POST'])
+@jwt_required()
+def batch(): # several API calls in one round trip | {"requests": [{id, method, path, body, headers}], "concurrent": bool} → {"responses": [...]} in order
+    if request.environ.get(BATCH_FLAG): return jsonify(error="batches can't be nested"), 400
+    data = request.get_json(silent=True) or {}
+    subs = data.get('requests')
+    if not isinstance(subs, list) or not subs: return jsonify(error="requests must be a non-empty list"), 400
+    if len(subs) > current_app.config['BATCH_MAX_REQUESTS']: return jsonify(error=f"at most {current_app.config['BATCH_MAX_REQUESTS']} requests per batch"), 400
+    app, base_url = current_app._get_current_object(), request.host_url
+    auth = request.headers['Authorization'] # checked once above, handed to every sub-request
+    environs = []
+    for sub in subs:
+        error = _validate(sub)
+        if error: return jsonify(error=error), 400
+        environ = _environ(sub, auth, base_url)
+        if _endpoint(app, environ) in NOT_BATCHABLE: return jsonify(error=f"{sub['path']} can't be batched"), 400
+        environs.append(environ)
+    concurrent = bool(data.get('concurrent'))
+    if concurrent and any(sub.get('method', 'GET').upper() != 'GET' for sub in subs): # reads only → order can't matter
+        return jsonify(error="concurrent batches may only contain GET requests"), 400
+
+    if concurrent and len(subs) > 1:
+        results = list(_executor(app).map(lambda sub, environ: _in_own_context(app, sub, environ), subs, environs))
+    else:
+        results = [_dispatch(app, sub, environ) for sub, environ in zip(subs, environs)] # same app context → same db.session, one after another
+    for _, queries, query_ms in results: # batch's X-Query-Count / Server-Timing cover its sub-requests
+        g.query_count = g.get('query_count', 0) + queries
+        g.query_ms = g.get('query_ms', 0.0) + query_ms
+    return jsonify(responses=[result for result, _, _ in results]), 200
+
+
+def _validate(sub):
+    if not isinstance(sub, dict): return "each request must be an object"
+    if str(sub.get('method', 'GET')).upper() not in METHODS: return f"unsupported method {sub.get('method')}"
+    path = sub.get('path')
+    if not isinstance(path, str) or not path.startswith('/api/v1/'): return "path must start with /api/v1/"
+    if not isinstance(sub.get('headers', {}), dict): return "headers must be an object"
+    return None
+
+
+def _environ(sub, auth, base_url):
+    headers = {kk: vv for kk, vv in sub.get('headers', {}).items() if kk.lower() not in ('authorization', 'accept-encoding')} # the batch is compressed once, as a whole
+    environ = EnvironBuilder(path=sub['path'], method=sub.get('method', 'GET').upper(), base_url=base_url,
+                             headers={**headers, 'Authorization': auth}, json=sub.get('body')).get_environ()
+    environ[BATCH_FLAG] = True
+    return environ
+
+
+def _endpoint(app, environ): # what the router will run -- the decoded path, not the string sent
+    try: return app.url_map.bind_to_environ(environ).match(return_rule=True)[0].endpoint
+    except HTTPException: return None # 404 / 405 → the sub-request answers it itself
+
+
+def _executor(app):
+    global _pool
+    if _pool is None: _pool = ThreadPoolExecutor(max_workers=app.config['BATCH_MAX_WORKERS'], thread_name_prefix='batch')
+    return _pool
+
+
+def _in_own_context(app, sub, environ): # pool thread → its own app context, session and connection
+    with app.app_context(): return _dispatch(app, sub, environ)
+
+
+def _dispatch(app, sub, environ):
+    """ run one sub-request through the normal request pipeline | returns (result, query count, query ms) """
+    outer_g, app_ctx.g = app_ctx.g, app.app_ctx_globals_class() # fresh g → hooks / jwt state of the batch request untouched
+    try:
+        with app.request_context(environ):
+            try: response = app.full_dispatch_request()
+            except Exception as e: response = app.make_response(app.handle_exception(e))
+            db.session.rollback() # whatever the view left uncommitted goes, as at the end of a normal request
+        sub_g = app_ctx.g
+    finally: app_ctx.g = outer_g
+    result = {'id': sub.get('id'), 'status': response.status_code, 'headers': {hh: response.headers[hh] for hh in PASS_HEADERS if hh in response.headers}}
+    if response.is_json: result['body'] = response.get_json()
+    elif response.mimetype.startswith('text/') and not response.direct_passthrough: result['body'] = response.get_data(as_text=True)
+    else: result['body'] = None # files (statements) → fetch directly
+    response.close()
+    return result, sub_g.get('query_count', 0), sub_g.get('query_ms', 0.0)
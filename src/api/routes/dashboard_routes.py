@@ -0,0 +1,16 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+from src.managers.DashboardManager import DashboardManager
+from src.utils.jwt_auth import get_current_user
+from src.utils.db_routing import replica_reads
+
+dashboard_bp = Blueprint('dashboard', __name__)
+dashboard_manager = DashboardManager()
+
+
+@dashboard_bp.route('/summary', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_summary(): # totals for the current user's dashboard cards + latest few transactions
+    currUser = get_current_user()
+    return jsonify(dashboard_manager.get_summary(currUser['user_id'])), 200
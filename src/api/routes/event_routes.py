@@ -0,0 +1,60 @@
+import hashlib
+import json
+import secrets
+import time
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+from src.models import db, StreamTicket
+from src.utils.jwt_auth import get_current_user
+
+events_bp = Blueprint('events', __name__)
+
+
+def _ticket_hash(ticket): return hashlib.sha256(ticket.encode()).hexdigest()
+
+
+@events_bp.route('/ticket', methods=['POST'])
+@jwt_required()
+def issue_ticket(): # single-use, short-lived, stream-only → what goes in the EventSource URL instead of the access token
+    now, exp = datetime.utcnow(), get_jwt().get('exp')
+    ticket = secrets.token_urlsafe(32)
+    db.session.query(StreamTicket).filter(StreamTicket.expires_at < now).delete(synchronize_session=False) # unused ones pile up otherwise
+    db.session.add(StreamTicket(ticket_hash=_ticket_hash(ticket), user_id=get_current_user()['user_id'], expires_at=now + timedelta(seconds=current_app.config['EVENT_TICKET_SECONDS']),
+                                session_expires_at=datetime.utcfromtimestamp(exp) if exp else None))
+    db.session.commit()
+    return jsonify(ticket=ticket, expires_in=current_app.config['EVENT_TICKET_SECONDS']), 201
+
+
+def _redeem(ticket): # → (user_id, session end) once per ticket, across workers | None if unknown / used / expired
+    row = db.session.get(StreamTicket, _ticket_hash(ticket))
+    if row is None: return None
+    redeemed = (row.user_id, row.session_expires_at)
+    claimed = db.session.query(StreamTicket).filter(StreamTicket.ticket_hash == row.ticket_hash, StreamTicket.expires_at >= datetime.utcnow()).delete(synchronize_session=False)
+    db.session.commit()
+    return redeemed if claimed == 1 else None # two redeemers → only one deletes the row
+
+
+@events_bp.route('/stream', methods=['GET'])
+def stream(): # SSE -- balance / transaction events of the caller's accounts | ?ticket= from POST /ticket, EventSource can't send headers
+    cfg, bus = current_app.config, current_app.extensions['event_bus']
+    # each open stream holds a worker thread → sync workers / a full worker answer 503 and the client stays on plain loads
+    if not request.environ.get('wsgi.multithread') or bus.subscriber_count() >= cfg['EVENT_MAX_STREAMS']:
+        return jsonify(error="live updates unavailable on this worker"), 503
+    redeemed = _redeem(request.args.get('ticket', ''))
+    if redeemed is None: return jsonify(error="invalid, used or expired ticket"), 401
+
+    user_id, session_end = redeemed
+    ends = time.time() + cfg['EVENT_STREAM_SECONDS']
+    if session_end: ends = min(ends, (session_end - datetime(1970, 1, 1)).total_seconds()) # client gets a new ticket → token re-checked
+    sub = bus.subscribe(user_id)
+
+    def generate():
+        try:
+            yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+            while (left := ends - time.time()) > 0:
+                event = sub.get(min(cfg['EVENT_HEARTBEAT_SECONDS'], left))
+                yield ": ping\n\n" if event is None else f"event: {event['type']}\ndata: {json.dumps(event)}\n\n" # ping → dead clients surface as write errors
+        finally: bus.unsubscribe(sub)
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
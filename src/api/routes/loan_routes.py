@@ -1,18 +1,30 @@
+from datetime import date
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
-from src.managers.LoanManager import LoanManager
+from src.managers.LoanManager import LoanManager, MAX_TERM_MONTHS
+from src.managers.AccountManager import AccountManager
+from src.managers.LoanAccrualManager import LoanAccrualManager
 from src.utils.jwt_auth import admin_required, get_current_user
+from src.utils.db_routing import replica_reads
+from src.utils.etags import etagged, caller_scope
 
 loan_bp = Blueprint('loans', __name__)
 loan_manager = LoanManager()
+account_manager = AccountManager()
+accrual_manager = LoanAccrualManager()
+MAX_BULK_DECISIONS = 10000
+MAX_PORTFOLIO_MONTHS = MAX_TERM_MONTHS # the projection allocates loans x months
 
 
 @loan_bp.route('', methods=['GET'])
 @jwt_required()
+@replica_reads
+@etagged(caller_scope)
 def get_loans():
     curUser = get_current_user()
-    # admin can get all loans | regular users only get their loans
-    loans = loan_manager.get_all_loans() if curUser['role']=='admin' and request.args.get('all')=='true' else loan_manager.get_user_loans(curUser['user_id'])
+    # admin can get all loans (?status=pending,approved to narrow) | regular users only get their loans
+    statuses = [ss for ss in request.args.get('status', '').split(',') if ss]
+    loans = loan_manager.get_all_loans(statuses) if curUser['role']=='admin' and request.args.get('all')=='true' else loan_manager.get_user_loans(curUser['user_id'])
     res = []
     for ll in loans: res.append(ll.to_dict())
     return jsonify(loans=res),200
@@ -20,6 +32,7 @@ def get_loans():
 
 @loan_bp.route('/<loan_id>', methods=['GET'])
 @jwt_required()
+@etagged(lambda loan_id, **_: loan_manager.get_loan_owner(loan_id))
 def get_loan(loan_id):
     curUser = get_current_user()
     loan = loan_manager.get_loan_by_id(loan_id)
@@ -53,7 +66,8 @@ def update_loan(loan_id):
     if curUser['role'] != 'admin' and loan.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"), 403
     if loan.status != 'pending' and curUser['role'] != 'admin': return jsonify(error="cannot update loan after review has started"), 403
     data = request.get_json()
-    res = loan_manager.update_loan(loan_id, data)
+    try: res = loan_manager.update_loan(loan_id, data)
+    except ValueError as e: return jsonify(error=str(e)), 400
     if res: return jsonify(message="loan updated successfully"),200
     else: return jsonify(error="failed to update loan"), 500
 
@@ -66,29 +80,16 @@ def make_payment(loan_id):
     if curUser['role'] != 'admin' and loan.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"),403
     data = request.get_json()
     if 'amount' not in data: return jsonify(error="amount is required"),400
+    if 'account_id' not in data: return jsonify(error="account_id is required"),400
     try:
         amount = float(data['amount'])
-        accId = data['account_id']
-
-        from src.managers.AccountManager import AccountManager
-        acc_manager = AccountManager()
-        acc = acc_manager.get_account_by_id(accId) # get bank acc -- funds to pay the loan
-
+        acc = account_manager.get_account_ref(data['account_id']) # bank acc -- funds to pay the loan
         if not acc: return jsonify(error="account not found"), 404
         if curUser['role'] != 'admin' and acc.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"), 403
-        if acc.balance < amount: return jsonify(error="insufficient funds in selected account"), 400
-
-        # withdrawing from acc first
-        try: acc_manager.withdraw(accId, amount, f"Payment  for {loan.loan_type} loan")
-        except ValueError as e: return jsonify(error=str(e)), 400
-
-        # AND THEEEEEEEN MAKE LOAN PAYMENT
-        newBlnc = loan_manager.make_payment(loan_id, amount)
-        if newBlnc is not None:
-            return jsonify(message="payment successful", balance=newBlnc), 200
-        else:
-            acc_manager.deposit(accId, amount, f"Refund for failed {loan.loan_type} loan payment")
-            return jsonify(error="failed to process payment"), 500 # UPD -- if loan payment fails → refund to the account
+
+        # UPD -- debit + loan balance + transaction row in one db transaction (no refund path needed)
+        newBlnc, accBlnc, tx_id = loan_manager.pay_from_account(loan_id, acc.account_id, amount)
+        return jsonify(message="payment successful", balance=newBlnc, account_balance=accBlnc, transaction_id=tx_id), 200
     except ValueError as e: return jsonify(error=str(e)), 400
 
 
@@ -104,9 +105,72 @@ def calculate_payment(loan_id):
         return jsonify(payment_amount=payMnt,term_months=loan.term_months,interest_rate=loan.interest_rate,principal=loan.amount,remaining_balance=loan.balance),200
     except ValueError as e: return jsonify(error=str(e)), 400
 
+@loan_bp.route('/<loan_id>/schedule', methods=['GET'])
+@jwt_required()
+def get_schedule(loan_id):
+    curUser = get_current_user()
+    loan = loan_manager.get_loan_by_id(loan_id)
+    if not loan: return jsonify(error="loan not found"), 404
+    if curUser['role'] != 'admin' and loan.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"), 403
+    try: return jsonify(loan_manager.get_amortization_schedule(loan_id)), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+@loan_bp.route('/<loan_id>/accruals', methods=['GET'])
+@jwt_required()
+@replica_reads
+def get_accruals(loan_id):
+    curUser = get_current_user()
+    loan = loan_manager.get_loan_by_id(loan_id)
+    if not loan: return jsonify(error="loan not found"), 404
+    if curUser['role'] != 'admin' and loan.user_id != curUser['user_id']: return jsonify(error="unauthorized access to loan"), 403
+    return jsonify(accruals=[aa.to_dict() for aa in accrual_manager.get_loan_accruals(loan_id)]), 200
+
 # ====================================== #
 # ========== ADMIN ONLY FUNCS ========== #
 # ====================================== #
+@loan_bp.route('/portfolio', methods=['GET'])
+@jwt_required()
+@admin_required
+@replica_reads
+def get_portfolio(): # ?months=N horizon | ?detail=true per-loan rows | ?status=active,approved
+    months = request.args.get('months', type=int)
+    if months is not None and not 1 <= months <= MAX_PORTFOLIO_MONTHS: return jsonify(error=f"months must be between 1 and {MAX_PORTFOLIO_MONTHS}"), 400
+    statuses = tuple(s for s in request.args.get('status', 'active').split(',') if s)
+    res = loan_manager.get_portfolio_projection(months=months, statuses=statuses, detail=request.args.get('detail') == 'true')
+    return jsonify(res), 200
+
+
+@loan_bp.route('/bulk-decisions', methods=['POST'])
+@jwt_required()
+@admin_required
+def bulk_decisions(): # body {decisions: [{loan_id, action: approve|reject|activate}, ...]}
+    data = request.get_json(silent=True) or {}
+    decisions = data.get('decisions')
+    if not isinstance(decisions, list) or not decisions: return jsonify(error="decisions must be a non-empty list"), 400
+    if len(decisions) > MAX_BULK_DECISIONS: return jsonify(error=f"at most {MAX_BULK_DECISIONS} decisions per request"), 400
+    results = loan_manager.bulk_decide(decisions)
+    succeeded = sum(1 for rr in results if rr['ok'])
+    return jsonify(results=results, succeeded=succeeded, failed=len(results) - succeeded), 200
+
+
+@loan_bp.route('/accrual/run', methods=['POST'])
+@jwt_required()
+@admin_required
+def run_accrual(): # body {as_of: YYYY-MM-DD} optional -- defaults to today (UTC)
+    data = request.get_json(silent=True) or {}
+    try:
+        as_of = date.fromisoformat(data['as_of']) if data.get('as_of') else None
+        return jsonify(accrual_manager.run(as_of)), 200
+    except ValueError as e: return jsonify(error=str(e)), 400
+
+
+@loan_bp.route('/accrual/runs', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_accrual_runs():
+    return jsonify(runs=[rr.to_dict() for rr in accrual_manager.get_runs(request.args.get('limit', 30, type=int))]), 200
+
+
 @loan_bp.route('/<loan_id>/approve', methods=['POST'])
 @jwt_required()
 @admin_required
@@ -3,6 +3,8 @@ from flask_jwt_extended import jwt_required
 
 from src.managers.UserManager import UserManager
 from src.utils.jwt_auth import generate_token, admin_required, get_current_user
+from src.utils.db_routing import replica_reads
+from src.utils.etags import etagged, caller_scope
 
 user_bp = Blueprint('users', __name__)
 user_manager = UserManager()
@@ -49,6 +51,7 @@ def login():
 
 @user_bp.route('/profile', methods=['GET'])
 @jwt_required()
+@etagged(caller_scope)
 def get_profile():
     cUser = get_current_user()
     user = user_manager.get_user_by_id(cUser['user_id'])
@@ -83,6 +86,7 @@ def update_profile():
 @user_bp.route('', methods=['GET'])
 @jwt_required()
 @admin_required
+@replica_reads
 def get_all_users(): # ADMIN ONLY
     users = user_manager.get_all_users()
 
@@ -103,6 +107,7 @@ def get_all_users(): # ADMIN ONLY
 @user_bp.route('/<user_id>', methods=['GET'])
 @jwt_required()
 @admin_required
+@replica_reads
 def get_user(user_id): # ADMIN ONLY
     user = user_manager.get_user_by_id(user_id)
     if not user: return jsonify(error="user not found"), 404
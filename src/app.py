@@ -2,75 +2,140 @@
 
 import os
 import logging
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_migrate import Migrate
-from src.models import db, User, Account, Loan, Transaction
+from src.models import db, User, Account, Loan, Transaction, LedgerEntry
 from src.utils.keepalive import setup_keepalive
+from src.utils.startup_profiler import StartupProfiler
+from src.utils.db_routing import REPLICA_BIND, replica_session
+from src.utils.sqlite_tuning import configure_sqlite
+from src.utils.query_stats import install_query_stats
+from src.utils.metrics import install_metrics
+from src.utils.request_profiler import install_request_profiler
+from src.utils.compression import install_compression
+from src.utils.static_assets import install_static_assets, serve_asset
+from src.utils.event_bus import install_event_bus
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def create_app():
-	app = Flask(__name__, static_folder='../static', static_url_path='')
-
-	# prod configs
-	app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
-	app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'dev-jwt-secret')
-
-	# path for JSON data persistence (e.g., transaction hashes)
-	data_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
-	app.config['DATA_FOLDER'] = data_folder
-
-	dbUrl = os.environ.get('DATABASE_URL')
-	if dbUrl:
-		if dbUrl.startswith('postgres://'): dbUrl = dbUrl.replace('postgres://', 'postgresql://', 1)
-		app.config['SQLALCHEMY_DATABASE_URI'] = dbUrl
-		logger.info(" === using pqsl db === ")
-	else: # for local dev
-		app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///banking.db'
-		logger.info(" === using SQLITE DB -- local === ")
-
-	app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-	app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'pool_pre_ping': True,'pool_recycle': 300,}
-
-	CORS(app, origins="*")
-	jwt = JWTManager(app)
-	db.init_app(app)
-	migrate = Migrate(app, db)
+def create_app(profiler=None):
+	profiler = profiler or StartupProfiler(enabled=False) # phases are no-ops unless --profile-startup / PROFILE_STARTUP
+
+	with profiler.phase('config'):
+		app = Flask(__name__, static_folder='../static', static_url_path='')
+
+		# prod configs
+		app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-key')
+		app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'dev-jwt-secret')
+
+		# path for JSON data persistence (e.g., transaction hashes) | DATA_FOLDER env → elsewhere (load tests, containers)
+		data_folder = os.environ.get('DATA_FOLDER') or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+		app.config['DATA_FOLDER'] = data_folder
+
+		dbUrl = os.environ.get('DATABASE_URL')
+		if dbUrl:
+			app.config['SQLALCHEMY_DATABASE_URI'] = _normalize_db_url(dbUrl)
+			logger.info(" === using pqsl db === ")
+		else: # for local dev
+			app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///banking.db'
+			logger.info(" === using SQLITE DB -- local === ")
+
+		# optional read replica -- listings / history / admin views / health read from it
+		readUrl = os.environ.get('DATABASE_READ_URL')
+		if readUrl:
+			app.config['SQLALCHEMY_BINDS'] = {REPLICA_BIND: _normalize_db_url(readUrl)}
+			logger.info(" === read replica bind enabled === ")
+
+		app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+		app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options()
+
+		# sqlite prod mode -- WAL + busy timeout + per-process single writer (no-op for postgres)
+		app.config['SQLITE_PRODUCTION_MODE'] = os.environ.get('SQLITE_PRODUCTION_MODE', '').lower() in ('1', 'true', 'yes')
+		app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+		app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))
+
+		# statements slower than this are logged with their route | 0 → off
+		app.config['SLOW_QUERY_MS'] = float(os.environ.get('SLOW_QUERY_MS', 200))
+
+		# sampling profiler -- admins: X-Profile header | every Nth request to PROFILE_ENDPOINTS → rotating buffer (0 → off)
+		app.config['PROFILE_INTERVAL_MS'] = float(os.environ.get('PROFILE_INTERVAL_MS', 5))
+		app.config['PROFILE_SAMPLE_RATE'] = int(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+		app.config['PROFILE_ENDPOINTS'] = {ee.strip() for ee in os.environ.get('PROFILE_ENDPOINTS', 'accounts.transfer,accounts.multi_transfer').split(',') if ee.strip()}
+		app.config['PROFILE_BUFFER_BYTES'] = int(os.environ.get('PROFILE_BUFFER_BYTES', 5 * 1024 * 1024))
+		app.config['PROFILE_BUFFER_FILES'] = int(os.environ.get('PROFILE_BUFFER_FILES', 3))
+
+		# response compression -- gzip / brotli above COMPRESS_MIN_SIZE bytes for these mimetypes | static → precompressed variants
+		app.config['COMPRESS_LEVEL'] = int(os.environ.get('COMPRESS_LEVEL', 6))
+		app.config['COMPRESS_BR_LEVEL'] = int(os.environ.get('COMPRESS_BR_LEVEL', 5))
+		app.config['COMPRESS_MIN_SIZE'] = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+		app.config['COMPRESS_MIMETYPES'] = {mm.strip() for mm in os.environ.get('COMPRESS_MIMETYPES', 'application/json,text/html,text/css,text/plain,text/javascript,application/javascript,image/svg+xml').split(',') if mm.strip()}
+
+		# live events -- SSE streams per user | local → this process only, sqlite → shared log tailed by every worker
+		app.config['EVENT_BROKER'] = os.environ.get('EVENT_BROKER', 'local')
+		app.config['EVENT_BROKER_PATH'] = os.environ.get('EVENT_BROKER_PATH') # default DATA_FOLDER/events.db
+		app.config['EVENT_POLL_MS'] = float(os.environ.get('EVENT_POLL_MS', 200))
+		app.config['EVENT_BUFFER_SIZE'] = int(os.environ.get('EVENT_BUFFER_SIZE', 100))
+		app.config['EVENT_STREAM_SECONDS'] = int(os.environ.get('EVENT_STREAM_SECONDS', 300))
+		app.config['EVENT_HEARTBEAT_SECONDS'] = float(os.environ.get('EVENT_HEARTBEAT_SECONDS', 15))
+		app.config['EVENT_MAX_STREAMS'] = int(os.environ.get('EVENT_MAX_STREAMS', 50))
+		app.config['EVENT_TICKET_SECONDS'] = int(os.environ.get('EVENT_TICKET_SECONDS', 30)) # POST /events/ticket → single-use, stream-only
+
+		# batch API -- sub-requests per call | pool threads for concurrent read batches (each holds a db connection)
+		app.config['BATCH_MAX_REQUESTS'] = int(os.environ.get('BATCH_MAX_REQUESTS', 20))
+		app.config['BATCH_MAX_WORKERS'] = int(os.environ.get('BATCH_MAX_WORKERS', 4))
+
+	with profiler.phase('extensions'):
+		install_compression(app) # first after_request registered → runs last, on the final body
+		CORS(app, origins="*")
+		jwt = JWTManager(app)
+		db.init_app(app)
+		migrate = Migrate(app, db)
+		with app.app_context():
+			configure_sqlite(app, db)
+			install_query_stats(app, db) # X-Query-Count / Server-Timing headers + slow query log
+			install_metrics(app, db) # /metrics -- prometheus, merged across workers via PROMETHEUS_MULTIPROC_DIR
+		install_request_profiler(app) # X-Profile (admins) / PROFILE_SAMPLE_RATE → collapsed stacks
+		install_event_bus(app) # committed balance / transaction changes → SSE streams (EVENT_BROKER=sqlite → across workers)
 
 	# UPD -- AUTO INIT DB on first run
-	with app.app_context():
+	with profiler.phase('db_init'), app.app_context():
 		try: auto_initialize_database()
 		except Exception as e: logger.error(f" !!! DB INIT ERRROR --  {e} !!! ")
 
 	# api routes
-	from src.api.routes.user_routes import user_bp
-	from src.api.routes.account_routes import account_bp
-	from src.api.routes.loan_routes import loan_bp
-
-	app.register_blueprint(user_bp, url_prefix='/api/v1/users')
-	app.register_blueprint(account_bp, url_prefix='/api/v1/accounts')
-	app.register_blueprint(loan_bp, url_prefix='/api/v1/loans')
-
-	@app.route('/')
-	def index(): return send_from_directory(app.static_folder, 'index.html')
-
-	@app.route('/<path:filename>')
-	def static_files(filename):
-		try: return send_from_directory(app.static_folder, filename)
-		except: return send_from_directory(app.static_folder, 'index.html') # if not found → defalut route
+	with profiler.phase('blueprints'):
+		from src.api.routes.user_routes import user_bp
+		from src.api.routes.account_routes import account_bp
+		from src.api.routes.loan_routes import loan_bp
+		from src.api.routes.dashboard_routes import dashboard_bp
+		from src.api.routes.admin_routes import admin_bp
+		from src.api.routes.event_routes import events_bp
+		from src.api.routes.batch_routes import batch_bp
+
+		app.register_blueprint(user_bp, url_prefix='/api/v1/users')
+		app.register_blueprint(account_bp, url_prefix='/api/v1/accounts')
+		app.register_blueprint(loan_bp, url_prefix='/api/v1/loans')
+		app.register_blueprint(dashboard_bp, url_prefix='/api/v1/dashboard')
+		app.register_blueprint(admin_bp, url_prefix='/api/v1/admin')
+		app.register_blueprint(events_bp, url_prefix='/api/v1/events')
+		app.register_blueprint(batch_bp, url_prefix='/api/v1/batch')
+
+	# static SPA -- one manifest lookup per request (hashed build → immutable) | unknown paths → index.html
+	install_static_assets(app)
+	app.add_url_rule('/', 'index', serve_asset)
 
 	@app.errorhandler(404)
-	def not_found(e): return send_from_directory(app.static_folder, 'index.html'), 200
+	def not_found(e): return serve_asset('index.html'), 200
 
 	@app.route('/health')
 	def health(): # UPD -- added stability check endpoint for render
 		try:
-			user_count = User.query.count()
-			return {'status': 'healthy','service': 'banking-system','database': 'connected','users': user_count}, 200
+			with replica_session(): user_count = User.query.count()
+			return {'status': 'healthy','service': 'banking-system','database': 'connected','replica': REPLICA_BIND in db.engines,'users': user_count}, 200
 		except Exception as e:
 			return {
 				'status': 'unhealthy',
@@ -88,15 +153,28 @@ def create_app():
 
 	# keep alive to prevent server from going to sleep (ihu render _-_)
 	if not app.config.get('TESTING'):
-		setup_keepalive(app)
+		with profiler.phase('keepalive'): setup_keepalive(app)
 
 	return app
 
 
+def _normalize_db_url(url):
+	if url.startswith('postgres://'): url = url.replace('postgres://', 'postgresql://', 1)
+	return url
+
+
+def _engine_options(): # pool sizing from env | unset → SQLAlchemy defaults
+	opts = {'pool_pre_ping': True, 'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 300))}
+	for env_key, opt in (('DB_POOL_SIZE', 'pool_size'), ('DB_MAX_OVERFLOW', 'max_overflow'), ('DB_POOL_TIMEOUT', 'pool_timeout')):
+		if os.environ.get(env_key): opts[opt] = int(os.environ[env_key])
+	return opts
+
+
 def auto_initialize_database():
 	try:
 		logger.info("checking db init...")
-		db.create_all()
+		db.create_all(bind_key=None) # primary only -- replica gets schema via replication
+		for idx in Transaction.__table__.indexes: idx.create(db.engine, checkfirst=True) # tables created before the index existed
 		logger.info("DB tables verified/created")
 
 		if User.query.count() == 0: # check if init needed
@@ -147,6 +225,8 @@ def auto_initialize_database():
 				description='Initial deposit'
 			)
 			db.session.add(savings_transaction)
+			db.session.add(LedgerEntry.post(checking_account, 1500.00, 'deposit', checking_transaction))
+			db.session.add(LedgerEntry.post(savings_account, 10000.00, 'deposit', savings_transaction))
 			db.session.commit()
 
 			logger.info(" === sample transacs created === ")
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 class Transaction:
-    TRANSACTION_TYPES = ['deposit', 'withdrawal', 'transfer']
+    TRANSACTION_TYPES = ['deposit', 'withdrawal', 'transfer', 'interest']
     def __init__(self, account_id, transaction_type, amount, description=None,destination_account_id=None, transaction_id=None, created_at=None):
         if transaction_type not in self.TRANSACTION_TYPES: raise ValueError(f"Transaction type must be one of {self.TRANSACTION_TYPES}")
         self.transaction_id = transaction_id if transaction_id else str(uuid.uuid4())
@@ -1,5 +1,14 @@
-from src.models import db, Account, Transaction, User
-from src.utils.tx_hash_store import record_transaction_hash, find_transaction_hash
+import os
+from collections import namedtuple
+from datetime import datetime
+from src.models import db, Account, Transaction, User, LedgerEntry
+from src.utils.cache import LRUTTLCache
+from src.utils.tx_hash_store import record_transaction_hash, hash_transaction_id
+from src.utils.metrics import record_money
+
+# immutable-ish acc attrs (NO balance) -- enough for ownership checks + number → id resolution
+AccountRef = namedtuple('AccountRef', ['account_id', 'user_id', 'account_number', 'account_type', 'active'])
+account_ref_cache = LRUTTLCache(maxsize=int(os.environ.get('ACCOUNT_CACHE_SIZE', 10000)), ttl=float(os.environ.get('ACCOUNT_CACHE_TTL', 60)))
 
 class AccountManager: # mng acc ops w DB
 
@@ -7,14 +16,54 @@ class AccountManager: # mng acc ops w DB
 	def get_all_accounts(self): return Account.query.all()
 	def get_account_by_id(self, account_id): return Account.query.filter_by(account_id=account_id).first()
 	def get_user_accounts(self, user_id): return Account.query.filter_by(user_id=user_id).all()
+	def get_account_owner(self, account_id): return db.session.query(Account.user_id).filter_by(account_id=account_id).scalar() # user_id only -- uncached, decides who may get a 304
 	# =================== #
 
+	# ===== cached refs -- balances always come from the DB rows above ===== #
+	def get_account_ref(self, account_id):
+		ref = account_ref_cache.get(account_id)
+		if ref is None:
+			ref = self._load_ref(Account.account_id == account_id)
+		return ref
+
+	def get_account_ref_by_number(self, account_number):
+		account_id = account_ref_cache.get(('number', account_number))
+		if account_id is not None:
+			ref = self.get_account_ref(account_id)
+			if ref and ref.account_number == account_number: return ref
+		return self._load_ref(Account.account_number == account_number)
+
+	def _load_ref(self, criterion):
+		row = db.session.query(Account.account_id, Account.user_id, Account.account_number, Account.account_type, Account.active).filter(criterion).first()
+		if not row: return None
+		ref = AccountRef(*row)
+		account_ref_cache.set(ref.account_id, ref)
+		account_ref_cache.set(('number', ref.account_number), ref.account_id)
+		return ref
+
+	def _invalidate_ref(self, account_id):
+		ref = account_ref_cache.pop(account_id)
+		if ref: account_ref_cache.pop(('number', ref.account_number))
+
+	def get_cache_stats(self): return account_ref_cache.stats()
+	# ====================================================================== #
+
+	def _lock_account(self, account_id): # fresh row for balance changes | row lock on pg, write lock in sqlite prod mode
+		return Account.query.filter_by(account_id=account_id).with_for_update().populate_existing().first()
+
+	def _lock_query(self, account_ids): # one SELECT .. ORDER BY account_id FOR UPDATE → every transaction locks in the same order, no A→B / B→A deadlock
+		return Account.query.filter(Account.account_id.in_(sorted(set(account_ids)))).order_by(Account.account_id).with_for_update().populate_existing()
+
+	def _lock_accounts(self, account_ids): return {acc.account_id: acc for acc in self._lock_query(account_ids)} # account_id → locked row (missing ids absent)
+
 	def create_account(self, account_data):
 		try:
 			acc = Account(user_id=account_data['user_id'],account_type=account_data['account_type'],balance=account_data.get('balance', 0.0),account_number=account_data.get('account_number'))
 			db.session.add(acc)
+			db.session.flush() # acc id for the initial deposit rows
+			tx = self._add_transaction(acc, 'deposit', float(acc.balance), 'initial deposit') if acc.balance>0 else None
 			db.session.commit()
-			if acc.balance>0: self._create_transaction(acc.account_id,'deposit',acc.balance,'initial deposit')
+			if tx: self._record_hash(tx)
 			return acc.account_id
 		except Exception as e:
 			db.session.rollback()
@@ -29,6 +78,7 @@ class AccountManager: # mng acc ops w DB
 				if hasattr(acc, key) and key not in ['account_id', 'balance']: setattr(acc, key, value)
 
 			db.session.commit()
+			self._invalidate_ref(account_id)
 			return True
 		except Exception as e:
 			db.session.rollback()
@@ -41,6 +91,7 @@ class AccountManager: # mng acc ops w DB
 			if acc.balance != 0: raise ValueError("cannot close account with non-zero balance")
 			acc.active = False
 			db.session.commit()
+			self._invalidate_ref(account_id)
 			return True
 		except ValueError: raise
 		except Exception as e:
@@ -49,43 +100,49 @@ class AccountManager: # mng acc ops w DB
 
 	def deposit(self, account_id, amount, description=None): # new balance
 		try:
-			acc = self.get_account_by_id(account_id)
+			acc = self._lock_account(account_id)
 			if not acc: raise ValueError("account not found")
 			if not acc.active: raise ValueError("cannot deposit to inactive account")
 			if amount <= 0: raise ValueError("Deposit amount must be positive")
 
 			acc.balance = float(acc.balance) + amount
+			tx = self._add_transaction(acc, 'deposit', amount, description or 'deposit') # transac hstry + ledger leg
 			db.session.commit()
-			tx_id = self._create_transaction(account_id,'deposit',amount, description or 'deposit') # transac hstry
-			return float(acc.balance), tx_id
-		except ValueError: raise
+			record_money('deposit', amount)
+			self._record_hash(tx)
+			return float(acc.balance), tx.transaction_id
+		except ValueError:
+			db.session.rollback() # drop row locks taken by _lock_account
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
 
 	def withdraw(self, account_id, amount, description=None): # new balance if succs else none
 		try:
-			acc = self.get_account_by_id(account_id)
+			acc = self._lock_account(account_id)
 			if not acc: raise ValueError("account not found")
 			if not acc.active: raise ValueError("cannot withdraw from inactive account")
 			if amount <= 0: raise ValueError("Withdrawal amount must be positive")
 			if amount>acc.balance: raise ValueError("Insufficient funds")
 
 			acc.balance = float(acc.balance) - amount
+			tx = self._add_transaction(acc, 'withdrawal', amount, description or 'withdrawal') # same commit as the balance
 			db.session.commit()
-
-			# create transaction record
-			tx_id = self._create_transaction(account_id,'withdrawal',amount,description or 'withdrawal')
-			return float(acc.balance), tx_id
-		except ValueError: raise
+			record_money('withdrawal', amount)
+			self._record_hash(tx)
+			return float(acc.balance), tx.transaction_id
+		except ValueError:
+			db.session.rollback() # drop row locks taken by _lock_account
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
 
 	def transfer(self, from_account_id, to_account_id, amount, description=None): #bpol
 		try:
-			from_account = self.get_account_by_id(from_account_id)
-			to_account = self.get_account_by_id(to_account_id)
+			locked = self._lock_accounts([from_account_id, to_account_id])
+			from_account, to_account = locked.get(from_account_id), locked.get(to_account_id)
 
 			if not from_account or not to_account: raise ValueError("one or both accounts not found")
 			if not from_account.active or not to_account.active: raise ValueError("cannot transfer to/from inactive account")
@@ -114,8 +171,13 @@ class AccountManager: # mng acc ops w DB
 			)
 			db.session.add(in_tx)
 
+			now = datetime.utcnow()
+			db.session.add(LedgerEntry.post(from_account, -amount, 'transfer_out', out_tx, now))
+			db.session.add(LedgerEntry.post(to_account, amount, 'transfer_in', in_tx, now))
+
 			# Commit once for atomicity
 			db.session.commit()
+			record_money('transfer', amount)
 
 			# Record hashes for both transactions
 			record_transaction_hash(
@@ -141,7 +203,9 @@ class AccountManager: # mng acc ops w DB
 
 			# Return the outgoing (debit) transaction id
 			return out_tx.transaction_id
-		except ValueError: raise
+		except ValueError:
+			db.session.rollback() # drop row locks taken by _lock_account
+			raise
 		except Exception as e:
 			db.session.rollback()
 			raise e
@@ -159,28 +223,25 @@ class AccountManager: # mng acc ops w DB
 
 	def get_transaction_by_id(self, transaction_id): return Transaction.query.filter_by(transaction_id=transaction_id).first()
 
-	def _create_transaction(self, account_id, transaction_type, amount, description, destination_account_id=None):
-		try:
-			transaction = Transaction(account_id=account_id,transaction_type=transaction_type,amount=amount,description=description,destination_account_id=destination_account_id)
-			db.session.add(transaction)
-			db.session.commit()
-			# hash & store separately with metadata
-			from_acc = self.get_account_by_id(account_id)
-			to_acc = self.get_account_by_id(destination_account_id) if destination_account_id else None
-			record_transaction_hash(
-				transaction.transaction_id,
-				transaction.created_at,
-				from_user_id=from_acc.user_id if from_acc else None,
-				to_user_id=to_acc.user_id if to_acc else None,
-				from_account_id=account_id,
-				to_account_id=destination_account_id,
-				from_account_number=from_acc.account_number if from_acc else None,
-				to_account_number=to_acc.account_number if to_acc else None,
-			)
-			return transaction.transaction_id
-		except Exception as e:
-			db.session.rollback()
-			return None
+	def _add_transaction(self, acc, transaction_type, amount, description): # tx row + ledger leg for acc (balance already applied) | caller commits
+		transaction = Transaction(account_id=acc.account_id,transaction_type=transaction_type,amount=amount,description=description)
+		db.session.add(transaction)
+		db.session.add(LedgerEntry.post(acc, -amount if transaction_type == 'withdrawal' else amount, transaction_type, transaction))
+		return transaction
+
+	def _record_hash(self, transaction): # hash & store separately with metadata -- after the commit
+		from_acc = self.get_account_ref(transaction.account_id)
+		to_acc = self.get_account_ref(transaction.destination_account_id) if transaction.destination_account_id else None
+		return record_transaction_hash(
+			transaction.transaction_id,
+			transaction.created_at,
+			from_user_id=from_acc.user_id if from_acc else None,
+			to_user_id=to_acc.user_id if to_acc else None,
+			from_account_id=transaction.account_id,
+			to_account_id=transaction.destination_account_id,
+			from_account_number=from_acc.account_number if from_acc else None,
+			to_account_number=to_acc.account_number if to_acc else None,
+		)
 
 	def multi_transfer(self, from_account_id, transfers, description=None):
 		"""Perform multiple transfers from one source account to many destination accounts.
@@ -190,41 +251,53 @@ class AccountManager: # mng acc ops w DB
 		"""
 		if not isinstance(transfers, list) or len(transfers) < 1:
 			raise ValueError("transfers must be a non-empty list")
-		from_account = self.get_account_by_id(from_account_id)
-		if not from_account:
-			raise ValueError("source account not found")
-		if not from_account.active:
-			raise ValueError("cannot transfer from inactive account")
-		# validate amounts and destination accounts first
-		total_amount = 0.0
-		dest_accounts = []
-		for item in transfers:
-			if 'to_account_id' not in item or 'amount' not in item:
-				raise ValueError("each transfer item requires to_account_id and amount")
-			amt = float(item['amount'])
-			if amt <= 0:
-				raise ValueError("each transfer amount must be positive")
-			dest_acc = self.get_account_by_id(item['to_account_id'])
-			if not dest_acc:
-				raise ValueError(f"destination account not found: {item['to_account_id']}")
-			if not dest_acc.active:
-				raise ValueError(f"destination account inactive: {item['to_account_id']}")
-			dest_accounts.append((dest_acc, amt))
-			total_amount += amt
-		if total_amount > from_account.balance:
-			raise ValueError("insufficient funds for aggregate multi-transfer amount")
-		# apply debits/credits
 		try:
-			from_account.balance = float(from_account.balance) - total_amount
+			for item in transfers:
+				if not isinstance(item, dict) or not isinstance(item.get('to_account_id'), str) or 'amount' not in item:
+					raise ValueError("each transfer item requires to_account_id and amount")
+			locked = self._lock_accounts([from_account_id] + [item['to_account_id'] for item in transfers]) # source + every destination, sorted
+			from_account = locked.get(from_account_id)
+			if not from_account:
+				raise ValueError("source account not found")
+			if not from_account.active:
+				raise ValueError("cannot transfer from inactive account")
+			# validate amounts and destination accounts first
+			total_amount = 0.0
+			dest_accounts = []
+			for item in transfers:
+				amt = float(item['amount'])
+				if amt <= 0:
+					raise ValueError("each transfer amount must be positive")
+				dest_acc = locked.get(item['to_account_id'])
+				if not dest_acc:
+					raise ValueError(f"destination account not found: {item['to_account_id']}")
+				if not dest_acc.active:
+					raise ValueError(f"destination account inactive: {item['to_account_id']}")
+				dest_accounts.append((dest_acc, amt))
+				total_amount += amt
+			if total_amount > from_account.balance:
+				raise ValueError("insufficient funds for aggregate multi-transfer amount")
+		except ValueError:
+			db.session.rollback() # drop row locks taken by _lock_account
+			raise
+		# apply debits/credits -- balances, one transaction row per destination and both ledger legs in one commit
+		try:
+			now = datetime.utcnow()
+			txs = []
 			for dest_acc, amt in dest_accounts:
+				from_account.balance = float(from_account.balance) - amt
 				dest_acc.balance = float(dest_acc.balance) + amt
+				tx = Transaction(account_id=from_account_id, transaction_type='transfer', amount=amt, description=description or 'multi-transfer', destination_account_id=dest_acc.account_id)
+				db.session.add(tx)
+				db.session.add(LedgerEntry.post(from_account, -amt, 'transfer_out', tx, now))
+				db.session.add(LedgerEntry.post(dest_acc, amt, 'transfer_in', tx, now))
+				txs.append((tx, dest_acc))
 			db.session.commit()
-			# create individual transaction records
+			record_money('transfer', total_amount, count=len(txs))
 			results = []
-			for dest_acc, amt in dest_accounts:
-				tx_id = self._create_transaction(from_account_id, 'transfer', amt, description or 'multi-transfer', dest_acc.account_id)
-				entry = find_transaction_hash(tx_id)
-				results.append({'transaction_id': tx_id, 'hash': entry['hash'] if entry else None, 'to_account_id': dest_acc.account_id})
+			for tx, dest_acc in txs:
+				recorded = self._record_hash(tx)
+				results.append({'transaction_id': tx.transaction_id, 'hash': hash_transaction_id(tx.transaction_id) if recorded else None, 'to_account_id': dest_acc.account_id})
 			return results
 		except Exception as e:
 			db.session.rollback()
@@ -0,0 +1,122 @@
+import os
+from datetime import datetime, date, time, timedelta
+from sqlalchemy import func, insert
+from src.models import db, Account, AccountBalanceSnapshot, JobRun
+from src.utils.tx_legs import account_legs
+
+ONE_DAY = timedelta(days=1)
+MAX_HISTORY_DAYS = 3660
+
+
+class BalanceSnapshotManager:
+	"""End-of-day balances per account, materialized in account_balance_snapshots.
+
+	refresh() rolls a watermark (last day fully snapshotted) forward: the legs posted after it are summed per
+	account and day and added onto each account's last closing balance. Reads look up the latest snapshot at or
+	before a date; only days after the watermark (refresh lagging) are replayed from transactions.
+	"""
+
+	JOB_NAME = 'balance_snapshots'
+	WATERMARK_KEY = 'watermark'
+
+	def __init__(self, chunk_size=None):
+		self.chunk_size = chunk_size or int(os.environ.get('SNAPSHOT_CHUNK_SIZE', 2000))
+
+	def get_watermark(self):
+		job = db.session.get(JobRun, (self.JOB_NAME, self.WATERMARK_KEY))
+		return date.fromisoformat(job.cursor) if job and job.cursor else None
+
+	def refresh(self, through=None, rebuild=False): # through -- last day to snapshot (default yesterday, UTC)
+		today = datetime.utcnow().date()
+		through = through or today - ONE_DAY
+		if through >= today: raise ValueError("only days that have ended can be snapshotted")
+
+		job = db.session.get(JobRun, (self.JOB_NAME, self.WATERMARK_KEY))
+		if not job:
+			job = JobRun(job_name=self.JOB_NAME, period_key=self.WATERMARK_KEY, status='running', processed=0)
+			db.session.add(job)
+		watermark = None if rebuild or not job.cursor else date.fromisoformat(job.cursor)
+		if watermark and through <= watermark:
+			db.session.commit()
+			return {'status': 'up_to_date', 'watermark': watermark.isoformat(), 'written': 0}
+		job.status, job.started_at, job.finished_at = 'running', datetime.utcnow(), None
+		db.session.commit()
+
+		since = datetime.combine(watermark + ONE_DAY, time.min) if watermark else None
+		until = datetime.combine(through + ONE_DAY, time.min)
+		written, last_id = 0, None
+		while True: # chunks re-write their own rows (delete + insert) → a crashed refresh can simply run again
+			q = db.session.query(Account.account_id)
+			if last_id: q = q.filter(Account.account_id > last_id)
+			ids = [r.account_id for r in q.order_by(Account.account_id).limit(self.chunk_size)]
+			if not ids: break
+			written += self._refresh_chunk(ids, watermark, since, until)
+			db.session.commit()
+			last_id = ids[-1]
+
+		job.cursor = through.isoformat()
+		job.processed = (0 if rebuild else job.processed) + written
+		job.status, job.finished_at = 'completed', datetime.utcnow()
+		db.session.commit()
+		return {'status': 'completed', 'watermark': job.cursor, 'written': written}
+
+	def _refresh_chunk(self, ids, watermark, since, until):
+		S = AccountBalanceSnapshot
+		running = {}
+		stale = S.__table__.delete().where(S.account_id.in_(ids))
+		if watermark:
+			# opening balance -- closing of each account's last snapshot at / before the watermark
+			latest = db.session.query(S.account_id, func.max(S.snapshot_date).label('day')).filter(S.account_id.in_(ids), S.snapshot_date <= watermark).group_by(S.account_id).subquery()
+			running = {acc_id: float(bal) for acc_id, bal in db.session.query(S.account_id, S.closing_balance).join(latest, (S.account_id == latest.c.account_id) & (S.snapshot_date == latest.c.day))}
+			stale = stale.where(S.snapshot_date > watermark)
+		db.session.execute(stale)
+
+		days = {} # (account_id, day) → [net, tx count]
+		for _, acc_id, amount, created_at in account_legs(ids, since=since, until=until):
+			bucket = days.setdefault((acc_id, created_at.date()), [0.0, 0])
+			bucket[0] += amount
+			bucket[1] += 1
+
+		rows = []
+		for acc_id, day in sorted(days):
+			net, count = days[(acc_id, day)]
+			running[acc_id] = round(running.get(acc_id, 0.0) + net, 2)
+			rows.append({'account_id': acc_id, 'snapshot_date': day, 'closing_balance': running[acc_id], 'net_change': round(net, 2), 'tx_count': count})
+		if rows: db.session.execute(insert(S), rows)
+		return len(rows)
+
+	def balance_at(self, account_id, on): # closing balance of `on` → (balance, source)
+		if on >= datetime.utcnow().date():
+			return float(db.session.query(Account.balance).filter_by(account_id=account_id).scalar() or 0), 'live'
+		watermark = self.get_watermark()
+		if watermark and on <= watermark:
+			snap = db.session.query(AccountBalanceSnapshot.closing_balance).filter(AccountBalanceSnapshot.account_id == account_id, AccountBalanceSnapshot.snapshot_date <= on).order_by(AccountBalanceSnapshot.snapshot_date.desc()).first()
+			return (float(snap.closing_balance) if snap else 0.0), 'snapshot'
+		# past the watermark -- live balance minus what was posted after `on`
+		live = float(db.session.query(Account.balance).filter_by(account_id=account_id).scalar() or 0)
+		after = sum(leg[2] for leg in account_legs([account_id], since=datetime.combine(on + ONE_DAY, time.min)))
+		return round(live - after, 2), 'replay'
+
+	def balance_history(self, account_id, start, end): # [{date, balance}] one point per day, start..end inclusive
+		end = min(end, datetime.utcnow().date())
+		if start > end: raise ValueError("start date must not be after end date")
+		if (end - start).days >= MAX_HISTORY_DAYS: raise ValueError(f"at most {MAX_HISTORY_DAYS} days per request")
+
+		S = AccountBalanceSnapshot
+		watermark = self.get_watermark()
+		closing = {}
+		balance, _ = self.balance_at(account_id, start - ONE_DAY)
+		if watermark and start <= watermark: # snapshot part -- carry each closing forward over days without activity
+			snap_end = min(end, watermark)
+			closing.update({ss.snapshot_date: float(ss.closing_balance) for ss in S.query.filter(S.account_id == account_id, S.snapshot_date >= start, S.snapshot_date <= snap_end)})
+			for day in _days(start, snap_end): closing[day] = balance = closing.get(day, balance)
+		rest = max(start, watermark + ONE_DAY) if watermark else start
+		if rest <= end: # past the watermark -- replay those days only
+			net = {}
+			for _, _, amount, created_at in account_legs([account_id], since=datetime.combine(rest, time.min), until=datetime.combine(end + ONE_DAY, time.min)):
+				net[created_at.date()] = net.get(created_at.date(), 0.0) + amount
+			for day in _days(rest, end): closing[day] = balance = round(balance + net.get(day, 0.0), 2)
+		return [{'date': day.isoformat(), 'balance': closing[day]} for day in _days(start, end)]
+
+
+def _days(start, end): return [start + timedelta(days=i) for i in range((end - start).days + 1)]
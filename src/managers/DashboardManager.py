@@ -0,0 +1,89 @@
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import func, or_, select
+from src.models import db, Account, Loan, Transaction, User
+from src.utils.cache import LRUTTLCache
+
+# admin overview responses, per worker | a few seconds stale is fine for overview figures
+overview_cache = LRUTTLCache(maxsize=32, ttl=float(os.environ.get('ADMIN_OVERVIEW_TTL', 30)))
+
+
+class DashboardManager:
+	"""Dashboard numbers for one user, computed in the database.
+
+	The four aggregates are scalar subqueries of a single SELECT → one round trip, and the response stays the
+	same size however much history the user has. The latest-transactions list is a separate LIMIT read.
+	The admin overview is built the same way from GROUP BY queries and cached for ADMIN_OVERVIEW_TTL seconds.
+	"""
+
+	RECENT_DAYS = 30
+	LATEST_LIMIT = 5
+	MAX_VOLUME_DAYS = 90
+
+	def get_summary(self, user_id, now=None):
+		since = (now or datetime.utcnow()) - timedelta(days=self.RECENT_DAYS)
+		own = select(Account.account_id).where(Account.user_id == user_id)
+		touches = or_(Transaction.account_id.in_(own), Transaction.destination_account_id.in_(own)) # same rows as get_transactions(user_id)
+		row = db.session.execute(select(
+			select(func.count()).select_from(Account).where(Account.user_id == user_id).scalar_subquery().label('total_accounts'),
+			select(func.coalesce(func.sum(Account.balance), 0)).where(Account.user_id == user_id).scalar_subquery().label('total_balance'),
+			select(func.count()).select_from(Loan).where(Loan.user_id == user_id, Loan.status == 'active').scalar_subquery().label('active_loans'),
+			select(func.count()).select_from(Transaction).where(touches, Transaction.created_at >= since).scalar_subquery().label('recent_transactions'),
+		)).one()
+		latest = Transaction.query.filter(touches).order_by(Transaction.created_at.desc()).limit(self.LATEST_LIMIT).all()
+		return {
+			'total_accounts': row.total_accounts,
+			'total_balance': round(float(row.total_balance), 2),
+			'active_loans': row.active_loans,
+			'recent_transactions': row.recent_transactions,
+			'recent_days': self.RECENT_DAYS,
+			'latest_transactions': [tt.to_dict() for tt in latest],
+		}
+
+	def get_admin_overview(self, days=14, top=10):
+		if not 1 <= days <= self.MAX_VOLUME_DAYS: raise ValueError(f"days must be between 1 and {self.MAX_VOLUME_DAYS}")
+		if not 1 <= top <= 100: raise ValueError("top must be between 1 and 100")
+		key = (days, top)
+		cached = overview_cache.get(key)
+		if cached is not None: return cached
+
+		now = datetime.utcnow()
+		since = datetime.combine((now - timedelta(days=days - 1)).date(), datetime.min.time())
+		count = lambda model, *where: select(func.count()).select_from(model).where(*where).scalar_subquery()
+		total = lambda col, *where: select(func.coalesce(func.sum(col), 0)).where(*where).scalar_subquery()
+		totals = db.session.execute(select(
+			count(User).label('users'),
+			count(Account).label('accounts'),
+			count(Account, Account.active == True).label('active_accounts'),
+			total(Account.balance).label('total_balance'),
+			count(Transaction).label('transactions'),
+			count(Loan).label('loans'),
+			total(Loan.balance, Loan.status == 'active').label('outstanding_loans'),
+		)).one()
+
+		day = func.date(Transaction.created_at)
+		volume = {}
+		for dd, tx_type, n, amount in db.session.query(day, Transaction.transaction_type, func.count(), func.sum(Transaction.amount)).filter(Transaction.created_at >= since).group_by(day, Transaction.transaction_type):
+			bucket = volume.setdefault(str(dd), {'date': str(dd), 'count': 0, 'amount': 0.0, 'by_type': {}})
+			bucket['count'] += n
+			bucket['amount'] = round(bucket['amount'] + float(amount or 0), 2)
+			bucket['by_type'][tx_type] = {'count': n, 'amount': round(float(amount or 0), 2)}
+		empty = lambda dd: {'date': dd, 'count': 0, 'amount': 0.0, 'by_type': {}}
+		dates = [(since + timedelta(days=i)).date().isoformat() for i in range(days)]
+
+		overview = {
+			'generated_at': now.isoformat(),
+			'totals': {
+				'users': totals.users, 'accounts': totals.accounts, 'active_accounts': totals.active_accounts, 'total_balance': round(float(totals.total_balance), 2),
+				'transactions': totals.transactions, 'loans': totals.loans, 'outstanding_loans': round(float(totals.outstanding_loans), 2),
+			},
+			'users_by_role': {role: n for role, n in db.session.query(User.role, func.count()).group_by(User.role)},
+			'accounts_by_type': {tt: {'count': n, 'balance': round(float(bal or 0), 2)} for tt, n, bal in db.session.query(Account.account_type, func.count(), func.sum(Account.balance)).group_by(Account.account_type)},
+			'loans_by_status': {st: {'count': n, 'amount': round(float(amt or 0), 2), 'balance': round(float(bal or 0), 2)} for st, n, amt, bal in db.session.query(Loan.status, func.count(), func.sum(Loan.amount), func.sum(Loan.balance)).group_by(Loan.status)},
+			'transactions_by_type': {tt: {'count': n, 'amount': round(float(amt or 0), 2)} for tt, n, amt in db.session.query(Transaction.transaction_type, func.count(), func.sum(Transaction.amount)).group_by(Transaction.transaction_type)},
+			'daily_volume': [volume.get(dd) or empty(dd) for dd in dates],
+			'recent_transactions': [tt.to_dict() for tt in Transaction.query.order_by(Transaction.created_at.desc()).limit(top)],
+			'recent_loans': [ll.to_dict() for ll in Loan.query.order_by(Loan.created_at.desc()).limit(top)],
+		}
+		overview_cache.set(key, overview)
+		return overview
@@ -0,0 +1,71 @@
+import os
+from sqlalchemy import and_, func, insert, or_
+from src.models import db, Account, Transaction, LedgerEntry
+from src.utils.tx_legs import signed_legs
+
+
+class LedgerManager:
+	"""Reads over ledger_entries -- one signed row per account leg carrying the account's balance after it.
+
+	Every money path writes its legs in the same commit as the balance change, so an account's history and its
+	balance at any instant are range scans on (account_id, created_at, entry_id). backfill() derives the legs of
+	transactions written before the ledger existed from the transactions table.
+	"""
+
+	TRANSFER_TYPES = {True: 'transfer_in', False: 'transfer_out'} # by sign of the leg
+
+	def __init__(self, chunk_size=None):
+		self.chunk_size = chunk_size or int(os.environ.get('LEDGER_BACKFILL_CHUNK_SIZE', 1000))
+
+	def get_entries(self, account_id, limit=50, before=None): # newest first | before -- entry_id of the last row already seen
+		q = LedgerEntry.query.filter(LedgerEntry.account_id == account_id)
+		if before is not None:
+			anchor = db.session.get(LedgerEntry, before)
+			if not anchor or anchor.account_id != account_id: raise ValueError("unknown ledger cursor")
+			q = q.filter(or_(LedgerEntry.created_at < anchor.created_at, and_(LedgerEntry.created_at == anchor.created_at, LedgerEntry.entry_id < anchor.entry_id)))
+		return q.order_by(LedgerEntry.created_at.desc(), LedgerEntry.entry_id.desc()).limit(limit).all()
+
+	def balance_at(self, account_id, at): # balance right after the last leg posted at / before `at` → 0 before the first one
+		last = db.session.query(LedgerEntry.balance_after).filter(LedgerEntry.account_id == account_id, LedgerEntry.created_at <= at) \
+			.order_by(LedgerEntry.created_at.desc(), LedgerEntry.entry_id.desc()).first()
+		return float(last.balance_after) if last else 0.0
+
+	def backfill(self):
+		""" write the missing legs of pre-ledger transactions, chunked by account | safe to re-run """
+		written, accounts, last_id = 0, 0, None
+		while True:
+			q = db.session.query(Account.account_id, Account.balance)
+			if last_id: q = q.filter(Account.account_id > last_id)
+			rows = q.order_by(Account.account_id).limit(self.chunk_size).all()
+			if not rows: break
+			written += self._backfill_chunk({r.account_id: float(r.balance) for r in rows})
+			db.session.commit()
+			accounts += len(rows)
+			last_id = rows[-1].account_id
+		return {'accounts': accounts, 'written': written}
+
+	def _backfill_chunk(self, balances):
+		ids = list(balances)
+		posted = set(db.session.query(LedgerEntry.transaction_id, LedgerEntry.account_id).filter(LedgerEntry.account_id.in_(ids)))
+		# opening balance of the ledger = balance before each account's first entry → legacy legs end there
+		first = db.session.query(LedgerEntry.account_id, func.min(LedgerEntry.entry_id).label('entry_id')).filter(LedgerEntry.account_id.in_(ids)).group_by(LedgerEntry.account_id).subquery()
+		opening = {acc_id: float(bal) - float(amt) for acc_id, bal, amt in db.session.query(LedgerEntry.account_id, LedgerEntry.balance_after, LedgerEntry.amount).join(first, LedgerEntry.entry_id == first.c.entry_id)}
+
+		txs = db.session.query(Transaction.transaction_id, Transaction.account_id, Transaction.transaction_type, Transaction.amount,
+		                       Transaction.destination_account_id, Transaction.created_at, Transaction.description) \
+			.filter(Transaction.account_id.in_(ids) | Transaction.destination_account_id.in_(ids)).all()
+		types = {tx.transaction_id: tx.transaction_type for tx in txs}
+		legacy = {}
+		for tx_id, acc_id, amount, created_at in signed_legs(txs):
+			if acc_id in balances and (tx_id, acc_id) not in posted: legacy.setdefault(acc_id, []).append((tx_id, amount, created_at))
+
+		rows = []
+		for acc_id, legs in legacy.items():
+			balance = opening.get(acc_id, balances[acc_id]) # no entries yet → legacy legs end at the live balance
+			for tx_id, amount, created_at in reversed(legs):
+				entry_type = self.TRANSFER_TYPES[amount > 0] if types[tx_id] == 'transfer' else types[tx_id]
+				rows.append({'account_id': acc_id, 'transaction_id': tx_id, 'entry_type': entry_type, 'amount': amount, 'balance_after': round(balance, 2), 'created_at': created_at})
+				balance -= amount
+		rows.reverse() # oldest first → entry_id follows time within an account
+		if rows: db.session.execute(insert(LedgerEntry), rows)
+		return len(rows)
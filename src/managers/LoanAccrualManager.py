@@ -0,0 +1,111 @@
+import os
+import uuid
+from datetime import datetime
+from sqlalchemy import bindparam, func, insert, update
+from src.models import db, Loan, LoanAccrual, LoanAccrualTotal, JobRun
+from src.managers.LoanManager import LoanManager
+from src.utils.etags import bump_versions
+
+
+class LoanAccrualManager:
+	"""Daily interest accrual + default marking for every active loan.
+
+	Loans are walked in loan_id order in chunks; each chunk is one db transaction holding its
+	accrual rows, the balance/status updates and the job cursor → a crashed run resumes where it
+	stopped. Each loan accrues from its own last accrual (or approval) date, so runs are incremental
+	and a date is never accrued twice. The chunk's loans are locked while it runs, and balances move
+	by `balance + interest`, so a payment committed alongside is never overwritten. Last accrual date
+	and accrued total per loan live in loan_accrual_totals → a run never re-sums the history.
+	"""
+
+	JOB_NAME = 'loan_interest_accrual'
+
+	def __init__(self, chunk_size=None, default_after_missed=None, day_count=365):
+		self.chunk_size = chunk_size or int(os.environ.get('LOAN_ACCRUAL_CHUNK_SIZE', 5000))
+		# missed monthly payments → 'defaulted' | 0 disables
+		self.default_after_missed = default_after_missed if default_after_missed is not None else int(os.environ.get('LOAN_DEFAULT_MISSED_PAYMENTS', 3))
+		self.day_count = day_count
+
+	def run(self, as_of=None):
+		as_of = as_of or datetime.utcnow().date()
+		period_key = as_of.isoformat()
+		job = db.session.get(JobRun, (self.JOB_NAME, period_key))
+		if job and job.status == 'completed':
+			return {'status': 'already_completed', 'as_of': period_key, 'processed': job.processed}
+		if not job:
+			job = JobRun(job_name=self.JOB_NAME, period_key=period_key, status='running', processed=0)
+			db.session.add(job)
+			db.session.commit()
+
+		stats = {'accrued': 0, 'interest': 0.0, 'defaulted': 0}
+		while True:
+			q = db.session.query(Loan.loan_id, Loan.user_id, Loan.amount, Loan.balance, Loan.interest_rate, Loan.term_months, Loan.approved_at, Loan.created_at).filter(Loan.status == 'active')
+			if job.cursor: q = q.filter(Loan.loan_id > job.cursor)
+			rows = q.order_by(Loan.loan_id).limit(self.chunk_size).with_for_update().all() # no payment lands mid-calculation
+			if not rows: break
+			self._process_chunk(rows, as_of, stats)
+			job.cursor = rows[-1].loan_id
+			job.processed += len(rows)
+			db.session.commit()
+
+		job.status = 'completed'
+		job.finished_at = datetime.utcnow()
+		db.session.commit()
+		db.session.expire_all() # bulk updates bypassed the identity map
+		return {'status': 'completed', 'as_of': period_key, 'processed': job.processed, 'accrued': stats['accrued'], 'interest': round(stats['interest'], 2), 'defaulted': stats['defaulted']}
+
+	def _process_chunk(self, rows, as_of, stats):
+		import numpy as np
+		from src.utils.amortization import monthly_payments
+
+		ids = [r.loan_id for r in rows]
+		totals = {tt.loan_id: (tt.last_period_end, tt.accrued_interest) for tt in db.session.query(LoanAccrualTotal).filter(LoanAccrualTotal.loan_id.in_(ids))}
+		prior = dict(totals)
+		legacy = [lid for lid in ids if lid not in totals] # accrued before the totals table existed → summed once, then kept
+		if legacy: prior.update({lid: (last_end, total) for lid, last_end, total in db.session.query(LoanAccrual.loan_id, func.max(LoanAccrual.period_end), func.sum(LoanAccrual.interest)).filter(LoanAccrual.loan_id.in_(legacy)).group_by(LoanAccrual.loan_id)})
+
+		starts = [prior[r.loan_id][0] if r.loan_id in prior else (r.approved_at or r.created_at).date() for r in rows]
+		days = np.array([(as_of - s).days for s in starts], dtype=np.int64)
+		balance = np.array([float(r.balance) for r in rows])
+		rate = np.array([float(r.interest_rate) for r in rows])
+		interest = np.round(balance * rate / 100 / self.day_count * np.maximum(days, 0), 2)
+		new_balance = np.round(balance + interest, 2)
+
+		# overdue rule -- paid so far (principal + interest) vs. level payment x months since approval
+		principal = np.array([float(r.amount) for r in rows])
+		terms = np.array([r.term_months for r in rows], dtype=np.int64)
+		accrued = np.array([float(prior[r.loan_id][1]) if r.loan_id in prior else 0.0 for r in rows]) + interest
+		due_months = np.minimum([LoanManager.months_elapsed((r.approved_at or r.created_at).date(), as_of) for r in rows], terms)
+		payment = monthly_payments(principal, rate, terms)
+		paid = principal + accrued - new_balance
+		behind = (payment * due_months - paid) / np.where(payment > 0, payment, 1)
+		defaulted = (behind >= self.default_after_missed) if self.default_after_missed > 0 else np.zeros(len(rows), dtype=bool)
+
+		now = datetime.utcnow()
+		accruals, updates, new_totals, moved_totals = [], [], [], []
+		for i, r in enumerate(rows):
+			if days[i] <= 0 and not defaulted[i]: continue
+			updates.append({'b_loan_id': r.loan_id, 'b_interest': float(interest[i]) if days[i] > 0 else 0.0, 'b_status': 'defaulted' if defaulted[i] else 'active'})
+			if days[i] > 0:
+				accruals.append({'accrual_id': str(uuid.uuid4()), 'loan_id': r.loan_id, 'period_start': starts[i], 'period_end': as_of, 'days': int(days[i]), 'interest': float(interest[i]), 'balance_after': float(new_balance[i]), 'created_at': now}) # rows are locked → r.balance is current
+				total = {'loan_id': r.loan_id, 'last_period_end': as_of, 'accrued_interest': float(round(accrued[i], 2))}
+				(moved_totals if r.loan_id in totals else new_totals).append(total)
+		if accruals:
+			db.session.execute(insert(LoanAccrual), accruals)
+			if new_totals: db.session.execute(insert(LoanAccrualTotal), new_totals)
+			if moved_totals: db.session.execute(update(LoanAccrualTotal), moved_totals) # bulk UPDATE by primary key
+		if updates:
+			loan = Loan.__table__
+			db.session.execute(update(loan).where(loan.c.loan_id == bindparam('b_loan_id')).values(balance=loan.c.balance + bindparam('b_interest', type_=loan.c.balance.type), status=bindparam('b_status')), updates)
+			changed = {uu['b_loan_id'] for uu in updates}
+			bump_versions(r.user_id for r in rows if r.loan_id in changed) # no ORM objects → no flush hook
+		stats['accrued'] += len(accruals)
+		stats['interest'] += float(sum(a['interest'] for a in accruals))
+		stats['defaulted'] += int(defaulted.sum())
+
+	def get_loan_accruals(self, loan_id):
+		return LoanAccrual.query.filter_by(loan_id=loan_id).order_by(LoanAccrual.period_end.desc()).all()
+
+	def get_runs(self, limit=30):
+		return JobRun.query.filter_by(job_name=self.JOB_NAME).order_by(JobRun.period_key.desc()).limit(limit).all()
+
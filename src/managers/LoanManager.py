@@ -1,13 +1,32 @@
-from src.models import db, Loan
-# from datetime import datetime
+from src.models import db, Loan, Account, Transaction, LedgerEntry
+from src.utils.tx_hash_store import record_transaction_hash
+from src.utils.metrics import record_money
+from datetime import datetime
+
+# admin decisions usable in bulk_decide → Loan state machine method
+BULK_ACTIONS = {'approve': Loan.approve_loan, 'reject': Loan.reject_loan, 'activate': Loan.activate_loan}
+MAX_TERM_MONTHS = 600 # 50 years -- schedules and projections allocate one column per month
+
+
+def check_term_months(value): # → int in 1..MAX_TERM_MONTHS | ValueError otherwise
+	if isinstance(value, bool) or not isinstance(value, (int, float, str)): raise ValueError("term_months must be a whole number")
+	try: term = int(value)
+	except ValueError: raise ValueError("term_months must be a whole number") from None
+	if not 1 <= term <= MAX_TERM_MONTHS: raise ValueError(f"term_months must be between 1 and {MAX_TERM_MONTHS}")
+	return term
 
 class LoanManager:
 
-	def get_all_loans(self): return Loan.query.all()
+	def get_all_loans(self, statuses=None): # statuses -- optional list to filter on
+		q = Loan.query
+		if statuses: q = q.filter(Loan.status.in_(statuses))
+		return q.all()
 	def get_loan_by_id(self,loan_id): return Loan.query.filter_by(loan_id=loan_id).first()
 	def get_user_loans(self, user_id): return Loan.query.filter_by(user_id=user_id).all()
+	def get_loan_owner(self, loan_id): return db.session.query(Loan.user_id).filter_by(loan_id=loan_id).scalar() # user_id only -- no row load
 
 	def create_loan_application(self,loan_data):
+		loan_data = {**loan_data, 'term_months': check_term_months(loan_data['term_months'])} # ValueError → caller answers 400
 		try:
 			# create new loan
 			loan = Loan(user_id=loan_data['user_id'],loan_type=loan_data['loan_type'],amount=loan_data['amount'],interest_rate=loan_data['interest_rate'],term_months=loan_data['term_months'],purpose=loan_data.get('purpose'))
@@ -19,6 +38,7 @@ class LoanManager:
 			return None
 
 	def update_loan(self, loan_id, loan_data):
+		if 'term_months' in loan_data: loan_data = {**loan_data, 'term_months': check_term_months(loan_data['term_months'])}
 		try:
 			loan = self.get_loan_by_id(loan_id)
 			if not loan: return False
@@ -71,6 +91,36 @@ class LoanManager:
 			db.session.rollback()
 			raise e
 
+	def bulk_decide(self, decisions, chunk_size=500):
+		""" decisions -- [{loan_id, action: approve|reject|activate}] | returns a result per item, in order
+		loans are loaded with one IN query per chunk and every transition is committed together """
+		ids = list({dd['loan_id'] for dd in decisions if isinstance(dd, dict) and isinstance(dd.get('loan_id'), str)})
+		try:
+			loans = {}
+			for i in range(0, len(ids), chunk_size):
+				for ll in Loan.query.filter(Loan.loan_id.in_(ids[i:i + chunk_size])).with_for_update(): loans[ll.loan_id] = ll
+
+			results = []
+			for dd in decisions: # sequential → approve then activate of the same loan in one batch works
+				loan_id = dd.get('loan_id') if isinstance(dd, dict) else None
+				action = dd.get('action') if isinstance(dd, dict) else None
+				res = {'loan_id': loan_id, 'action': action}
+				try:
+					if not isinstance(action, str): raise ValueError("action must be a string")
+					if action not in BULK_ACTIONS: raise ValueError(f"unknown action: {action}")
+					if not isinstance(loan_id, str): raise ValueError("loan_id must be a string")
+					loan = loans.get(loan_id)
+					if not loan: raise ValueError("loan not found")
+					BULK_ACTIONS[action](loan)
+					res.update(ok=True, status=loan.status)
+				except ValueError as e: res.update(ok=False, error=str(e))
+				results.append(res)
+			db.session.commit()
+			return results
+		except Exception as e:
+			db.session.rollback()
+			raise e
+
 	def make_payment(self, loan_id, amount):
 		try:
 			loan = self.get_loan_by_id(loan_id)
@@ -83,7 +133,100 @@ class LoanManager:
 			db.session.rollback()
 			raise e
 
+	@staticmethod
+	def months_elapsed(start, end): # whole months between two dates/datetimes | no start → 0
+		if not start: return 0
+		return max((end.year - start.year) * 12 + (end.month - start.month) - (1 if end.day < start.day else 0), 0)
+
+	def pay_from_account(self, loan_id, account_id, amount, description=None):
+		"""Debit the account, reduce the loan balance and write the ledger row in ONE db transaction.
+
+		returns: (new loan balance, new account balance, transaction_id) | nothing moves if anything fails
+		"""
+		try:
+			if amount <= 0: raise ValueError("Payment amount must be positive")
+			loan = Loan.query.filter_by(loan_id=loan_id).with_for_update().populate_existing().first()
+			if not loan: raise ValueError("loan not found")
+			acc = Account.query.filter_by(account_id=account_id).with_for_update().populate_existing().first()
+			if not acc: raise ValueError("account not found")
+			if not acc.active: raise ValueError("cannot pay from inactive account")
+			if amount > acc.balance: raise ValueError("insufficient funds in selected account")
+			if amount > float(loan.balance): raise ValueError("amount exceeds outstanding balance") # the loan stops at 0 → the excess would vanish
+
+			new_balance = loan.make_payment(amount) # validates loan status
+			acc.balance = float(acc.balance) - amount
+			tx = Transaction(account_id=account_id, transaction_type='withdrawal', amount=amount, description=description or f"Payment for {loan.loan_type} loan")
+			db.session.add(tx)
+			db.session.add(LedgerEntry.post(acc, -amount, 'withdrawal', tx))
+			db.session.commit()
+		except ValueError:
+			db.session.rollback()
+			raise
+		except Exception as e:
+			db.session.rollback()
+			raise e
+
+		record_money('loan_payment', amount)
+		record_transaction_hash(tx.transaction_id, tx.created_at, from_user_id=acc.user_id, from_account_id=account_id, from_account_number=acc.account_number)
+		return new_balance, float(acc.balance), tx.transaction_id
+
 	def calculate_payment(self, loan_id):
 		loan = self.get_loan_by_id(loan_id)
 		if not loan: raise ValueError("loan not found")
-		return loan.calculate_monthly_payment()
\ No newline at end of file
+		return loan.calculate_monthly_payment()
+
+	def get_amortization_schedule(self, loan_id): # contractual schedule -- orig amount / rate / term
+		from src.utils.amortization import amortize # lazy -- keep numpy off the cold start path
+		loan = self.get_loan_by_id(loan_id)
+		if not loan: raise ValueError("loan not found")
+		check_term_months(loan.term_months) # rows stored before the bound existed
+		sched = amortize([float(loan.amount)], [float(loan.interest_rate)], [loan.term_months])
+		rows = []
+		for i in range(loan.term_months):
+			interest, principal = float(sched['interest'][0, i]), float(sched['principal'][0, i])
+			rows.append({'month': i + 1, 'payment': round(interest + principal, 2), 'interest': round(interest, 2), 'principal': round(principal, 2), 'balance': round(float(sched['balance'][0, i]), 2)})
+		total_interest = float(sched['interest'][0].sum())
+		return {
+			'loan_id': loan.loan_id,
+			'monthly_payment': round(float(sched['payment'][0]), 2),
+			'total_interest': round(total_interest, 2),
+			'total_paid': round(float(loan.amount) + total_interest, 2),
+			'remaining_balance': float(loan.balance),
+			'schedule': rows,
+		}
+
+	def get_portfolio_projection(self, months=None, statuses=('active',), detail=False):
+		"""Project every outstanding loan from its current balance over its remaining term in one vectorized pass.
+
+		remaining term = term_months - whole months since approval (1..MAX_TERM_MONTHS)
+		"""
+		import numpy as np
+		from src.utils.amortization import portfolio_cashflows
+		rows = db.session.query(Loan.loan_id, Loan.balance, Loan.interest_rate, Loan.term_months, Loan.approved_at).filter(Loan.status.in_(statuses), Loan.balance > 0).all()
+		now = datetime.utcnow()
+		ids = [r.loan_id for r in rows]
+		balance = np.array([float(r.balance) for r in rows], dtype=np.float64)
+		rate = np.array([float(r.interest_rate) for r in rows], dtype=np.float64)
+		elapsed = np.array([self.months_elapsed(r.approved_at, now) for r in rows], dtype=np.int64)
+		remaining = np.clip(np.array([r.term_months for r in rows], dtype=np.int64) - elapsed, 1, MAX_TERM_MONTHS) # default horizon = longest remaining term → bounded too
+		if months is not None: months = min(months, MAX_TERM_MONTHS)
+
+		flows = portfolio_cashflows(balance, rate, remaining, months=months)
+		res = {
+			'loans': len(ids),
+			'outstanding_balance': round(float(balance.sum()), 2),
+			'scheduled_monthly_payment': round(float(flows['loan_payment'].sum()), 2),
+			'projected_interest': round(float(flows['interest'].sum()), 2),
+			'horizon_months': int(flows['balance'].size),
+			'cashflows': [
+				{'month': i + 1, 'payment': round(float(flows['payment'][i]), 2), 'interest': round(float(flows['interest'][i]), 2), 'principal': round(float(flows['principal'][i]), 2), 'balance': round(float(flows['balance'][i]), 2)}
+				for i in range(flows['balance'].size)
+			],
+		}
+		if detail:
+			res['loan_details'] = [
+				{'loan_id': ids[i], 'balance': float(balance[i]), 'remaining_months': int(remaining[i]), 'monthly_payment': round(float(flows['loan_payment'][i]), 2), 'projected_interest': round(float(flows['loan_interest'][i]), 2)}
+				for i in range(len(ids))
+			]
+		return res
+
@@ -0,0 +1,114 @@
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from sqlalchemy import create_engine, select, case, func, or_, exists, union_all, literal
+from src.models import db, Account, Transaction, ReconciliationState
+from src.utils.tx_legs import CREDIT_TYPES, DEBIT_TYPES, is_mirror
+
+EPOCH = datetime(1970, 1, 1)
+IN_CHUNK = 500 # ids per IN (...) list
+
+
+class ReconciliationManager:
+	"""Checks every Account.balance against the net of its transaction legs.
+
+	Accounts are split into account_id ranges (uuid hex prefixes) that worker processes check in parallel, each with
+	one aggregate query per id chunk. Results land in reconciliation_state, so an incremental run only rechecks
+	accounts whose balance moved, that got new transactions or that were off last time.
+	"""
+
+	def __init__(self, workers=None, partitions=None, tolerance=0.005):
+		self.workers = max(int(workers or os.environ.get('RECONCILE_WORKERS', 0) or os.cpu_count() or 1), 1)
+		self.partitions = partitions or self.workers * 2 # more ranges than workers → a slow range doesn't idle the rest
+		self.tolerance = tolerance
+
+	def run(self, full=False):
+		started = time.perf_counter()
+		url = db.engine.url.render_as_string(hide_password=False)
+		if url.startswith('sqlite') and ':memory:' in url: self.workers = 1 # nothing to share across processes
+		ranges = partition_ranges(self.partitions)
+		db.session.commit() # workers use their own connections -- don't hold ours open meanwhile
+
+		if self.workers == 1: results = [check_partition(url, lo, hi, full, self.tolerance) for lo, hi in ranges]
+		else:
+			with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+				results = list(pool.map(check_partition, *zip(*[(url, lo, hi, full, self.tolerance) for lo, hi in ranges])))
+
+		discrepancies = sorted((dd for rr in results for dd in rr['discrepancies']), key=lambda dd: dd['account_id'])
+		return {
+			'mode': 'full' if full else 'incremental',
+			'run_at': datetime.utcnow().isoformat(),
+			'workers': self.workers,
+			'partitions': len(ranges),
+			'accounts_checked': sum(rr['checked'] for rr in results),
+			'discrepancy_count': len(discrepancies),
+			'discrepancies': discrepancies,
+			'duration_ms': round((time.perf_counter() - started) * 1000, 1),
+		}
+
+	def get_state(self, ok=None):
+		q = ReconciliationState.query
+		if ok is not None: q = q.filter_by(ok=ok)
+		return q.order_by(ReconciliationState.account_id).all()
+
+
+def partition_ranges(n): # [lo, hi) bounds over 4-hex-digit uuid prefixes | None = open end
+	bounds = [None] + [f"{int(i * 0x10000 / n):04x}" for i in range(1, n)] + [None]
+	return list(zip(bounds[:-1], bounds[1:]))
+
+
+def check_partition(url, lo, hi, full=False, tolerance=0.005):
+	""" worker -- reconcile accounts with lo <= account_id < hi on its own engine; returns {checked, discrepancies} """
+	engine = create_engine(url, connect_args={'timeout': 30} if url.startswith('sqlite') else {})
+	try:
+		a, s, t = Account.__table__, ReconciliationState.__table__, Transaction.__table__
+		q = select(a.c.account_id, a.c.balance).select_from(a.outerjoin(s, s.c.account_id == a.c.account_id))
+		if lo is not None: q = q.where(a.c.account_id >= lo)
+		if hi is not None: q = q.where(a.c.account_id < hi)
+		if not full:
+			touched = exists().where(or_(t.c.account_id == a.c.account_id, t.c.destination_account_id == a.c.account_id), t.c.created_at > func.coalesce(s.c.last_tx_at, EPOCH))
+			q = q.where(or_(s.c.account_id.is_(None), s.c.ok == False, s.c.balance != a.c.balance, touched))
+
+		with engine.connect() as conn:
+			balances = {acc_id: float(bal) for acc_id, bal in conn.execute(q)}
+			ids = sorted(balances)
+			sums = {}
+			for i in range(0, len(ids), IN_CHUNK):
+				for acc_id, net, count, last_at in conn.execute(_expected_query(t, ids[i:i + IN_CHUNK], engine.dialect.name)): sums[acc_id] = (float(net or 0), count, last_at)
+
+		now, states, discrepancies = datetime.utcnow(), [], []
+		for acc_id in ids:
+			net, count, last_at = sums.get(acc_id, (0.0, 0, None))
+			expected, balance = round(net, 2), balances[acc_id]
+			ok = abs(balance - expected) <= tolerance
+			states.append({'account_id': acc_id, 'balance': balance, 'expected': expected, 'tx_count': count, 'last_tx_at': last_at, 'ok': ok, 'checked_at': now})
+			if not ok: discrepancies.append({'account_id': acc_id, 'balance': balance, 'expected': expected, 'difference': round(balance - expected, 2), 'tx_count': count, 'last_tx_at': _iso(last_at)})
+
+		with engine.begin() as conn: # writes last and short -- sqlite workers queue on this
+			for i in range(0, len(ids), IN_CHUNK): conn.execute(s.delete().where(s.c.account_id.in_(ids[i:i + IN_CHUNK])))
+			if states: conn.execute(s.insert(), states)
+		return {'checked': len(ids), 'discrepancies': discrepancies}
+	finally:
+		engine.dispose()
+
+
+def _expected_query(t, ids, dialect): # net of signed legs per account, for `ids`
+	tt = t.alias('t')
+	movement = (tt.c.transaction_type == 'transfer') & tt.c.destination_account_id.isnot(None) & ~is_mirror(tt, dialect)
+	own = select(tt.c.account_id.label('acc'), case(
+		(tt.c.transaction_type.in_(CREDIT_TYPES), tt.c.amount),
+		(tt.c.transaction_type.in_(DEBIT_TYPES), -tt.c.amount),
+		(movement, -tt.c.amount),
+		else_=literal(0),
+	).label('amt'), tt.c.created_at.label('at')).where(tt.c.account_id.in_(ids))
+	# mirrors stay in with 0 → tx_count / last_tx_at cover every row touching the account (incremental check)
+	incoming = select(tt.c.destination_account_id.label('acc'), case((movement, tt.c.amount), else_=literal(0)).label('amt'), tt.c.created_at.label('at')).where(tt.c.destination_account_id.in_(ids), tt.c.transaction_type == 'transfer')
+	legs = union_all(own, incoming).subquery()
+	return select(legs.c.acc, func.sum(legs.c.amt), func.count(), func.max(legs.c.at)).group_by(legs.c.acc)
+
+
+def _iso(value):
+	if value is None or isinstance(value, str): return value
+	return value.isoformat()
@@ -0,0 +1,116 @@
+import os
+import uuid
+from datetime import datetime, date, time, timedelta
+from sqlalchemy import bindparam, insert, update
+from src.models import db, Account, Transaction, JobRun, LedgerEntry
+from src.utils.tx_legs import account_legs
+from src.utils.tx_hash_store import record_transaction_hashes
+from src.utils.metrics import record_money
+from src.utils.etags import bump_versions
+
+
+def period_bounds(period): # 'YYYY-MM' → (first day, first day of next month)
+	try:
+		year, month = (int(x) for x in period.split('-'))
+		start = date(year, month, 1)
+	except (ValueError, AttributeError, TypeError): raise ValueError("period must be YYYY-MM")
+	return start, date(year + month // 12, month % 12 + 1, 1)
+
+
+class SavingsInterestManager:
+	"""Monthly interest for Savings accounts on their average daily balance.
+
+	Daily closing balances are rebuilt backwards from the current balance and the legs posted since the
+	period started. Accounts are walked in account_id chunks; each chunk credits balances with one
+	executemany UPDATE, bulk inserts its 'interest' transactions and ledger entries and moves the job
+	cursor in a single commit → every period is posted once, and an interrupted run resumes from its cursor.
+	"""
+
+	JOB_NAME = 'savings_interest'
+	ACCOUNT_TYPE = 'Savings'
+
+	def __init__(self, annual_rate=None, chunk_size=None, day_count=365):
+		self.annual_rate = float(annual_rate if annual_rate is not None else os.environ.get('SAVINGS_INTEREST_RATE', 2.0)) # % per year
+		self.chunk_size = chunk_size or int(os.environ.get('SAVINGS_INTEREST_CHUNK_SIZE', 2000))
+		self.day_count = day_count
+
+	def run(self, period=None, today=None):
+		today = today or datetime.utcnow().date()
+		if period is None: period = (today.replace(day=1) - timedelta(days=1)).strftime('%Y-%m') # last full month
+		start, end = period_bounds(period)
+		if end > today: raise ValueError(f"period {period} has not ended yet")
+
+		job = db.session.get(JobRun, (self.JOB_NAME, period))
+		if job and job.status == 'completed':
+			return {'status': 'already_completed', 'period': period, 'processed': job.processed}
+		if not job:
+			job = JobRun(job_name=self.JOB_NAME, period_key=period, status='running', processed=0)
+			db.session.add(job)
+			db.session.commit()
+
+		stats = {'credited': 0, 'interest': 0.0}
+		while True:
+			q = db.session.query(Account.account_id, Account.user_id, Account.account_number, Account.balance, Account.created_at)
+			q = q.filter(Account.account_type == self.ACCOUNT_TYPE, Account.active == True, Account.created_at < datetime.combine(end, time.min))
+			if job.cursor: q = q.filter(Account.account_id > job.cursor)
+			rows = q.order_by(Account.account_id).limit(self.chunk_size).with_for_update().all() # no deposits land mid-calculation
+			if not rows: break
+			posted = stats['interest']
+			hashes = self._process_chunk(rows, start, end, period, stats)
+			job.cursor = rows[-1].account_id
+			job.processed += len(rows)
+			db.session.commit()
+			record_money('interest', stats['interest'] - posted, count=len(hashes))
+			record_transaction_hashes(hashes)
+
+		job.status = 'completed'
+		job.finished_at = datetime.utcnow()
+		db.session.commit()
+		db.session.expire_all() # balances were updated behind the identity map
+		return {'status': 'completed', 'period': period, 'rate': self.annual_rate, 'processed': job.processed, 'credited': stats['credited'], 'interest': round(stats['interest'], 2)}
+
+	def daily_balances(self, rows, start, end):
+		""" closing balance of every day in [start, end) -- (n_accounts, n_days) """
+		import numpy as np
+
+		n_days = (end - start).days
+		idx = {r.account_id: i for i, r in enumerate(rows)}
+		daily = np.zeros((len(rows), n_days + 1)) # net legs per day | last column → everything after the period
+		for _, acc_id, amount, created_at in account_legs(idx, since=datetime.combine(start, time.min)):
+			daily[idx[acc_id], min((created_at.date() - start).days, n_days)] += amount
+
+		posted_after = np.cumsum(daily[:, ::-1], axis=1)[:, ::-1] # [:, d] = net of day d onwards
+		current = np.array([float(r.balance) for r in rows])
+		closing = current[:, None] - posted_after[:, 1:]
+		opened = np.array([max((r.created_at.date() - start).days, 0) for r in rows])
+		closing[np.arange(n_days)[None, :] < opened[:, None]] = 0 # days before the account existed
+		return np.maximum(closing, 0)
+
+	def _process_chunk(self, rows, start, end, period, stats):
+		import numpy as np
+
+		closing = self.daily_balances(rows, start, end)
+		interest = np.round(closing.sum(axis=1) * self.annual_rate / 100 / self.day_count, 2) # = ADB x rate x days / day_count
+
+		now = datetime.utcnow()
+		credits, txs, entries, hashes = [], [], [], []
+		for i, r in enumerate(rows):
+			if interest[i] <= 0: continue
+			amount = float(interest[i])
+			tx_id = str(uuid.uuid4())
+			credits.append({'b_account_id': r.account_id, 'b_interest': amount})
+			txs.append({'transaction_id': tx_id, 'account_id': r.account_id, 'transaction_type': 'interest', 'amount': amount, 'description': f"Savings interest {period}", 'destination_account_id': None, 'created_at': now})
+			entries.append({'account_id': r.account_id, 'transaction_id': tx_id, 'entry_type': 'interest', 'amount': amount, 'balance_after': round(float(r.balance) + amount, 2), 'created_at': now}) # rows are locked → r.balance is current
+			hashes.append({'transaction_id': tx_id, 'created_at': now, 'from_user_id': r.user_id, 'from_account_id': r.account_id, 'from_account_number': r.account_number})
+		if credits:
+			acc = Account.__table__
+			db.session.execute(update(acc).where(acc.c.account_id == bindparam('b_account_id')).values(balance=acc.c.balance + bindparam('b_interest', type_=acc.c.balance.type)), credits)
+			db.session.execute(insert(Transaction), txs)
+			db.session.execute(insert(LedgerEntry), entries)
+			bump_versions(hh['from_user_id'] for hh in hashes) # Core UPDATE → no flush hook, bump the owners here
+		stats['credited'] += len(credits)
+		stats['interest'] += float(interest[interest > 0].sum())
+		return hashes
+
+	def get_runs(self, limit=30):
+		return JobRun.query.filter_by(job_name=self.JOB_NAME).order_by(JobRun.period_key.desc()).limit(limit).all()
@@ -0,0 +1,139 @@
+import os
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, time, timedelta
+from itertools import groupby
+from flask import current_app
+from sqlalchemy import create_engine, select
+from src.models import db, Account, Transaction, LedgerEntry, JobRun
+from src.managers.SavingsInterestManager import period_bounds
+
+COLUMNS = ['entry_id', 'created_at', 'entry_type', 'amount', 'balance_after', 'transaction_id', 'description']
+
+
+class StatementManager:
+	"""Monthly account statements, written once per period as compact JSON files the API serves as-is.
+
+	Accounts are cut into account_id chunks that worker processes turn into files -- each worker streams its
+	chunk's ledger entries for the month in (account, time) order and writes one account at a time, so memory
+	stays bounded by a single row. Chunks are committed to the job cursor in order → an interrupted run resumes.
+	"""
+
+	JOB_NAME = 'account_statements'
+
+	def __init__(self, workers=None, chunk_size=None):
+		self.workers = max(int(workers or os.environ.get('STATEMENT_WORKERS', 0) or os.cpu_count() or 1), 1)
+		self.chunk_size = chunk_size or int(os.environ.get('STATEMENT_CHUNK_SIZE', 500))
+
+	def statement_dir(self, period=None):
+		root = os.path.join(current_app.config['DATA_FOLDER'], 'statements')
+		return os.path.join(root, period) if period else root
+
+	def generate(self, period=None, today=None, regenerate=False):
+		today = today or datetime.utcnow().date()
+		if period is None: period = (today.replace(day=1) - timedelta(days=1)).strftime('%Y-%m') # last full month
+		start, end = period_bounds(period)
+		if end > today: raise ValueError(f"period {period} has not ended yet")
+
+		job = db.session.get(JobRun, (self.JOB_NAME, period))
+		if job and job.status == 'completed' and not regenerate:
+			return {'status': 'already_completed', 'period': period, 'processed': job.processed}
+		if not job:
+			job = JobRun(job_name=self.JOB_NAME, period_key=period, status='running', processed=0)
+			db.session.add(job)
+		if regenerate: job.cursor, job.processed = None, 0
+		job.status, job.started_at, job.finished_at = 'running', datetime.utcnow(), None
+		db.session.commit()
+
+		out_dir = self.statement_dir(period)
+		os.makedirs(out_dir, exist_ok=True)
+		url = db.engine.url.render_as_string(hide_password=False)
+		if url.startswith('sqlite') and ':memory:' in url: self.workers = 1 # nothing to share across processes
+		bounds = (datetime.combine(start, time.min), datetime.combine(end, time.min))
+
+		pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')) if self.workers > 1 else None
+		pending = deque() # (last account_id, result) in chunk order | at most 2 x workers in flight
+		try:
+			for ids in self._chunks(bounds[1], job.cursor):
+				args = (url, out_dir, period, ids, *bounds)
+				pending.append((ids[-1], pool.submit(write_statements, *args) if pool else write_statements(*args)))
+				while len(pending) > (self.workers * 2 if pool else 0): self._advance(job, pending.popleft())
+			while pending: self._advance(job, pending.popleft())
+		finally:
+			if pool: pool.shutdown(cancel_futures=True)
+
+		job.status, job.finished_at = 'completed', datetime.utcnow()
+		db.session.commit()
+		return {'status': 'completed', 'period': period, 'workers': self.workers, 'processed': job.processed}
+
+	def _chunks(self, end, cursor): # account_id chunks of accounts opened before the period ended
+		last_id = cursor
+		while True:
+			q = db.session.query(Account.account_id).filter(Account.created_at < end)
+			if last_id: q = q.filter(Account.account_id > last_id)
+			ids = [r.account_id for r in q.order_by(Account.account_id).limit(self.chunk_size)]
+			if not ids: return
+			yield ids
+			last_id = ids[-1]
+
+	def _advance(self, job, item):
+		last_id, res = item
+		job.processed += res.result() if isinstance(res, Future) else res
+		job.cursor = last_id
+		db.session.commit()
+
+	def get_periods(self, account_id): # newest first
+		root = self.statement_dir()
+		if not os.path.isdir(root): return []
+		return sorted((pp for pp in os.listdir(root) if os.path.exists(os.path.join(root, pp, f"{account_id}.json"))), reverse=True)
+
+	def statement_path(self, account_id, period):
+		period_bounds(period) # validates → no path tricks through `period`
+		path = os.path.join(self.statement_dir(period), f"{account_id}.json")
+		return path if os.path.exists(path) else None
+
+	def get_runs(self, limit=30):
+		return JobRun.query.filter_by(job_name=self.JOB_NAME).order_by(JobRun.period_key.desc()).limit(limit).all()
+
+
+def write_statements(url, out_dir, period, ids, start, end):
+	""" worker -- one statement file per account in `ids` for [start, end) on its own engine; returns files written """
+	engine = create_engine(url, connect_args={'timeout': 30} if url.startswith('sqlite') else {})
+	try:
+		a, e, t = Account.__table__, LedgerEntry.__table__, Transaction.__table__
+		prior = e.alias()
+		opening = select(prior.c.balance_after).where(prior.c.account_id == a.c.account_id, prior.c.created_at < start) \
+			.order_by(prior.c.created_at.desc(), prior.c.entry_id.desc()).limit(1).scalar_subquery()
+		entries = select(e.c.account_id, *(e.c[cc] for cc in COLUMNS[:-1]), t.c.description).join(t, t.c.transaction_id == e.c.transaction_id) \
+			.where(e.c.account_id.in_(ids), e.c.created_at >= start, e.c.created_at < end).order_by(e.c.account_id, e.c.created_at, e.c.entry_id)
+
+		with engine.connect() as conn:
+			accounts = {r.account_id: r for r in conn.execute(select(a.c.account_id, a.c.account_number, a.c.account_type, opening.label('opening')).where(a.c.account_id.in_(ids)))}
+			rows = conn.execution_options(stream_results=True, yield_per=1000).execute(entries)
+			for acc_id, legs in groupby(rows, key=lambda r: r.account_id):
+				_write_statement(out_dir, period, start, end, accounts.pop(acc_id), legs)
+			for acc in accounts.values(): _write_statement(out_dir, period, start, end, acc, ()) # no activity → opening = closing
+		return len(ids)
+	finally:
+		engine.dispose()
+
+
+def _write_statement(out_dir, period, start, end, acc, legs):
+	opening = float(acc.opening or 0)
+	closing, totals = opening, {}
+	path = os.path.join(out_dir, f"{acc.account_id}.json")
+	with open(path + '.tmp', 'w') as f: # entries are streamed into the file -- totals / closing come after them
+		head = {'account_id': acc.account_id, 'account_number': acc.account_number, 'account_type': acc.account_type, 'period': period,
+		        'from': start.date().isoformat(), 'to': (end - timedelta(days=1)).date().isoformat(), 'opening_balance': round(opening, 2), 'columns': COLUMNS}
+		f.write(json.dumps(head, separators=(',', ':'))[:-1] + ',"entries":[')
+		for i, r in enumerate(legs):
+			amount, closing = float(r.amount), float(r.balance_after)
+			bucket = totals.setdefault(r.entry_type, {'count': 0, 'amount': 0.0})
+			bucket['count'] += 1
+			bucket['amount'] = round(bucket['amount'] + amount, 2)
+			f.write((',' if i else '') + json.dumps([r.entry_id, r.created_at.isoformat(), r.entry_type, amount, closing, r.transaction_id, r.description], separators=(',', ':')))
+		tail = {'closing_balance': round(closing, 2), 'totals': totals, 'generated_at': datetime.utcnow().isoformat()}
+		f.write('],' + json.dumps(tail, separators=(',', ':'))[1:])
+	os.replace(path + '.tmp', path) # readers never see half a file
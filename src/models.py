@@ -2,8 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import uuid
 import bcrypt
+from src.utils.db_routing import RoutingSession
+from src.utils.metrics import timed_bcrypt
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
 	__tablename__ = 'users'
@@ -29,13 +31,13 @@ class User(db.Model):
 	def _hash_password(self, password):
 		password_bytes = password.encode('utf-8')
 		salt = bcrypt.gensalt()
-		hashed = bcrypt.hashpw(password_bytes, salt)
+		with timed_bcrypt('hash'): hashed = bcrypt.hashpw(password_bytes, salt)
 		return hashed.decode('utf-8')
 
 	def verify_password(self, password):
 		password_bytes = password.encode('utf-8')
 		hashed_bytes = self.password.encode('utf-8')
-		return bcrypt.checkpw(password_bytes, hashed_bytes)
+		with timed_bcrypt('verify'): return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 	def to_dict(self):
 		return {
@@ -94,10 +96,14 @@ class Account(db.Model):
 
 class Transaction(db.Model):
 	__tablename__ = 'transactions'
+	__table_args__ = (
+		db.Index('ix_transactions_account_created', 'account_id', 'created_at'),
+		db.Index('ix_transactions_destination_created', 'destination_account_id', 'created_at'),
+	)
 
 	transaction_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
 	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), nullable=False)
-	transaction_type = db.Column(db.String(20), nullable=False)  # deposit, withdrawal, transfer
+	transaction_type = db.Column(db.String(20), nullable=False)  # deposit, withdrawal, transfer, interest
 	amount = db.Column(db.Numeric(15, 2), nullable=False)
 	description = db.Column(db.Text)
 	destination_account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), nullable=True)
@@ -131,6 +137,8 @@ class Loan(db.Model):
 	approved_at = db.Column(db.DateTime, nullable=True)
 	balance = db.Column(db.Numeric(15, 2), nullable=False)
 
+	accruals = db.relationship('LoanAccrual', backref='loan', lazy=True, cascade='all, delete-orphan')
+
 	def __init__(self, user_id, loan_type, amount, interest_rate, term_months, purpose=None, status='pending',
 	             balance=None):
 		self.user_id = user_id
@@ -200,4 +208,139 @@ class Loan(db.Model):
 			'created_at': self.created_at.isoformat(),
 			'approved_at': self.approved_at.isoformat() if self.approved_at else None,
 			'balance': float(self.balance)
-		}
\ No newline at end of file
+		}
+
+
+class LedgerEntry(db.Model): # double entry -- one signed row per account leg, with the account's balance after it
+	__tablename__ = 'ledger_entries'
+	__table_args__ = (db.Index('ix_ledger_account_created', 'account_id', 'created_at', 'entry_id'),)
+
+	entry_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), nullable=False)
+	transaction_id = db.Column(db.String(36), db.ForeignKey('transactions.transaction_id'), nullable=False)
+	entry_type = db.Column(db.String(20), nullable=False)  # deposit, withdrawal, interest, transfer_out, transfer_in
+	amount = db.Column(db.Numeric(15, 2), nullable=False)  # credit > 0, debit < 0
+	balance_after = db.Column(db.Numeric(15, 2), nullable=False)
+	created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+	transaction = db.relationship('Transaction')
+
+	@classmethod
+	def post(cls, account, amount, entry_type, transaction, created_at=None): # call after account.balance was changed by amount
+		return cls(account_id=account.account_id, transaction=transaction, entry_type=entry_type, amount=amount,
+		           balance_after=float(account.balance), created_at=created_at or datetime.utcnow())
+
+	def to_dict(self):
+		return {
+			'entry_id': self.entry_id,
+			'account_id': self.account_id,
+			'transaction_id': self.transaction_id,
+			'entry_type': self.entry_type,
+			'amount': float(self.amount),
+			'balance_after': float(self.balance_after),
+			'created_at': self.created_at.isoformat()
+		}
+
+
+class LoanAccrual(db.Model):
+	__tablename__ = 'loan_accruals'
+	__table_args__ = (db.UniqueConstraint('loan_id', 'period_end', name='uq_loan_accrual_period'),)
+
+	accrual_id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+	loan_id = db.Column(db.String(36), db.ForeignKey('loans.loan_id'), nullable=False)
+	period_start = db.Column(db.Date, nullable=False)  # exclusive -- previous accrual end / approval date
+	period_end = db.Column(db.Date, nullable=False)  # inclusive
+	days = db.Column(db.Integer, nullable=False)
+	interest = db.Column(db.Numeric(15, 2), nullable=False)
+	balance_after = db.Column(db.Numeric(15, 2), nullable=False)
+	created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+	def to_dict(self):
+		return {
+			'accrual_id': self.accrual_id,
+			'loan_id': self.loan_id,
+			'period_start': self.period_start.isoformat(),
+			'period_end': self.period_end.isoformat(),
+			'days': self.days,
+			'interest': float(self.interest),
+			'balance_after': float(self.balance_after),
+			'created_at': self.created_at.isoformat()
+		}
+
+
+class AccountBalanceSnapshot(db.Model): # end-of-day balance -- only days with activity get a row
+	__tablename__ = 'account_balance_snapshots'
+
+	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), primary_key=True)
+	snapshot_date = db.Column(db.Date, primary_key=True)
+	closing_balance = db.Column(db.Numeric(15, 2), nullable=False)
+	net_change = db.Column(db.Numeric(15, 2), nullable=False)
+	tx_count = db.Column(db.Integer, nullable=False)
+
+	def to_dict(self):
+		return {
+			'account_id': self.account_id,
+			'date': self.snapshot_date.isoformat(),
+			'closing_balance': float(self.closing_balance),
+			'net_change': float(self.net_change),
+			'tx_count': self.tx_count
+		}
+
+
+class ReconciliationState(db.Model): # last reconciliation result per account → reruns only recheck what moved
+	__tablename__ = 'reconciliation_state'
+
+	account_id = db.Column(db.String(36), db.ForeignKey('accounts.account_id'), primary_key=True)
+	balance = db.Column(db.Numeric(15, 2), nullable=False)  # Account.balance when checked
+	expected = db.Column(db.Numeric(15, 2), nullable=False)  # net of its transaction legs
+	tx_count = db.Column(db.Integer, nullable=False)
+	last_tx_at = db.Column(db.DateTime, nullable=True)
+	ok = db.Column(db.Boolean, nullable=False)
+	checked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+class LoanAccrualTotal(db.Model): # running totals per loan → an accrual run never re-sums the history | kept by LoanAccrualManager
+	__tablename__ = 'loan_accrual_totals'
+
+	loan_id = db.Column(db.String(36), db.ForeignKey('loans.loan_id'), primary_key=True)
+	last_period_end = db.Column(db.Date, nullable=False)
+	accrued_interest = db.Column(db.Numeric(15, 2), nullable=False, default=0)
+
+
+class JobRun(db.Model): # bookkeeping for batch jobs -- one row per (job, period) → idempotent + resumable
+	__tablename__ = 'job_runs'
+
+	job_name = db.Column(db.String(50), primary_key=True)
+	period_key = db.Column(db.String(40), primary_key=True)
+	status = db.Column(db.String(20), nullable=False, default='running')  # running, completed
+	cursor = db.Column(db.String(64), nullable=True)  # last key processed -- resume point
+	processed = db.Column(db.Integer, nullable=False, default=0)
+	started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+	finished_at = db.Column(db.DateTime, nullable=True)
+
+	def to_dict(self):
+		return {
+			'job_name': self.job_name,
+			'period_key': self.period_key,
+			'status': self.status,
+			'cursor': self.cursor,
+			'processed': self.processed,
+			'started_at': self.started_at.isoformat(),
+			'finished_at': self.finished_at.isoformat() if self.finished_at else None
+		}
+
+
+class StreamTicket(db.Model): # single-use ticket for the SSE stream → the access token never travels in a URL | consumed by src/api/routes/event_routes.py
+	__tablename__ = 'stream_tickets'
+
+	ticket_hash = db.Column(db.String(64), primary_key=True)  # sha256 of the ticket -- the ticket itself is never stored
+	user_id = db.Column(db.String(36), nullable=False)
+	expires_at = db.Column(db.DateTime, nullable=False)  # ticket must be used before this
+	session_expires_at = db.Column(db.DateTime, nullable=True)  # exp of the access token that minted it → stream ends there
+
+
+class ResourceVersion(db.Model): # change counter per scope (user:<user_id>) → ETags without loading the rows | bumped by src/utils/etags.py
+	__tablename__ = 'resource_versions'
+
+	scope = db.Column(db.String(64), primary_key=True)
+	version = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,79 @@
+"""Vectorized amortization engine -- every function takes arrays of loans and works on all of them at once.
+
+Rates are annual percentages (same as Loan.interest_rate), terms are in months.
+Schedules are (n_loans, n_months) matrices; months past a loan's term are zero.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def _as_arrays(principal, annual_rate, term_months):
+    p = np.atleast_1d(np.asarray(principal, dtype=np.float64))
+    r = np.atleast_1d(np.asarray(annual_rate, dtype=np.float64)) / 100 / 12
+    n = np.atleast_1d(np.asarray(term_months, dtype=np.int64))
+    if not (p.shape == r.shape == n.shape): raise ValueError("principal, rate and term arrays must have the same length")
+    if (n <= 0).any(): raise ValueError("term_months must be positive")
+    return p, r, n
+
+
+def _level_payment(p, r, n): # r = monthly rate
+    safe_r = np.where(r == 0, 1.0, r)
+    annuity = p * safe_r / (1 - (1 + safe_r) ** -n)
+    return np.where(r == 0, p / n, annuity)
+
+
+def monthly_payments(principal, annual_rate, term_months) -> np.ndarray:
+    """ level monthly payment per loan (unrounded) -- vector form of Loan.calculate_monthly_payment """
+    return _level_payment(*_as_arrays(principal, annual_rate, term_months))
+
+
+def amortize(principal, annual_rate, term_months, months: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Full schedules for every loan in one pass.
+
+    returns: {payment (n,), interest (n,m), principal (n,m), balance (n,m) -- remaining after each month}
+    `months` caps the horizon (default: longest term).
+    """
+    p, r, n = _as_arrays(principal, annual_rate, term_months)
+    horizon = int(months if months is not None else (n.max() if n.size else 0))
+    payment = _level_payment(p, r, n)
+    if not p.size or horizon <= 0:
+        empty = np.zeros((p.size, 0))
+        return {'payment': payment, 'interest': empty, 'principal': empty, 'balance': empty}
+
+    k = np.arange(1, horizon + 1, dtype=np.float64)[None, :]
+    P, R, N, M = p[:, None], r[:, None], n[:, None], payment[:, None]
+    safe_r = np.where(R == 0, 1.0, R)
+    growth = (1 + safe_r) ** k
+    balance = np.where(R == 0, P - M * k, P * growth - M * (growth - 1) / safe_r)
+    active = k <= N
+    balance = np.where(active & (balance > 1e-6), balance, 0.0)
+
+    opening = np.concatenate([P, balance[:, :-1]], axis=1)
+    opening = np.where(active, opening, 0.0)
+    interest = opening * R
+    principal_paid = opening - balance
+    return {'payment': payment, 'interest': interest, 'principal': principal_paid, 'balance': balance}
+
+
+def portfolio_cashflows(principal, annual_rate, term_months, months: Optional[int] = None, chunk_size: int = 2000) -> Dict[str, np.ndarray]:
+    """Aggregate month-by-month cash flows of a whole portfolio.
+
+    Loans are amortized in chunks of `chunk_size` so memory stays at chunk_size x months
+    no matter how big the book is. Per-loan payment / total interest are kept (n,).
+    """
+    p, rate, n = np.asarray(principal, dtype=np.float64), np.asarray(annual_rate, dtype=np.float64), np.asarray(term_months, dtype=np.int64)
+    horizon = int(months if months is not None else (n.max() if n.size else 0))
+    totals = {key: np.zeros(horizon) for key in ('interest', 'principal', 'balance')}
+    payment = np.zeros(p.size)
+    loan_interest = np.zeros(p.size)
+    for start in range(0, p.size, chunk_size):
+        sl = slice(start, start + chunk_size)
+        sched = amortize(p[sl], rate[sl], n[sl], months=horizon)
+        for key in totals: totals[key] += sched[key].sum(axis=0)
+        payment[sl] = sched['payment']
+        loan_interest[sl] = sched['interest'].sum(axis=1)
+    totals['payment'] = totals['interest'] + totals['principal']
+    totals['loan_payment'] = payment
+    totals['loan_interest'] = loan_interest
+    return totals
@@ -0,0 +1,59 @@
+"""Response compression -- gzip / brotli on the way out, precompressed variants for static files.
+
+Dynamic responses are compressed in after_request when the client accepts it, the mimetype is in
+COMPRESS_MIMETYPES and the body is at least COMPRESS_MIN_SIZE bytes. Streamed / file responses are
+left alone. Static files are compressed once at build time (scripts/precompress_static.py writes
+`<file>.br` / `<file>.gz` next to each asset) and served as-is by src/utils/static_assets.py.
+
+brotli is optional: without the package only gzip is offered.
+"""
+import gzip
+
+from flask import current_app, request
+from src.utils.metrics import COMPRESSION_BYTES
+
+try: import brotli
+except ImportError: brotli = None
+
+VARIANTS = {'br': '.br', 'gzip': '.gz'} # preference order
+
+
+def install_compression(app):
+    """ register first → runs after every other after_request hook, on the final body """
+    app.after_request(_compress)
+
+
+def available_encodings(): return [ee for ee in VARIANTS if ee != 'br' or brotli]
+
+
+def negotiate(offered):
+    accept = request.accept_encodings
+    for encoding in offered:
+        if accept[encoding] > 0: return encoding # werkzeug quality -- 0 when missing or q=0
+    return None
+
+
+def compress(data, encoding):
+    if encoding == 'br': return brotli.compress(data, quality=current_app.config['COMPRESS_BR_LEVEL'])
+    return gzip.compress(data, compresslevel=current_app.config['COMPRESS_LEVEL'], mtime=0) # mtime=0 → same bytes every time
+
+
+def _compress(response):
+    cfg = current_app.config
+    if (response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers
+            or response.status_code < 200 or response.status_code in (204, 206, 304) or response.mimetype not in cfg['COMPRESS_MIMETYPES']):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate(available_encodings())
+    if not encoding: return response
+    data = response.get_data()
+    if len(data) < cfg['COMPRESS_MIN_SIZE']: return response
+
+    body = compress(data, encoding)
+    response.set_data(body) # also updates Content-Length
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak: response.set_etag(etag, weak=True) # same entity, different bytes
+    COMPRESSION_BYTES.labels(encoding, 'in').inc(len(data))
+    COMPRESSION_BYTES.labels(encoding, 'out').inc(len(body))
+    return response
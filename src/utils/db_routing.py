@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from functools import wraps
+
+import sqlalchemy as sa
+from flask import current_app
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = 'replica'  # SQLALCHEMY_BINDS key, only present when DATABASE_READ_URL is set
+
+
+class RoutingSession(Session):
+    """db.session that can send plain SELECTs to the read replica bind.
+
+    Reads only go to the replica inside `replica_session()` / `@replica_reads` views.
+    Everything else (money movements, flushes, DML) stays on the primary, and once the
+    session has written anything it sticks to the primary (read-your-writes).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and clause is not None and not isinstance(clause, sa.sql.Select): self.info['wrote'] = True
+        if bind is None and self._route_to_replica(clause): return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _route_to_replica(self, clause):
+        if not self.info.get('use_replica') or self.info.get('wrote') or self._flushing: return False
+        return isinstance(clause, sa.sql.Select) and REPLICA_BIND in self._db.engines
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _mark_written(session, flush_context): session.info['wrote'] = True
+
+
+@contextmanager
+def replica_session():
+    """ route reads of the current db.session to the replica (no-op if none configured) """
+    session = current_app.extensions['sqlalchemy'].session
+    prev = session.info.get('use_replica')
+    session.info['use_replica'] = True
+    try: yield session
+    finally: session.info['use_replica'] = prev
+
+
+def replica_reads(fn): # decorator for read-only views -- listings, history, admin views
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with replica_session(): return fn(*args, **kwargs)
+    return wrapper
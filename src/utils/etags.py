@@ -0,0 +1,87 @@
+"""Version-based ETags -- one change counter per user in resource_versions.
+
+A flush that adds, changes or deletes a User, Account or Loan bumps `user:<owner>` in the same transaction
+(after_flush hook). Bulk jobs that write through Core instead of ORM objects call bump_versions themselves.
+A GET wrapped in @etagged(scope_fn) reads that single counter and answers 304 Not Modified when the
+client's If-None-Match still matches, before the view loads or serializes anything.
+"""
+import hashlib
+from functools import wraps
+from itertools import chain
+
+import sqlalchemy as sa
+from flask import Response, make_response, request
+from sqlalchemy.dialects import postgresql, sqlite
+from src.models import db, User, Account, Loan, ResourceVersion
+from src.utils.db_routing import RoutingSession
+from src.utils.jwt_auth import get_current_user
+
+TRACKED = (User, Account, Loan) # everything the account / loan / profile reads serialize -- all carry user_id
+IN_CHUNK = 400
+
+
+def user_scope(user_id): return f"user:{user_id}"
+
+
+def bump_versions(user_ids, session=None):
+    """ +1 on each user's counter, inside the current transaction | rows are created on first bump """
+    scopes = sorted({user_scope(uu) for uu in user_ids if uu}) # sorted → same lock order in every transaction
+    if not scopes: return
+    conn, t = (session or db.session).connection(), ResourceVersion.__table__
+    dialect = {'sqlite': sqlite, 'postgresql': postgresql}.get(conn.dialect.name)
+    for i in range(0, len(scopes), IN_CHUNK):
+        chunk = scopes[i:i + IN_CHUNK]
+        if dialect: # single race-free upsert
+            ins = dialect.insert(t).values([{'scope': ss, 'version': 1} for ss in chunk])
+            conn.execute(ins.on_conflict_do_update(index_elements=['scope'], set_={'version': t.c.version + 1}))
+            continue
+        conn.execute(t.update().where(t.c.scope.in_(chunk)).values(version=t.c.version + 1))
+        existing = set(conn.execute(sa.select(t.c.scope).where(t.c.scope.in_(chunk))).scalars())
+        missing = [{'scope': ss, 'version': 1} for ss in chunk if ss not in existing]
+        if missing: conn.execute(t.insert(), missing)
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _bump_touched(session, flush_context):
+    owners = {obj.user_id for obj in chain(session.new, session.deleted) if isinstance(obj, TRACKED)}
+    for obj in session.dirty:
+        if not isinstance(obj, TRACKED) or not session.is_modified(obj, include_collections=False): continue
+        owners.add(obj.user_id)
+        owners.update(sa.inspect(obj).attrs.user_id.history.deleted) # moved to another user → the old owner's lists changed too
+    bump_versions(owners, session)
+
+
+def current_version(scope):
+    return db.session.execute(sa.select(ResourceVersion.version).where(ResourceVersion.scope == scope)).scalar() or 0
+
+
+def etagged(scope_fn):
+    """ GET view decorator | scope_fn(**view_kwargs) → user_id whose counter covers the response, None → no ETag
+
+    The tag hashes the caller, the counter and the full path, so a 304 never stands in for somebody else's 200.
+    The counter is read before the view runs: a write in between tags newer data with the older version, so
+    the next revalidation is a 200 instead of a stale 304. Only the owner (or an admin) is ever answered from
+    the tag; anyone else, and `If-None-Match: *`, goes to the view and its own 403 / 404.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            owner, caller = scope_fn(**kwargs), get_current_user()
+            if owner is None or (owner != caller['user_id'] and caller['role'] != 'admin'): return fn(*args, **kwargs) # no 304 before the view's access check
+            scope = user_scope(owner)
+            tag = hashlib.sha1(f"{caller['user_id']}|{scope}|{current_version(scope)}|{request.full_path}".encode()).hexdigest()[:20]
+            if not request.if_none_match.star_tag and request.if_none_match.contains_weak(tag): # weak → also matches after compression weakened it
+                response = Response(status=304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200: return response
+            response.set_etag(tag)
+            response.cache_control.private, response.cache_control.no_cache = True, True # browser keeps it, revalidates every time
+            return response
+        return wrapper
+    return decorator
+
+
+def caller_scope(**_): # lists / profile of the caller | admin ?all=true spans every user → no ETag
+    user = get_current_user()
+    return None if user['role'] == 'admin' and request.args.get('all') == 'true' else user['user_id']
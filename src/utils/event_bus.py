@@ -0,0 +1,179 @@
+"""Live account events -- committed balance changes / new transactions pushed to each owner's SSE streams.
+
+A flush records the Transactions it inserts and the Account balances it changes (after_flush). The
+after_commit hook then publishes them to the owners, so nothing is announced for a rolled-back
+transaction. That covers every ORM money path: deposit, withdraw, transfer, multi_transfer and loan
+payments. Bulk Core jobs (interest) publish nothing, so clients refresh on their next load.
+
+Each subscriber gets a bounded queue (EVENT_BUFFER_SIZE). A client too slow to keep up has its
+backlog replaced by a single `resync` event instead of growing memory.
+
+EVENT_BROKER=local delivers inside this process only (flask run, one worker). EVENT_BROKER=sqlite
+(the gunicorn.conf.py default) appends events to a small sqlite file shared by the workers
+(DATA_FOLDER/events.db). Every worker tails it, so a stream sees commits made by any worker.
+"""
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from itertools import chain
+
+import sqlalchemy as sa
+from src.models import Account, Transaction
+from src.utils.db_routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    def __init__(self, user_id, size):
+        self.user_id = user_id
+        self.queue = queue.Queue(maxsize=size)
+
+    def offer(self, event):
+        try: self.queue.put_nowait(event)
+        except queue.Full: # slow reader → drop the backlog, tell the client to refetch
+            with self.queue.mutex: self.queue.queue.clear()
+            self.queue.put_nowait({'type': 'resync'})
+
+    def get(self, timeout): # next event or None on timeout
+        try: return self.queue.get(timeout=timeout)
+        except queue.Empty: return None
+
+
+class EventBus:
+    """ user_id → live subscribers of this process | publish → local fan-out, or the broker when there is one """
+
+    def __init__(self, buffer_size=100, broker=None):
+        self.buffer_size, self.broker = buffer_size, broker
+        self._subs, self._lock = {}, threading.Lock()
+
+    def subscribe(self, user_id):
+        sub = Subscriber(user_id, self.buffer_size)
+        with self._lock: self._subs.setdefault(user_id, set()).add(sub)
+        if self.broker: self.broker.start(self.deliver)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            subs = self._subs.get(sub.user_id, set())
+            subs.discard(sub)
+            if not subs: self._subs.pop(sub.user_id, None)
+
+    def subscriber_count(self):
+        with self._lock: return sum(len(ss) for ss in self._subs.values())
+
+    def publish(self, events): # [(user_id, event)]
+        if not events: return
+        if self.broker: self.broker.publish(events) # comes back through deliver() in every worker, this one included
+        else:
+            for user_id, event in events: self.deliver(user_id, event)
+
+    def deliver(self, user_id, event):
+        with self._lock: subs = list(self._subs.get(user_id, ()))
+        for sub in subs: sub.offer(event)
+
+
+class SQLiteBroker:
+    """ append-only event log in a sqlite file + one tailing thread per process | rows older than `retention` s are pruned """
+
+    def __init__(self, path, poll_interval=0.2, retention=60):
+        self.path, self.poll_interval, self.retention = path, poll_interval, retention
+        self._thread, self._lock = None, threading.Lock()
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL)')
+
+    def _connect(self): return sqlite3.connect(self.path, timeout=5)
+
+    def publish(self, events):
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn: conn.executemany('INSERT INTO events (user_id, payload, created_at) VALUES (?, ?, ?)', [(uu, json.dumps(ee), now) for uu, ee in events])
+        finally: conn.close()
+
+    def start(self, deliver): # idempotent -- the tail thread starts with the first local subscriber
+        with self._lock:
+            if self._thread: return
+            conn = self._connect()
+            try: last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0] # only what happens from now on
+            finally: conn.close()
+            self._thread = threading.Thread(target=self._tail, args=(deliver, last_id), name='event-broker', daemon=True)
+            self._thread.start()
+
+    def _tail(self, deliver, last_id):
+        conn = self._connect()
+        pruned_at = 0.0
+        while True:
+            rows = []
+            try:
+                rows = conn.execute('SELECT id, user_id, payload FROM events WHERE id > ? ORDER BY id LIMIT 1000', (last_id,)).fetchall()
+                for last_id, user_id, payload in rows: deliver(user_id, json.loads(payload))
+                if time.time() - pruned_at > self.retention:
+                    with conn: conn.execute('DELETE FROM events WHERE created_at < ?', (time.time() - self.retention,))
+                    pruned_at = time.time()
+            except sqlite3.Error as e: logger.warning(f"event broker poll failed: {e}")
+            if len(rows) < 1000: time.sleep(self.poll_interval) # full page → more waiting, read on
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_bus(app):
+    """ one bus per process, configured from the first app that asks """
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            broker = None
+            if app.config['EVENT_BROKER'] == 'sqlite':
+                broker = SQLiteBroker(app.config['EVENT_BROKER_PATH'] or os.path.join(app.config['DATA_FOLDER'], 'events.db'), app.config['EVENT_POLL_MS'] / 1000)
+            _bus = EventBus(app.config['EVENT_BUFFER_SIZE'], broker)
+        return _bus
+
+
+def install_event_bus(app): app.extensions['event_bus'] = get_bus(app)
+
+
+def _account_event(acc):
+    return {'type': 'balance', 'account_id': acc.account_id, 'balance': float(acc.balance), 'at': datetime.utcnow().isoformat()}
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _collect(session, flush_context):
+    owners = {obj.account_id: obj.user_id for obj in session.identity_map.values() if isinstance(obj, Account)}
+    pending = session.info.setdefault('account_events', [])
+    for obj in chain(session.new, session.dirty):
+        if isinstance(obj, Account) and (obj in session.new or sa.inspect(obj).attrs.balance.history.has_changes()):
+            pending.append((obj.user_id, _account_event(obj)))
+    txs = [obj for obj in session.new if isinstance(obj, Transaction)]
+    missing = {aa for tx in txs for aa in (tx.account_id, tx.destination_account_id) if aa and aa not in owners}
+    if missing: # owner of an account that isn't loaded -- one lookup on the flushing connection
+        acc = Account.__table__
+        owners.update(session.connection().execute(sa.select(acc.c.account_id, acc.c.user_id).where(acc.c.account_id.in_(missing))).all())
+    mirrored = {(tx.account_id, tx.destination_account_id) for tx in txs} # transfer() → a row per side, each announced to its own owner
+    for tx in txs:
+        event = {'type': 'transaction', 'transaction': tx.to_dict()}
+        if owners.get(tx.account_id): pending.append((owners[tx.account_id], event))
+        recipient = owners.get(tx.destination_account_id)
+        if recipient and recipient != owners.get(tx.account_id) and (tx.destination_account_id, tx.account_id) not in mirrored:
+            pending.append((recipient, event)) # multi_transfer → one sender-side row per destination
+
+
+@sa.event.listens_for(RoutingSession, 'after_commit')
+def _publish(session):
+    events = session.info.pop('account_events', None)
+    if events and _bus:
+        latest = {ee['account_id']: i for i, (_, ee) in enumerate(events) if ee['type'] == 'balance'} # several flushes → last balance only
+        events = [item for i, item in enumerate(events) if item[1]['type'] != 'balance' or latest[item[1]['account_id']] == i]
+        try: _bus.publish(events)
+        except Exception as e: logger.warning(f"account events not published: {e}") # the money already moved -- never fail the request
+
+
+@sa.event.listens_for(RoutingSession, 'after_rollback')
+def _discard(session): session.info.pop('account_events', None)
@@ -0,0 +1,96 @@
+"""Prometheus metrics -- routes, DB pools, hash store, bcrypt and money movements.
+
+Under gunicorn every worker is its own process, so PROMETHEUS_MULTIPROC_DIR must point at a directory
+shared by the workers (gunicorn.conf.py sets and wipes one): each process writes its samples there and
+/metrics merges all of them, whichever worker answers the scrape. Without it, /metrics reports the
+current process only -- fine for `flask run` and tests.
+
+/metrics is never public: with METRICS_TOKEN set it takes `Authorization: Bearer <METRICS_TOKEN>` (for the
+scraper), without it only an admin JWT.
+"""
+import hmac
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+from sqlalchemy import event
+from src.utils.jwt_auth import admin_required
+
+REQUEST_LATENCY = Histogram('http_request_duration_seconds', 'Request latency', ['blueprint', 'endpoint', 'method'],
+                            buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10))
+REQUESTS = Counter('http_requests_total', 'Responses by status', ['blueprint', 'endpoint', 'method', 'status'])
+DB_POOL_CHECKED_OUT = Gauge('db_pool_checked_out', 'Connections checked out of the pool', ['bind'], multiprocess_mode='livesum')
+DB_POOL_OVERFLOW = Gauge('db_pool_overflow', 'Connections open beyond pool_size', ['bind'], multiprocess_mode='livesum')
+HASH_STORE_WRITE = Histogram('tx_hash_store_write_seconds', 'Transaction hash store write latency', ['mode'])
+BCRYPT_SECONDS = Histogram('bcrypt_seconds', 'bcrypt hash / verify latency', ['op'], buckets=(.05, .1, .2, .3, .5, .75, 1, 2))
+BCRYPT_IN_FLIGHT = Gauge('bcrypt_in_flight', 'bcrypt calls running right now (CPU queue depth)', multiprocess_mode='livesum')
+MONEY_MOVEMENTS = Counter('money_movements_total', 'Completed money movements', ['kind'])
+MONEY_AMOUNT = Counter('money_amount_total', 'Sum of moved amounts', ['kind'])
+COMPRESSION_BYTES = Counter('http_compression_bytes_total', 'Response bytes into / out of compression', ['encoding', 'stage'])
+
+
+def install_metrics(app, db):
+    """ request hooks + pool listeners for every engine of `db` (call inside an app context) """
+    for bind, engine in db.engines.items():
+        _watch_pool(bind or 'default', engine)
+    app.before_request(_start_timer)
+    app.after_request(_observe_request)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+
+def metrics_view():
+    if not _may_scrape(): return Response('unauthorized\n', status=401, mimetype='text/plain')
+    return Response(render_latest(), mimetype=CONTENT_TYPE_LATEST)
+
+
+def _may_scrape():
+    token = os.environ.get('METRICS_TOKEN')
+    if token: return hmac.compare_digest(request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode())
+    try: return admin_required(lambda: True)() is True # no scrape token configured → admins only
+    except Exception: return False
+
+
+def render_latest():
+    if not os.environ.get('PROMETHEUS_MULTIPROC_DIR'): return generate_latest(REGISTRY)
+    registry = CollectorRegistry() # fresh per scrape → merged from every worker's files
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def _start_timer(): g.metrics_started = time.perf_counter()
+
+
+def _observe_request(response):
+    if 'metrics_started' not in g or request.endpoint == 'metrics': return response
+    labels = (request.blueprint or '', request.endpoint or 'unmatched', request.method) # endpoint, not path → bounded label set
+    REQUEST_LATENCY.labels(*labels).observe(time.perf_counter() - g.metrics_started)
+    REQUESTS.labels(*labels, str(response.status_code)).inc()
+    return response
+
+
+def _watch_pool(bind, engine):
+    pool = engine.pool
+    if not hasattr(pool, 'checkedout'): return # NullPool / SingletonThreadPool -- nothing to report
+
+    def sample(*args):
+        DB_POOL_CHECKED_OUT.labels(bind).set(pool.checkedout())
+        DB_POOL_OVERFLOW.labels(bind).set(max(pool.overflow(), 0))
+    event.listen(engine, 'checkout', sample)
+    event.listen(engine, 'checkin', sample)
+
+
+@contextmanager
+def timed_bcrypt(op):
+    BCRYPT_IN_FLIGHT.inc()
+    started = time.perf_counter()
+    try: yield
+    finally:
+        BCRYPT_SECONDS.labels(op).observe(time.perf_counter() - started)
+        BCRYPT_IN_FLIGHT.dec()
+
+
+def record_money(kind, amount, count=1): # after the commit -- counts what actually moved
+    MONEY_MOVEMENTS.labels(kind).inc(count)
+    MONEY_AMOUNT.labels(kind).inc(float(amount))
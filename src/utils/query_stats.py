@@ -0,0 +1,91 @@
+"""Per-request SQL counters on SQLAlchemy engine events.
+
+Every statement run while a request is active adds to `g.query_count` / `g.query_ms`; the response gets
+`X-Query-Count` and `Server-Timing` (db + app) headers. Statements slower than SLOW_QUERY_MS are logged
+with the route that issued them. `count_queries()` / `assert_max_queries(n)` record the same events for
+tests, request or not, so an N+1 regression fails the suite instead of shipping.
+"""
+import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+_instrumented = weakref.WeakSet()
+_recorders = threading.local() # per thread → concurrent requests don't count each other's statements
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.statements = [] # (statement, ms)
+
+    @property
+    def count(self): return len(self.statements)
+
+    @property
+    def total_ms(self): return round(sum(ms for _, ms in self.statements), 3)
+
+
+def install_query_stats(app, db):
+    """ hook every engine of `db` and the request lifecycle of `app` (call inside an app context) """
+    for engine in db.engines.values():
+        if engine in _instrumented: continue
+        event.listen(engine, 'before_cursor_execute', _before_execute)
+        event.listen(engine, 'after_cursor_execute', _after_execute)
+        _instrumented.add(engine)
+    app.before_request(_start_request)
+    app.after_request(_add_headers)
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None: context._query_started = time.perf_counter() # per statement → a failed one leaves nothing behind on the connection
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    if started is None: return
+    ms = (time.perf_counter() - started) * 1000
+    for rec in getattr(_recorders, 'active', ()): rec.statements.append((statement, ms))
+    if not has_request_context(): return
+    g.query_count = g.get('query_count', 0) + 1
+    g.query_ms = g.get('query_ms', 0.0) + ms
+    slow_ms = current_app.config.get('SLOW_QUERY_MS') # 0 / unset → no slow log
+    if slow_ms and ms >= slow_ms:
+        logger.warning(f"slow query {ms:.1f}ms on {request.method} {request.endpoint or request.path}: {' '.join(statement.split())[:500]}")
+
+
+def _start_request():
+    g.query_count, g.query_ms, g.request_started = 0, 0.0, time.perf_counter()
+
+
+def _add_headers(response):
+    if 'request_started' not in g: return response
+    total_ms = (time.perf_counter() - g.request_started) * 1000
+    db_ms = g.get('query_ms', 0.0)
+    response.headers['X-Query-Count'] = str(g.get('query_count', 0))
+    response.headers['Server-Timing'] = f'db;dur={db_ms:.1f};desc="{g.get("query_count", 0)} queries", app;dur={total_ms:.1f}'
+    return response
+
+
+@contextmanager
+def count_queries():
+    """ with count_queries() as rec: ... → rec.count / rec.statements of this thread """
+    rec = QueryRecorder()
+    active = getattr(_recorders, 'active', None)
+    if active is None: active = _recorders.active = []
+    active.append(rec)
+    try: yield rec
+    finally: active.remove(rec)
+
+
+@contextmanager
+def assert_max_queries(n):
+    with count_queries() as rec: yield rec
+    if rec.count > n:
+        listing = '\n'.join(f"  {i + 1}. {' '.join(ss.split())[:200]}" for i, (ss, _) in enumerate(rec.statements))
+        raise AssertionError(f"expected at most {n} queries, got {rec.count}:\n{listing}")
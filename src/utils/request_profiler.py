@@ -0,0 +1,143 @@
+"""Sampling profiler around single requests -- collapsed stacks for flamegraph.pl / speedscope.
+
+While a profiled request runs, a sampler thread reads that request's stack every PROFILE_INTERVAL_MS
+through sys._current_frames(). The request itself runs untouched (no trace hooks), so the overhead is
+one extra thread waking up per interval.
+
+On demand: an admin sends `X-Profile: 1` (or `?profile=1`). The stacks are written to
+DATA_FOLDER/profiles/<stamp>-<endpoint>.folded and named in the X-Profile-File header.
+`X-Profile: inline` returns them as the response body instead. Anyone else's flag is ignored.
+
+Continuous: with PROFILE_SAMPLE_RATE=N, every Nth request to PROFILE_ENDPOINTS is profiled the same way
+and appended to profiles/continuous-<pid>.folded. At PROFILE_BUFFER_BYTES the file rotates, and
+PROFILE_BUFFER_FILES older copies are kept. Folded files concatenate: `cat continuous-*.folded* | flamegraph.pl`.
+"""
+import itertools
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+from flask import Response, current_app, g, request
+from src.utils.jwt_auth import admin_required
+
+PROFILES_DIR = 'profiles'
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')) + os.sep
+
+_counter = itertools.count(1) # continuous mode, per process
+_buffer_lock = threading.Lock()
+
+
+class StackSampler:
+    """ samples one thread's stack on a background thread | stacks -- Counter of collapsed stacks, root first """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id, self.interval = thread_id, interval
+        self.stacks, self.samples = Counter(), 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None: return # thread is gone
+            self.stacks[collapse(frame)] += 1
+            self.samples += 1
+
+    def folded(self): return ''.join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+def collapse(frame):
+    labels = []
+    while frame is not None:
+        labels.append(f"{_short(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+@lru_cache(maxsize=4096)
+def _short(filename): # project files relative to the repo, libraries relative to site-packages
+    if filename.startswith(ROOT): return filename[len(ROOT):].replace(os.sep, '/')
+    _, sep, rest = filename.rpartition('site-packages' + os.sep)
+    return rest.replace(os.sep, '/') if sep else os.path.basename(filename)
+
+
+def install_request_profiler(app):
+    app.before_request(_start)
+    app.after_request(_finish)
+
+
+def _start():
+    flag = request.headers.get('X-Profile') or request.args.get('profile')
+    if flag and _is_admin(): mode = 'inline' if flag == 'inline' else 'file'
+    elif _continuous_hit(): mode = 'continuous'
+    else: return
+    g.profile_mode = mode
+    g.profiler = StackSampler(threading.get_ident(), current_app.config['PROFILE_INTERVAL_MS'] / 1000).start()
+
+
+def _is_admin():
+    try: return admin_required(lambda: True)() is True # same check as the admin routes
+    except Exception: return False # no / bad token → not an admin, the request itself goes on as usual
+
+
+def _continuous_hit():
+    rate = current_app.config['PROFILE_SAMPLE_RATE']
+    if not rate or request.endpoint not in current_app.config['PROFILE_ENDPOINTS']: return False
+    return next(_counter) % rate == 0
+
+
+def _finish(response):
+    sampler = g.pop('profiler', None)
+    if sampler is None: return response
+    folded, mode = sampler.stop().folded(), g.pop('profile_mode')
+    if mode == 'inline':
+        return Response(folded, mimetype='text/plain', headers={'X-Profile-Samples': str(sampler.samples), 'X-Profile-Status': str(response.status_code)})
+    if mode == 'file':
+        name = f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')}-{request.endpoint or 'unmatched'}.folded"
+        with open(os.path.join(profiles_dir(), name), 'w') as f: f.write(folded)
+        response.headers['X-Profile-File'] = name
+        response.headers['X-Profile-Samples'] = str(sampler.samples)
+    elif folded: _append_buffer(folded)
+    return response
+
+
+def profiles_dir():
+    path = os.path.join(current_app.config['DATA_FOLDER'], PROFILES_DIR)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _append_buffer(text): # rotating like logging's RotatingFileHandler: .folded → .folded.1 → ... → dropped
+    path = os.path.join(profiles_dir(), f"continuous-{os.getpid()}.folded")
+    max_bytes, files = current_app.config['PROFILE_BUFFER_BYTES'], current_app.config['PROFILE_BUFFER_FILES']
+    with _buffer_lock:
+        if os.path.exists(path) and os.path.getsize(path) + len(text) > max_bytes:
+            for i in range(files - 1, 0, -1):
+                if os.path.exists(f"{path}.{i}"): os.replace(f"{path}.{i}", f"{path}.{i + 1}")
+            if files: os.replace(path, f"{path}.1")
+            else: os.remove(path)
+        with open(path, 'a') as f: f.write(text)
+
+
+def list_profiles(): # newest first
+    root = profiles_dir()
+    items = [{'name': nn, 'bytes': os.path.getsize(os.path.join(root, nn)), 'modified_at': datetime.utcfromtimestamp(os.path.getmtime(os.path.join(root, nn))).isoformat()}
+             for nn in os.listdir(root) if '.folded' in nn]
+    return sorted(items, key=lambda ii: ii['modified_at'], reverse=True)
+
+
+def profile_path(name): # only names that are listed → no path tricks
+    root = profiles_dir()
+    return os.path.join(root, name) if name in os.listdir(root) and '.folded' in name else None
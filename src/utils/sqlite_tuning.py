@@ -0,0 +1,68 @@
+import logging
+import threading
+import weakref
+
+from sqlalchemy import event
+from src.utils.db_routing import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+# one writer per process -- WAL lets readers run alongside it, threads queue here instead of on "database is locked"
+_write_lock = threading.Lock()
+_tuned_engines = weakref.WeakSet()
+_lock_timeout = {'seconds': 5.0}
+
+
+def configure_sqlite(app, db):
+    """Apply SQLITE_PRODUCTION_MODE to every sqlite engine of the app (call inside an app context).
+
+    Each new connection gets WAL journaling, synchronous=NORMAL, busy_timeout and mmap_size;
+    sessions bound to a tuned engine take the per-process write lock from their first
+    SELECT ... FOR UPDATE / flush / DML statement until the transaction ends.
+    """
+    if not app.config.get('SQLITE_PRODUCTION_MODE'): return False
+    busy_ms = int(app.config.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    mmap_size = int(app.config.get('SQLITE_MMAP_SIZE', 268435456))
+    _lock_timeout['seconds'] = busy_ms / 1000
+
+    tuned = False
+    for engine in db.engines.values():
+        if engine.dialect.name != 'sqlite' or engine in _tuned_engines: continue
+        event.listen(engine, 'connect', _pragma_listener(busy_ms, mmap_size))
+        _tuned_engines.add(engine)
+        tuned = True
+    if tuned: logger.info(f" === SQLITE PROD MODE -- WAL | busy_timeout {busy_ms}ms | mmap {mmap_size} === ")
+    return tuned
+
+
+def _pragma_listener(busy_ms, mmap_size):
+    def set_pragmas(dbapi_conn, conn_record):
+        cur = dbapi_conn.cursor()
+        cur.execute('PRAGMA journal_mode=WAL')
+        cur.execute('PRAGMA synchronous=NORMAL')
+        cur.execute(f'PRAGMA busy_timeout={busy_ms}')
+        cur.execute(f'PRAGMA mmap_size={mmap_size}')
+        cur.close()
+    return set_pragmas
+
+
+def _acquire_write_lock(session):
+    if session.info.get('sqlite_write_lock') or session.get_bind() not in _tuned_engines: return
+    if _write_lock.acquire(timeout=_lock_timeout['seconds']): session.info['sqlite_write_lock'] = True
+    else: logger.warning("sqlite write lock wait timed out -- falling back to busy_timeout")
+
+
+@event.listens_for(RoutingSession, 'before_flush')
+def _lock_before_flush(session, flush_context, instances): _acquire_write_lock(session)
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _lock_before_dml(orm_execute_state): # DML, or SELECT ... FOR UPDATE (read-modify-write of balances)
+    for_update = orm_execute_state.is_select and getattr(orm_execute_state.statement, '_for_update_arg', None) is not None
+    if for_update or orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _acquire_write_lock(orm_execute_state.session)
+
+
+@event.listens_for(RoutingSession, 'after_transaction_end')
+def _release_write_lock(session, transaction):
+    if transaction.parent is None and session.info.pop('sqlite_write_lock', None): _write_lock.release()
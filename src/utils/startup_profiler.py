@@ -0,0 +1,119 @@
+import sys
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Optional
+
+
+class _TimedLoader:
+    """Wraps a module loader so exec_module is timed. The module itself only ever sees the original loader."""
+
+    def __init__(self, loader, timer, name):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def create_module(self, spec):
+        create = getattr(self._loader, 'create_module', None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        # restore real loader before module code runs (pkgutil / importlib.resources look at it)
+        module.__loader__ = self._loader
+        if getattr(module, '__spec__', None) is not None: module.__spec__.loader = self._loader
+        self._timer.enter(self._name)
+        try: self._loader.exec_module(module)
+        finally: self._timer.exit(self._name)
+
+    def __getattr__(self, item): return getattr(self._loader, item)
+
+
+class _ImportTimer:
+    """meta_path finder recording self/cumulative exec time per module (same numbers as `python -X importtime`)."""
+
+    def __init__(self):
+        self.modules: Dict[str, Dict[str, float]] = {}
+        self._stack = []  # [name, started_at, child_time]
+
+    def find_spec(self, fullname, path, target=None):
+        spec = None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'): continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None: break
+        if spec is None or spec.loader is None or not hasattr(spec.loader, 'exec_module'): return spec
+        spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def enter(self, name): self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self, name):
+        _, started, child = self._stack.pop()
+        cumulative = time.perf_counter() - started
+        if self._stack: self._stack[-1][2] += cumulative
+        self.modules[name] = {'self_ms': round((cumulative - child) * 1000, 3), 'cumulative_ms': round(cumulative * 1000, 3)}
+
+
+class StartupProfiler:
+    """Cold start profiler -- per-module import time + per-phase init time of create_app.
+
+    Disabled instances are no-ops so create_app can always call `profiler.phase(...)`.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.phases: Dict[str, float] = {}
+        self._timer: Optional[_ImportTimer] = None
+        self._started_at: Optional[float] = None
+        self._total: Optional[float] = None
+
+    def start(self):
+        if not self.enabled or self._timer is not None: return self
+        self._timer = _ImportTimer()
+        sys.meta_path.insert(0, self._timer)
+        self._started_at = time.perf_counter()
+        return self
+
+    def stop(self):
+        if self._timer is None: return self
+        if self._timer in sys.meta_path: sys.meta_path.remove(self._timer)
+        self._total = time.perf_counter() - self._started_at
+        return self
+
+    def phase(self, name: str):
+        if not self.enabled: return nullcontext()
+        return self._phase(name)
+
+    @contextmanager
+    def _phase(self, name):
+        started = time.perf_counter()
+        try: yield
+        finally: self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - started)
+
+    def report(self) -> Dict:
+        """ returns: dict keyed by module / phase name so two reports diff cleanly """
+        total = self._total
+        if total is None and self._started_at is not None: total = time.perf_counter() - self._started_at
+        return {
+            'total_ms': round((total or 0.0) * 1000, 3),
+            'phases': {name: round(secs * 1000, 3) for name, secs in self.phases.items()},
+            'imports': dict(self._timer.modules) if self._timer else {},
+        }
+
+    def write_report(self, path: str) -> Dict:
+        data = self.report()
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        return data
+
+    def format_report(self, top: int = 25) -> str:
+        data = self.report()
+        lines = [f"startup total: {data['total_ms']:.1f} ms", '', 'phases (ms):']
+        for name, ms in sorted(data['phases'].items(), key=lambda kv: kv[1], reverse=True):
+            lines.append(f"  {ms:10.1f}  {name}")
+        lines += ['', f'imports -- top {top} by cumulative (ms):', f"  {'cumul':>10}  {'self':>10}  module"]
+        ranked = sorted(data['imports'].items(), key=lambda kv: kv[1]['cumulative_ms'], reverse=True)
+        for name, t in ranked[:top]:
+            lines.append(f"  {t['cumulative_ms']:10.1f}  {t['self_ms']:10.1f}  {name}")
+        return '\n'.join(lines)
@@ -0,0 +1,72 @@
+"""Static SPA serving through a manifest built once at startup.
+
+Every servable URL is precomputed into a dict: the files under static/ plus, after
+scripts/build_static.py, the content-hashed copies in static/build/ (listed in build/manifest.json)
+and the rewritten build/index.html. The dict also records which fresh .br / .gz variants each
+file has (scripts/precompress_static.py). A request is one dict lookup: the file, its best
+accepted encoding, and its caching. Hashed files never change → `public, max-age=1y, immutable`.
+Everything else, index.html included, is revalidated. Unknown paths get the SPA's index.html.
+"""
+import json
+import mimetypes
+import os
+
+from flask import current_app, send_file
+from src.utils.compression import VARIANTS, available_encodings, negotiate
+
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.json'
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+class AssetManifest:
+    """ url path → (file relative to static/, immutable, encodings with a fresh precompressed variant) """
+
+    def __init__(self, static_folder):
+        self.folder = static_folder
+        self.files = {}
+        self.load()
+
+    def load(self):
+        files = {}
+        if self.folder and os.path.isdir(self.folder):
+            for root, dirs, names in os.walk(self.folder):
+                if root == self.folder and BUILD_DIR in dirs: dirs.remove(BUILD_DIR) # only reachable through the manifest
+                for name in names:
+                    if name.endswith(tuple(VARIANTS.values())): continue
+                    rel = os.path.relpath(os.path.join(root, name), self.folder).replace(os.sep, '/')
+                    files[rel] = self._entry(rel, False)
+            manifest = os.path.join(self.folder, BUILD_DIR, MANIFEST)
+            if os.path.exists(manifest):
+                with open(manifest) as f: built = json.load(f)
+                for hashed in built['assets'].values(): files[hashed] = self._entry(f"{BUILD_DIR}/{hashed}", True)
+                files['index.html'] = self._entry(f"{BUILD_DIR}/{built['index']}", False)
+        self.files = files # swapped whole → readers never see half a reload
+        return self
+
+    def _entry(self, rel, immutable):
+        path = os.path.join(self.folder, rel)
+        fresh = tuple(ee for ee in VARIANTS if os.path.isfile(path + VARIANTS[ee]) and os.path.getmtime(path + VARIANTS[ee]) >= os.path.getmtime(path))
+        return rel, immutable, fresh
+
+    def resolve(self, path): return self.files.get(path) or self.files.get('index.html')
+
+
+def install_static_assets(app):
+    app.extensions['static_assets'] = AssetManifest(app.static_folder)
+    app.view_functions['static'] = serve_asset
+
+
+def serve_asset(filename='index.html'):
+    entry = current_app.extensions['static_assets'].resolve(filename)
+    if entry is None: return current_app.response_class('not found', status=404, mimetype='text/plain') # no static folder / index.html at all
+    rel, immutable, fresh = entry
+    offered = [ee for ee in available_encodings() if ee in fresh]
+    encoding = negotiate(offered) if offered else None
+    path = os.path.join(current_app.static_folder, rel)
+    mimetype = mimetypes.guess_type(rel)[0] or 'application/octet-stream'
+    response = send_file(path + VARIANTS[encoding] if encoding else path, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE if immutable else None)
+    if encoding: response.headers['Content-Encoding'] = encoding
+    if fresh: response.vary.add('Accept-Encoding') # caches must key on encoding whenever variants exist
+    if immutable: response.cache_control.public, response.cache_control.immutable = True, True
+    return response
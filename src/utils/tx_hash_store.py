@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Dict, Optional
 
 from .json_utils import load_json, save_json
+from .metrics import HASH_STORE_WRITE
 
 HASHES_FILE = 'transaction_hashes.json'
 
@@ -15,6 +16,20 @@ def hash_transaction_id(transaction_id: str) -> str:
     return hashlib.sha256(transaction_id.encode('utf-8')).hexdigest()
 
 
+def _make_entry(transaction_id: str, created_at=None, **meta) -> Dict:
+    # Convert datetime to ISO string if needed
+    if created_at is None:
+        created_ts = datetime.utcnow().isoformat()
+    elif isinstance(created_at, datetime):
+        created_ts = created_at.isoformat()
+    else:
+        created_ts = created_at
+    entry = {'transaction_id': transaction_id, 'hash': hash_transaction_id(transaction_id), 'created_at': created_ts}
+    for key in ('from_user_id', 'to_user_id', 'from_account_id', 'to_account_id', 'from_account_number', 'to_account_number'):
+        entry[key] = meta.get(key)
+    return entry
+
+
 def record_transaction_hash(
     transaction_id: str,
     created_at = None,
@@ -30,29 +45,29 @@ def record_transaction_hash(
 
     Schema item: { transaction_id, hash, created_at, from_user_id?, to_user_id?, from_account_id?, to_account_id?, from_account_number?, to_account_number? }
     """
-    # Convert datetime to ISO string if needed
-    if created_at is None:
-        created_ts = datetime.utcnow().isoformat()
-    elif isinstance(created_at, datetime):
-        created_ts = created_at.isoformat()
-    else:
-        created_ts = created_at
-    
-    entry = {
-        'transaction_id': transaction_id,
-        'hash': hash_transaction_id(transaction_id),
-        'created_at': created_ts,
-        'from_user_id': from_user_id,
-        'to_user_id': to_user_id,
-        'from_account_id': from_account_id,
-        'to_account_id': to_account_id,
-        'from_account_number': from_account_number,
-        'to_account_number': to_account_number,
-    }
+    entry = _make_entry(
+        transaction_id, created_at,
+        from_user_id=from_user_id, to_user_id=to_user_id,
+        from_account_id=from_account_id, to_account_id=to_account_id,
+        from_account_number=from_account_number, to_account_number=to_account_number,
+    )
 
-    data = _ensure_list(load_json(HASHES_FILE))
-    data.append(entry)
-    return save_json(HASHES_FILE, data)
+    with HASH_STORE_WRITE.labels('single').time(): # whole read-modify-write of the JSON store
+        data = _ensure_list(load_json(HASHES_FILE))
+        data.append(entry)
+        return save_json(HASHES_FILE, data)
+
+
+def record_transaction_hashes(entries: List[Dict]) -> bool:
+    """Bulk form of record_transaction_hash -- one read + one write of the JSON store for all entries.
+
+    entries: [{ transaction_id, created_at?, from_user_id?, ... }] (same keys as the keyword args above)
+    """
+    if not entries: return True
+    with HASH_STORE_WRITE.labels('bulk').time():
+        data = _ensure_list(load_json(HASHES_FILE))
+        data.extend(_make_entry(**ee) for ee in entries)
+        return save_json(HASHES_FILE, data)
 
 
 def list_transaction_hashes(limit: Optional[int] = None) -> List[Dict]:
@@ -0,0 +1,124 @@
+"""Signed per-account legs from `transactions` rows.
+
+deposit / interest credit `account_id`, withdrawal debits it. Transfers are stored two ways:
+AccountManager.transfer writes an out row (account=from, destination=to) *and* an in row
+(account=to, destination=from) in one flush, multi_transfer writes only the out row.
+Mirrors (the in rows) are skipped, every other transfer row debits account_id and credits
+destination_account_id.
+
+Which is which comes from the ledger: a transfer row whose ledger legs debit its own account moved
+the money, one whose legs don't is a mirror. Only rows with no ledger legs at all (posted before the
+ledger, not backfilled) fall back to pairing: the in-row is the swapped twin of the previous unmatched
+same-amount movement between the two accounts within MIRROR_WINDOW. is_mirror() is the SQL form; its
+pairing fallback checks the window on sqlite / postgresql and drops it on other dialects.
+"""
+from datetime import timedelta
+from typing import Iterable, Iterator, Tuple
+
+from sqlalchemy import and_, exists, extract, func, or_, select
+
+CREDIT_TYPES = ('deposit', 'interest')
+DEBIT_TYPES = ('withdrawal',)
+MIRROR_WINDOW = timedelta(seconds=1)
+
+# (transaction_id, account_id, signed amount, created_at)
+Leg = Tuple[str, str, float, object]
+
+
+def _order(row): # in-row of a transfer() is flushed after its out-row | 'transfer in' breaks equal timestamps
+    return (row.created_at, row.description == 'transfer in', row.transaction_id)
+
+
+def signed_legs(rows: Iterable) -> Iterator[Leg]:
+    """rows need transaction_id, account_id, transaction_type, amount, destination_account_id, created_at, description,
+    optionally linked / moves (has ledger legs / they debit account_id) -- see account_legs.
+
+    Pass every transfer row touching the accounts of interest (account_id OR destination in the set),
+    otherwise an in-row whose out-row was filtered away is counted as a movement of its own.
+    """
+    pending = {} # (from, to, amount) → created_at of the last movement not yet matched by an in-row
+    for row in sorted(rows, key=_order):
+        amount = float(row.amount)
+        if row.transaction_type in CREDIT_TYPES:
+            yield (row.transaction_id, row.account_id, amount, row.created_at)
+        elif row.transaction_type in DEBIT_TYPES:
+            yield (row.transaction_id, row.account_id, -amount, row.created_at)
+        elif row.transaction_type == 'transfer' and row.destination_account_id:
+            swapped = (row.destination_account_id, row.account_id, amount)
+            sent_at = pending.get(swapped)
+            linked = getattr(row, 'linked', None) # ledger says → no guessing
+            if (not row.moves) if linked else (sent_at is not None and row.created_at - sent_at <= MIRROR_WINDOW):
+                pending.pop(swapped, None)
+                continue
+            pending[(row.account_id, row.destination_account_id, amount)] = row.created_at
+            yield (row.transaction_id, row.account_id, -amount, row.created_at)
+            yield (row.transaction_id, row.destination_account_id, amount, row.created_at)
+
+
+def account_legs(account_ids, since=None, until=None):
+    """ legs of `account_ids` with since <= created_at < until (a window of extra rows is read on each side so
+    transfer pairs straddling a bound still match up) """
+    from src.models import db, Transaction
+    ids, t = set(account_ids), Transaction.__table__
+    q = select(t.c.transaction_id, t.c.account_id, t.c.transaction_type, t.c.amount, t.c.destination_account_id, t.c.created_at, t.c.description,
+               has_legs(t).label('linked'), debits_own_account(t).label('moves'))
+    q = q.where(t.c.account_id.in_(ids) | t.c.destination_account_id.in_(ids))
+    if since is not None: q = q.where(t.c.created_at >= since - MIRROR_WINDOW) # legacy pairs straddling a bound
+    if until is not None: q = q.where(t.c.created_at < until + MIRROR_WINDOW)
+    return [leg for leg in signed_legs(db.session.execute(q)) if leg[1] in ids and (since is None or leg[3] >= since) and (until is None or leg[3] < until)]
+
+
+def has_legs(t): # SQL: transaction row `t` has ledger legs
+    from src.models import LedgerEntry
+    le = LedgerEntry.__table__
+    return exists().where(le.c.transaction_id == t.c.transaction_id)
+
+
+def debits_own_account(t): # SQL: t's ledger legs debit its account_id → the row moved the money
+    from src.models import LedgerEntry
+    le = LedgerEntry.__table__
+    return exists().where(le.c.transaction_id == t.c.transaction_id, le.c.account_id == t.c.account_id, le.c.amount < 0)
+
+
+def _seconds_between(dialect, later, earlier): # None → no portable interval arithmetic, the window is left out
+    if dialect == 'sqlite': return (func.julianday(later) - func.julianday(earlier)) * 86400
+    if dialect == 'postgresql': return extract('epoch', later - earlier)
+    return None
+
+
+def _sorts_before(x, y): # SQL form of _order(x) < _order(y)
+    in_row = lambda row: func.coalesce(row.c.description, '') == 'transfer in'
+    return or_(
+        x.c.created_at < y.c.created_at,
+        and_(x.c.created_at == y.c.created_at, or_(
+            and_(in_row(y), ~in_row(x)),
+            and_(in_row(x) == in_row(y), x.c.transaction_id < y.c.transaction_id),
+        )),
+    )
+
+
+def is_mirror(t, dialect=None):
+    """ SQL: transfer row `t` (alias of the transactions table) is the in-row of a transfer() pair --
+    its ledger legs don't debit its account, or (no legs) its swapped twin is the row right before it
+    among same-amount transfers between the two accounts """
+    return or_(and_(has_legs(t), ~debits_own_account(t)), and_(~has_legs(t), _paired(t, dialect)))
+
+
+def _paired(t, dialect):
+    base = t.element if hasattr(t, 'element') else t
+    t2, t3 = base.alias(), base.alias()
+    same_pair = lambda row: and_(row.c.transaction_type == 'transfer', row.c.amount == t.c.amount, or_(
+        and_(row.c.account_id == t.c.account_id, row.c.destination_account_id == t.c.destination_account_id),
+        and_(row.c.account_id == t.c.destination_account_id, row.c.destination_account_id == t.c.account_id),
+    ))
+    in_between = exists().where(same_pair(t3), _sorts_before(t2, t3), _sorts_before(t3, t)).correlate_except(t3) # t is two levels up
+    gap = _seconds_between(dialect, t.c.created_at, t2.c.created_at)
+    return exists().where(
+        t2.c.transaction_type == 'transfer',
+        t2.c.account_id == t.c.destination_account_id,
+        t2.c.destination_account_id == t.c.account_id,
+        t2.c.amount == t.c.amount,
+        _sorts_before(t2, t),
+        *([gap <= MIRROR_WINDOW.total_seconds()] if gap is not None else []),
+        ~in_between,
+    ).correlate_except(t2)
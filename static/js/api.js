@@ -51,6 +51,24 @@ class BankAPI {
     async getAccountTransactions(accountId){ return this.request('GET', `/accounts/${accountId}/transactions`);}
     async getUserTransactions(){ return this.request('GET', '/accounts/user/transactions');}
 
+    async getDashboardSummary(){ return this.request('GET', '/dashboard/summary');}
+
+    // several GETs in one round trip | concurrent → the server runs them in parallel | resolves to the bodies, in order
+    async batchGet(endpoints){
+        const res = await this.request('POST', '/batch', { concurrent: true, requests: endpoints.map(path => ({ method: 'GET', path: `${this.baseUrl}${path}` }))});
+        return res.responses.map(sub => {
+            if(sub.status >= 400){ throw new Error((sub.body && sub.body.error) || 'api request failed');}
+            return sub.body;
+        });
+    }
+
+    // SSE -- balance / transaction events as they commit | EventSource can't send headers → a single-use stream ticket in the query, never the token
+    async openEventStream(){
+        if(!this.token || !window.EventSource) return null;
+        const { ticket } = await this.request('POST', '/events/ticket');
+        return new EventSource(`${this.baseUrl}/events/stream?ticket=${encodeURIComponent(ticket)}`);
+    }
+
     async getLoans(){ return this.request('GET', '/loans');}
     async getLoan(loanId){ return this.request('GET', `/loans/${loanId}`);}
 
@@ -64,6 +82,8 @@ class BankAPI {
     async approveLoan(loanId){ return this.request('POST', `/loans/${loanId}/approve`);}
     async rejectLoan(loanId){ return this.request('POST', `/loans/${loanId}/reject`);}
     async activateLoan(loanId){ return this.request('POST', `/loans/${loanId}/activate`);}
+    // decisions -- [{loan_id, action: 'approve'|'reject'|'activate'}] | one request, one commit
+    async bulkLoanDecisions(decisions){ return this.request('POST', '/loans/bulk-decisions', { decisions });}
 }
 
 const api = new BankAPI();
\ No newline at end of file
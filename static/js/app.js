@@ -76,6 +76,33 @@ document.addEventListener('DOMContentLoaded', () => {
         document.getElementById('nav-authenticated').style.display = 'block';
         document.getElementById('user-fullname').textContent = state.user.full_name;
         navigateTo('dashboard');
+        startLiveUpdates();
+    }
+
+    // live updates -- pushed balance / transaction events reload the visible page (debounced) instead of polling
+    // a ticket opens one connection → reconnects (stream ended, network blip) fetch a new one | 3 failures in a row (503 / logged out) → plain loads only
+    let liveStream = null, liveTimer = null, liveRetry = null, liveFailures = 0;
+    async function startLiveUpdates(){
+        stopLiveUpdates();
+        let stream = null;
+        try{ stream = await api.openEventStream();} catch(error){ stream = null;}
+        if(!stream || !api.isAuthenticated()){ if(stream) stream.close(); return;}
+        liveStream = stream;
+        const refresh = () =>{ clearTimeout(liveTimer); liveTimer = setTimeout(() => loadPageData(state.currentPage), 300);};
+        ['balance', 'transaction', 'resync'].forEach(type => stream.addEventListener(type, refresh));
+        stream.addEventListener('ready', () =>{ liveFailures = 0;});
+        stream.onerror = () =>{
+            if(stream !== liveStream) return;
+            stream.close(); // the browser would retry with the spent ticket
+            liveStream = null;
+            if(++liveFailures < 3) liveRetry = setTimeout(startLiveUpdates, 3000 * liveFailures);
+        };
+    }
+
+    function stopLiveUpdates(){
+        clearTimeout(liveTimer);
+        clearTimeout(liveRetry);
+        if(liveStream){ liveStream.close(); liveStream = null;}
     }
 
     function showAuthPage(page){
@@ -122,16 +149,11 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function loadDashboard(){
         try{
-            const accountsData = await api.getAccounts();
+            // totals are computed server side -- no full history / loan list download | both in one batch
+            const [accountsData, summary] = await api.batchGet(['/accounts', '/dashboard/summary']);
             state.accounts = accountsData.accounts || [];
-
-            const transactionsData = await api.getUserTransactions();
-            state.transactions = transactionsData.transactions || [];
-
-            const loansData = await api.getLoans();
-            state.loans = loansData.loans || [];
             dashboardComponent.init(state.user);
-            dashboardComponent.updateDashboard(state.accounts, state.transactions, state.loans);
+            dashboardComponent.updateDashboard(state.accounts, summary);
         } catch(error){ console.error('Error loading dashboard:', error);}
     }
 
@@ -167,13 +189,10 @@ document.addEventListener('DOMContentLoaded', () => {
 
     async function loadLoans(){
         try{
-            const loansData = await api.getLoans();
+            // NEW FEATURE - upd loans as well as accounts data (balance) | one batch
+            const [loansData, accountsData] = await api.batchGet(['/loans', '/accounts']);
             state.loans = loansData.loans || [];
-            if(state.accounts.length === 0){
-                const accountsData = await api.getAccounts();
-                state.accounts = accountsData.accounts || [];
-            }
-            // NEW FEATURE - upd loans as well as accounts data (balance)
+            state.accounts = accountsData.accounts || [];
             loansComponent.setLoans(state.loans);
             loansComponent.setAccounts(state.accounts);
         } catch(error){ console.error('Error loading loans:', error);}
@@ -223,6 +242,8 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function logout(){
+        stopLiveUpdates();
+        liveFailures = 0;
         api.logout();
         state.user = null;
         state.accounts = [];
@@ -222,7 +222,7 @@ class AccountsComponent {
         let mntPref = '';
 
         switch (transaction.transaction_type) {
-            case 'deposit': mntClass = 'deposit'; mntPref = '+'; break;
+            case 'deposit': case 'interest': mntClass = 'deposit'; mntPref = '+'; break;
             case 'withdrawal': mntClass = 'withdrawal'; mntPref = '-'; break;
             case 'transfer':
                 if(transaction.destination_account_id){ mntClass = 'withdrawal'; mntPref = '-';} // outgoing transfer
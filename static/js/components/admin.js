@@ -60,8 +60,15 @@ class AdminComponent {
                     <!-- loan approvals tab -->
                     <div id="loan-approvals-tab" class="tab-pane">
                         <h3>Loan Approvals</h3>
+                        <div class="bulk-actions">
+                            <button id="approve-all-btn" class="btn btn-success"><i class="fas fa-check-double"></i> Approve All</button>
+                            <button id="reject-all-btn" class="btn btn-danger"><i class="fas fa-times"></i> Reject All</button>
+                        </div>
                         <div id="pending-loans"></div>
                         <h3>Approved Loans (Pending Activation)</h3>
+                        <div class="bulk-actions">
+                            <button id="activate-all-btn" class="btn btn-success"><i class="fas fa-play"></i> Activate All</button>
+                        </div>
                         <div id="approved-loans"></div>
                     </div>
                     
@@ -85,7 +92,19 @@ class AdminComponent {
                                 <h4>Total Loans</h4>
                                 <p id="stats-loans">0</p>
                             </div>
+                            <div class="stats-card">
+                                <h4>Total Balance</h4>
+                                <p id="stats-balance">$0.00</p>
+                            </div>
+                            <div class="stats-card">
+                                <h4>Outstanding Loans</h4>
+                                <p id="stats-outstanding">$0.00</p>
+                            </div>
                         </div>
+                        <h3>Loans by Status</h3>
+                        <div id="stats-loan-status"></div>
+                        <h3>Daily Volume</h3>
+                        <div id="stats-volume"></div>
                     </div>
                     
                     <!-- transaction hashes tab -->
@@ -135,6 +154,10 @@ class AdminComponent {
             });
         });
 
+        document.getElementById('approve-all-btn').addEventListener('click', () => { this.bulkDecide(this.pendingLoans, 'approve');});
+        document.getElementById('reject-all-btn').addEventListener('click', () => { this.bulkDecide(this.pendingLoans, 'reject');});
+        document.getElementById('activate-all-btn').addEventListener('click', () => { this.bulkDecide(this.approvedLoans, 'activate');});
+
         await this.loadAdminData();
         const refreshBtn = document.getElementById('refresh-hashes');
         if (refreshBtn) {
@@ -150,6 +173,12 @@ class AdminComponent {
         const style = document.createElement('style');
         style.id = 'admin-styles';
         style.textContent = `
+            .bulk-actions {
+                display: flex;
+                gap: 10px;
+                margin-bottom: 10px;
+            }
+
             .admin-tabs {
                 margin-top: 2rem;
             }
@@ -270,8 +299,7 @@ class AdminComponent {
         try{
             await this.loadUsers();
             await this.loadPendingLoans();
-            await this.loadSystemStats();
-            await this.loadHashes();
+            await this.loadSystemStats(); // hashes load when their tab is opened
         } catch(error){ console.error('Error loading admin data:', error);}
     }
 
@@ -416,7 +444,7 @@ class AdminComponent {
 
     async loadPendingLoans() {
         try {
-            const getLoans = await fetch('/api/v1/loans?all=true', { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
+            const getLoans = await fetch('/api/v1/loans?all=true&status=pending,approved', { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
             if(!getLoans.ok){ throw new Error('Failed to load loans');}
 
             const data = await getLoans.json();
@@ -632,29 +660,45 @@ class AdminComponent {
         } catch(error){ console.error('Error activating loan:', error); alert(error.message || 'Failed to activate loan');}
     }
 
-    async loadSystemStats() {
+    // one request for the whole list -- server applies every transition and commits once
+    async bulkDecide(loans, action) {
+        if(loans.length === 0){ alert('Nothing to do'); return;}
+        if(!confirm(`${action} ${loans.length} loan(s)?`)) return;
         try {
-            document.getElementById('stats-users').textContent = this.users.length;
-            const accsRsp = await fetch('/api/v1/accounts?all=true', {
-                headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
-
-            let accCnt = 0;
-            if(accsRsp.ok){ const accountsData = await accsRsp.json(); accCnt = (accountsData.accounts || []).length;}
-
-            document.getElementById('stats-accounts').textContent = accCnt;
-
-            const transacRsp = await fetch('/api/v1/accounts/user/transactions', { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
-
-            let transacCnt = 0;
-            if (transacRsp.ok){ const transactionsData = await transacRsp.json(); transacCnt = (transactionsData.transactions || []).length;}
-
-            document.getElementById('stats-transactions').textContent = transacCnt;
-
-            const loanRsp = await fetch('/api/v1/loans?all=true', { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
+            const data = await api.bulkLoanDecisions(loans.map(loan => ({ loan_id: loan.loan_id, action })));
+            await this.loadPendingLoans();
+            alert(`${data.succeeded} loan(s) updated` + (data.failed ? `, ${data.failed} failed` : ''));
+        } catch(error){ console.error(`Error on bulk ${action}:`, error); alert(error.message || `Failed to ${action} loans`);}
+    }
 
-            let loanCnt = 0;
-            if(loanRsp.ok){ const loansData = await loanRsp.json(); loanCnt = (loansData.loans || []).length;}
-            document.getElementById('stats-loans').textContent = loanCnt;
+    async loadSystemStats() {
+        try {
+            // aggregates only -- no full table downloads
+            const rsp = await fetch('/api/v1/admin/overview', { headers: { 'Authorization': `Bearer ${localStorage.getItem('token')}`}});
+            if(!rsp.ok){ throw new Error('Failed to load overview');}
+            const overview = await rsp.json();
+            const totals = overview.totals || {};
+
+            document.getElementById('stats-users').textContent = totals.users || 0;
+            document.getElementById('stats-accounts').textContent = totals.accounts || 0;
+            document.getElementById('stats-transactions').textContent = totals.transactions || 0;
+            document.getElementById('stats-loans').textContent = totals.loans || 0;
+            document.getElementById('stats-balance').textContent = this.formatCurrency(totals.total_balance || 0);
+            document.getElementById('stats-outstanding').textContent = this.formatCurrency(totals.outstanding_loans || 0);
+
+            const byStatus = Object.entries(overview.loans_by_status || {});
+            document.getElementById('stats-loan-status').innerHTML = byStatus.length === 0 ? '<div class="empty-state">No loans</div>' : `
+                <table class="hashes-table">
+                    <thead><tr><th>Status</th><th>Loans</th><th>Amount</th><th>Balance</th></tr></thead>
+                    <tbody>${byStatus.map(([status, ss]) => `<tr><td>${this.formatLoanStatus(status)}</td><td>${ss.count}</td><td>${this.formatCurrency(ss.amount)}</td><td>${this.formatCurrency(ss.balance)}</td></tr>`).join('')}</tbody>
+                </table>
+            `;
+            document.getElementById('stats-volume').innerHTML = `
+                <table class="hashes-table">
+                    <thead><tr><th>Date</th><th>Transactions</th><th>Amount</th></tr></thead>
+                    <tbody>${(overview.daily_volume || []).slice().reverse().map(dd => `<tr><td>${dd.date}</td><td>${dd.count}</td><td>${this.formatCurrency(dd.amount)}</td></tr>`).join('')}</tbody>
+                </table>
+            `;
         } catch(error){ console.error('Error loading system stats:', error);}
     }
 
@@ -706,6 +750,7 @@ class AdminComponent {
         document.getElementById(`${tabId}-tab`).classList.add('active');
         document.querySelectorAll('.tab-link').forEach(link => { link.classList.remove('active');});
         document.querySelector(`.tab-link[data-tab="${tabId}"]`).classList.add('active');
+        if(tabId === 'hashes'){ this.loadHashes();}
     }
 
     formatCurrency(amount){ return new Intl.NumberFormat('en-US', { style: 'currency',currency: 'USD'}).format(amount);}
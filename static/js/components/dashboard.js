@@ -1,8 +1,7 @@
 class DashboardComponent {
     constructor() {
         this.accounts = [];
-        this.transactions = [];
-        this.loans = [];
+        this.summary = {};
     }
 
     init(userData) {
@@ -11,10 +10,9 @@ class DashboardComponent {
         this.setupCardNavigation();
     }
 
-    updateDashboard(accounts, transactions, loans) {
+    updateDashboard(accounts, summary) {
         this.accounts = accounts || [];
-        this.transactions = transactions || [];
-        this.loans = loans || [];
+        this.summary = summary || {};
 
         this.updateAccountSummary();
         this.updateTransactionsList();
@@ -24,23 +22,11 @@ class DashboardComponent {
     updateGreeting(){ if(this.userData){ document.getElementById('user-fullname').textContent = this.userData.full_name;}}
 
     updateAccountSummary() {
-        // update acc count
-        document.getElementById('total-accounts').textContent = this.accounts.length;
-
-        // calculate total balance
-        const totalBalance = this.accounts.reduce((sum, account) => sum + account.balance, 0);
-        document.getElementById('total-balance').textContent = this.formatCurrency(totalBalance);
-
-        // count active loans
-        const activeLoans = this.loans.filter(loan => loan.status === 'active').length;
-        document.getElementById('active-loans').textContent = activeLoans;
-
-        // count recent transactions -- last 30 days
-        const thirtyDaysAgo = new Date();
-        thirtyDaysAgo.setDate(thirtyDaysAgo.getDate() - 30);
-
-        const rcntTransacs = this.transactions.filter(transaction => { return new Date(transaction.created_at) >= thirtyDaysAgo;}).length;
-        document.getElementById('recent-transactions').textContent = rcntTransacs;
+        // aggregates come from /dashboard/summary
+        document.getElementById('total-accounts').textContent = this.summary.total_accounts || 0;
+        document.getElementById('total-balance').textContent = this.formatCurrency(this.summary.total_balance || 0);
+        document.getElementById('active-loans').textContent = this.summary.active_loans || 0;
+        document.getElementById('recent-transactions').textContent = this.summary.recent_transactions || 0; // last 30 days
     }
 
     setupCardNavigation() {
@@ -60,11 +46,9 @@ class DashboardComponent {
     updateTransactionsList() {
         const dbrdTransac = document.getElementById('dashboard-transactions');
 
-        if (this.transactions.length > 0) {
+        const latestTransactions = this.summary.latest_transactions || []; // newest first, already limited to 5
+        if (latestTransactions.length > 0) {
             dbrdTransac.innerHTML = '';
-
-            // show latest 5 transactions
-            const latestTransactions = [...this.transactions].sort((a, b) => new Date(b.created_at) - new Date(a.created_at)).slice(0, 5);
             latestTransactions.forEach(transaction => { dbrdTransac.appendChild(this.createTransactionElement(transaction));});
         } else{ dbrdTransac.innerHTML = '<div class="empty-state">no recent transactions</div>';}
     }
@@ -100,7 +84,7 @@ class DashboardComponent {
         let mntPrfx = '';
 
         switch(transaction.transaction_type){
-            case 'deposit': mntClass = 'deposit'; mntPrfx = '+'; break;
+            case 'deposit': case 'interest': mntClass = 'deposit'; mntPrfx = '+'; break;
             case 'withdrawal': mntClass = 'withdrawal'; mntPrfx = '-'; break;
             case 'transfer':
                 if(transaction.destination_account_id){ mntClass = 'withdrawal'; mntPrfx = '-';} // outgoing transfer
@@ -76,6 +76,11 @@ class TransactionsComponent {
                 amountPrefix = '+';
                 detailsText = `Deposit to ${accountInfo}`;
                 break;
+            case 'interest':
+                amountClass = 'deposit';
+                amountPrefix = '+';
+                detailsText = `Interest credited to ${accountInfo}`;
+                break;
             case 'withdrawal':
                 amountClass = 'withdrawal';
                 amountPrefix = '-';
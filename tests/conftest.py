@@ -25,6 +25,27 @@ def app():
             os.remove(file_path)
 
 
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    ''' factory -- app on a throwaway sqlite file + data folder, extra env vars as kwargs '''
+    from src.models import db
+    apps = []
+
+    def _make(**env):
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'primary.db'}")
+        for key, value in env.items(): monkeypatch.setenv(key, str(value))
+        app = create_app()
+        app.config.update({"TESTING": True, "JWT_SECRET_KEY": "test-jwt-key", "DATA_FOLDER": str(tmp_path)})
+        apps.append(app)
+        return app
+
+    yield _make
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            for engine in db.engines.values(): engine.dispose()
+
+
 @pytest.fixture
 def client(app):
     ''' test client for the app '''
@@ -41,7 +62,7 @@ def auth_header(client):
         "role" : "admin"
     })
 
-    resp = client.post("api/v2/users/login", json={
+    resp = client.post("api/v1/users/login", json={
         "username": "tAdmin",
         "password": "pwd123",
     })
@@ -0,0 +1,34 @@
+from src.models import User
+from src.managers.AccountManager import AccountManager, account_ref_cache
+
+
+def _sample_account(app):
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        return AccountManager().create_account({'user_id': uid, 'account_type': 'Checking'})
+
+
+def test_ref_is_cached_and_has_no_balance(make_app):
+    app = make_app()
+    acc_id = _sample_account(app)
+    manager = AccountManager()
+    with app.app_context():
+        ref = manager.get_account_ref(acc_id)
+        assert not hasattr(ref, 'balance')
+        hits = account_ref_cache.hits
+        assert manager.get_account_ref(acc_id) == ref
+        assert manager.get_account_ref_by_number(ref.account_number) == ref
+        assert account_ref_cache.hits >= hits + 2
+
+
+def test_update_and_close_invalidate(make_app):
+    app = make_app()
+    acc_id = _sample_account(app)
+    manager = AccountManager()
+    with app.app_context():
+        old = manager.get_account_ref(acc_id)
+        assert manager.update_account(acc_id, {'account_number': '1099999999'})
+        assert manager.get_account_ref(acc_id).account_number == '1099999999'
+        assert manager.get_account_ref_by_number(old.account_number) is None
+        assert manager.close_account(acc_id)
+        assert manager.get_account_ref(acc_id).active is False
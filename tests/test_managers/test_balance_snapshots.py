@@ -0,0 +1,74 @@
+import pytest
+from datetime import date, datetime
+from src.models import db, User, Account, Transaction, AccountBalanceSnapshot
+from src.managers.BalanceSnapshotManager import BalanceSnapshotManager
+
+
+def _tx(acc, tx_type, amount, at, dest=None, description=None):
+    return Transaction(account_id=acc, transaction_type=tx_type, amount=amount, destination_account_id=dest, created_at=at, description=description or tx_type)
+
+
+@pytest.fixture
+def history_app(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        a, b = Account(uid, 'Checking', balance=55), Account(uid, 'Savings', balance=30)
+        db.session.add_all([a, b])
+        db.session.flush()
+        db.session.add_all([
+            _tx(a.account_id, 'deposit', 100, datetime(2025, 1, 1, 9)),
+            _tx(b.account_id, 'deposit', 10, datetime(2025, 1, 2, 9)),
+            _tx(a.account_id, 'withdrawal', 30, datetime(2025, 1, 3, 9)),
+            _tx(a.account_id, 'transfer', 20, datetime(2025, 1, 3, 23, 59, 59, 999990), b.account_id, 'transfer'),
+            _tx(b.account_id, 'transfer', 20, datetime(2025, 1, 4, 0, 0, 0, 5), a.account_id, 'transfer in'), # in-row lands past midnight
+            _tx(a.account_id, 'deposit', 5, datetime(2025, 1, 6, 9)),
+        ])
+        db.session.commit()
+        yield app, a.account_id, b.account_id
+
+
+def _snapshots(acc_id):
+    return [(ss.snapshot_date.day, float(ss.closing_balance), ss.tx_count) for ss in AccountBalanceSnapshot.query.filter_by(account_id=acc_id).order_by(AccountBalanceSnapshot.snapshot_date)]
+
+
+def test_refresh_writes_active_days_only(history_app):
+    app, a, b = history_app
+    res = BalanceSnapshotManager(chunk_size=1).refresh(date(2025, 1, 4))
+    assert res == {'status': 'completed', 'watermark': '2025-01-04', 'written': 4}
+    assert _snapshots(a) == [(1, 100, 1), (3, 50, 2)]
+    assert _snapshots(b) == [(2, 10, 1), (3, 30, 1)]
+
+
+def test_refresh_is_incremental(history_app):
+    app, a, b = history_app
+    manager = BalanceSnapshotManager()
+    manager.refresh(date(2025, 1, 4))
+    assert manager.refresh(date(2025, 1, 4))['status'] == 'up_to_date'
+    assert manager.refresh(date(2025, 1, 7))['written'] == 1
+    assert _snapshots(a)[-1] == (6, 55, 1)
+    assert manager.refresh(date(2025, 1, 7), rebuild=True)['written'] == 5
+    with pytest.raises(ValueError): manager.refresh(datetime.utcnow().date())
+
+
+def test_balance_at(history_app):
+    app, a, b = history_app
+    manager = BalanceSnapshotManager()
+    manager.refresh(date(2025, 1, 4))
+    assert manager.balance_at(a, date(2024, 12, 31)) == (0, 'snapshot')
+    assert manager.balance_at(a, date(2025, 1, 2)) == (100, 'snapshot')
+    assert manager.balance_at(a, date(2025, 1, 5)) == (50, 'replay')
+    assert manager.balance_at(a, date(2025, 1, 6)) == (55, 'replay')
+    assert manager.balance_at(a, datetime.utcnow().date()) == (55, 'live')
+
+
+def test_balance_history_spans_snapshots_and_replay(history_app):
+    app, a, b = history_app
+    manager = BalanceSnapshotManager()
+    before = manager.balance_history(a, date(2024, 12, 31), date(2025, 1, 7))
+    manager.refresh(date(2025, 1, 4))
+    after = manager.balance_history(a, date(2024, 12, 31), date(2025, 1, 7))
+    assert before == after
+    assert [pp['balance'] for pp in after] == [0, 100, 100, 50, 50, 50, 55, 55]
+    assert after[0]['date'] == '2024-12-31'
+    with pytest.raises(ValueError): manager.balance_history(a, date(2025, 1, 7), date(2025, 1, 1))
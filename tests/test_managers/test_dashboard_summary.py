@@ -0,0 +1,58 @@
+import pytest
+from datetime import datetime, timedelta
+from src.models import db, User, Account, Loan, Transaction
+from src.managers.DashboardManager import DashboardManager, overview_cache
+from src.utils.query_stats import assert_max_queries
+
+
+def test_summary_aggregates_in_one_select(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        other = User.query.filter_by(username='admin').first().user_id
+        a, b, theirs = Account(uid, 'Checking', balance=100.5), Account(uid, 'Savings', balance=20), Account(other, 'Checking', balance=999)
+        db.session.add_all([a, b, theirs, Loan(user_id=uid, loan_type='Personal', amount=500, interest_rate=5, term_months=12)])
+        db.session.flush()
+        db.session.add(Loan(user_id=uid, loan_type='Auto', amount=800, interest_rate=5, term_months=12, status='active'))
+        old = datetime.utcnow() - timedelta(days=45)
+        db.session.add_all([Transaction(account_id=a.account_id, transaction_type='deposit', amount=i + 1, description='d') for i in range(7)]
+                           + [Transaction(account_id=a.account_id, transaction_type='deposit', amount=1, description='old', created_at=old),
+                              Transaction(account_id=theirs.account_id, transaction_type='transfer', amount=5, description='incoming', destination_account_id=b.account_id, created_at=datetime.utcnow() + timedelta(seconds=1)),
+                              Transaction(account_id=theirs.account_id, transaction_type='deposit', amount=5, description='not mine')])
+        db.session.commit()
+        with assert_max_queries(2): summary = DashboardManager().get_summary(uid) # aggregates + latest list
+
+    assert summary['total_accounts'] == 4 # 2 seeded + 2 new
+    assert summary['total_balance'] == round(999999.99 + 10000 + 100.5 + 20, 2)
+    assert summary['active_loans'] == 1
+    assert summary['recent_transactions'] == 2 + 7 + 1 # seed deposits + new deposits + incoming transfer
+    assert [tt['description'] for tt in summary['latest_transactions']][:1] == ['incoming']
+    assert len(summary['latest_transactions']) == DashboardManager.LATEST_LIMIT
+
+
+def test_admin_overview_aggregates_and_caches(make_app):
+    app = make_app()
+    overview_cache.clear()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        acc = Account.query.filter_by(account_type='Checking').first()
+        db.session.add_all([Loan(user_id=uid, loan_type='Personal', amount=500, interest_rate=5, term_months=12),
+                            Loan(user_id=uid, loan_type='Auto', amount=800, interest_rate=5, term_months=12, status='active'),
+                            Transaction(account_id=acc.account_id, transaction_type='withdrawal', amount=25, description='w'),
+                            Transaction(account_id=acc.account_id, transaction_type='deposit', amount=5, description='old', created_at=datetime.utcnow() - timedelta(days=20))])
+        db.session.commit()
+        mgr = DashboardManager()
+        overview = mgr.get_admin_overview(days=7, top=3)
+        with assert_max_queries(0): again = mgr.get_admin_overview(days=7, top=3) # served from cache
+        with pytest.raises(ValueError): mgr.get_admin_overview(days=0)
+    overview_cache.clear()
+
+    assert again is overview
+    assert overview['totals'] == {'users': 2, 'accounts': 2, 'active_accounts': 2, 'total_balance': round(999999.99 + 10000, 2),
+                                  'transactions': 4, 'loans': 2, 'outstanding_loans': 800}
+    assert overview['loans_by_status'] == {'pending': {'count': 1, 'amount': 500, 'balance': 500}, 'active': {'count': 1, 'amount': 800, 'balance': 800}}
+    assert overview['transactions_by_type'] == {'deposit': {'count': 3, 'amount': 11505}, 'withdrawal': {'count': 1, 'amount': 25}}
+    assert len(overview['daily_volume']) == 7 and overview['daily_volume'][-1]['date'] == datetime.utcnow().date().isoformat()
+    assert overview['daily_volume'][-1]['count'] == 3 # the 20-day-old deposit is outside the window
+    assert overview['daily_volume'][-1]['by_type']['withdrawal'] == {'count': 1, 'amount': 25}
+    assert len(overview['recent_transactions']) == 3 and len(overview['recent_loans']) == 2
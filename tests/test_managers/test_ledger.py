@@ -0,0 +1,96 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+from src.models import db, User, Account, Transaction, LedgerEntry
+from src.managers.AccountManager import AccountManager
+from src.managers.LedgerManager import LedgerManager
+
+
+@pytest.fixture
+def ledger_app(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        am = AccountManager()
+        a = am.create_account({'user_id': uid, 'account_type': 'Checking', 'balance': 100})
+        b = am.create_account({'user_id': uid, 'account_type': 'Savings'})
+        c = am.create_account({'user_id': uid, 'account_type': 'Savings'})
+        yield app, am, a, b, c
+
+
+def _legs(acc_id):
+    return [(ee.entry_type, float(ee.amount), float(ee.balance_after)) for ee in LedgerEntry.query.filter_by(account_id=acc_id).order_by(LedgerEntry.created_at, LedgerEntry.entry_id)]
+
+
+def test_money_paths_write_legs_in_one_commit(ledger_app):
+    app, am, a, b, c = ledger_app
+    commits = []
+    on_commit = lambda session: commits.append(1)
+    event.listen(db.session, 'after_commit', on_commit)
+    try:
+        am.deposit(a, 50)
+        am.withdraw(a, 30)
+        am.transfer(a, b, 20)
+    finally: event.remove(db.session, 'after_commit', on_commit)
+    assert len(commits) == 3
+    assert _legs(a) == [('deposit', 100, 100), ('deposit', 50, 150), ('withdrawal', -30, 120), ('transfer_out', -20, 100)]
+    assert _legs(b) == [('transfer_in', 20, 20)]
+
+
+def test_multi_transfer_running_balances(ledger_app):
+    app, am, a, b, c = ledger_app
+    results = am.multi_transfer(a, [{'to_account_id': b, 'amount': 10}, {'to_account_id': c, 'amount': 15}, {'to_account_id': b, 'amount': 5}])
+    assert all(rr['hash'] for rr in results)
+    assert _legs(a)[1:] == [('transfer_out', -10, 90), ('transfer_out', -15, 75), ('transfer_out', -5, 70)]
+    assert _legs(b) == [('transfer_in', 10, 10), ('transfer_in', 5, 15)]
+    assert _legs(c) == [('transfer_in', 15, 15)]
+    # every leg of a multi-transfer row points at it
+    assert {ee.transaction_id for ee in LedgerEntry.query.filter_by(entry_type='transfer_in')} == {rr['transaction_id'] for rr in results}
+
+
+def test_transfers_lock_all_rows_in_one_sorted_statement(ledger_app):
+    app, am, a, b, c = ledger_app
+    locks = []
+    original = am._lock_query
+    am._lock_query = lambda ids: locks.append(original(ids)) or locks[-1]
+    am.transfer(a, b, 10)
+    am.transfer(b, a, 5) # opposite direction → same statement, same lock order
+    am.multi_transfer(a, [{'to_account_id': c, 'amount': 1}, {'to_account_id': b, 'amount': 1}])
+    sql = [str(qq.statement.compile(dialect=postgresql.dialect(), compile_kwargs={'literal_binds': True})) for qq in locks]
+    assert len(sql) == 3 and sql[0] == sql[1]
+    assert all(ss.endswith('ORDER BY accounts.account_id FOR UPDATE') for ss in sql)
+    assert sql[2].count("'") == 6 # a, b, c -- each locked once
+    with pytest.raises(ValueError): am.multi_transfer(a, [{'to_account_id': [b], 'amount': 1}])
+
+
+def test_backfill_anchors_legacy_legs_and_is_idempotent(ledger_app):
+    app, am, a, b, c = ledger_app
+    legacy = Account(db.session.get(Account, a).user_id, 'Checking', balance=70)
+    db.session.add(legacy)
+    db.session.flush()
+    db.session.add_all([ # pre-ledger rows -- a transfer() pair and a deposit
+        Transaction(account_id=legacy.account_id, transaction_type='deposit', amount=100, description='deposit', created_at=datetime(2024, 1, 1)),
+        Transaction(account_id=legacy.account_id, transaction_type='transfer', amount=30, destination_account_id=c, description='transfer', created_at=datetime(2024, 1, 2)),
+        Transaction(account_id=c, transaction_type='transfer', amount=30, destination_account_id=legacy.account_id, description='transfer in', created_at=datetime(2024, 1, 2)),
+    ])
+    db.session.get(Account, c).balance = 30 # credit the pre-ledger code applied without an entry
+    db.session.commit()
+    am.deposit(c, 5) # c has a ledger entry now → its legacy leg ends at the balance before it
+
+    assert LedgerManager(chunk_size=2).backfill()['written'] == 3
+    assert _legs(legacy.account_id) == [('deposit', 100, 100), ('transfer_out', -30, 70)]
+    assert _legs(c) == [('transfer_in', 30, 30), ('deposit', 5, 35)]
+    assert LedgerManager().backfill()['written'] == 0
+
+
+def test_history_pages_and_balance_at(ledger_app):
+    app, am, a, b, c = ledger_app
+    for amt in (1, 2, 3, 4): am.deposit(b, amt)
+    mgr = LedgerManager()
+    first = mgr.get_entries(b, limit=3)
+    assert [float(ee.amount) for ee in first] == [4, 3, 2]
+    assert [float(ee.amount) for ee in mgr.get_entries(b, limit=3, before=first[-1].entry_id)] == [1]
+    assert mgr.balance_at(b, first[1].created_at) == 6
+    assert mgr.balance_at(b, datetime(2000, 1, 1)) == 0
+    with pytest.raises(ValueError): mgr.get_entries(a, before=first[0].entry_id)
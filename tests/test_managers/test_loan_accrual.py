@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, datetime
+from src.models import db, User, Loan, LoanAccrual, LoanAccrualTotal, JobRun
+from src.managers.LoanAccrualManager import LoanAccrualManager
+
+APPROVED = datetime(2025, 1, 1, 9, 30)
+
+
+@pytest.fixture
+def accrual_app(make_app):
+    app = make_app()
+    with app.app_context():
+        Loan.query.delete()
+        uid = User.query.filter_by(username='user').first().user_id
+        loans = [Loan(user_id=uid, loan_type='Personal', amount=1000 * (i + 1), interest_rate=7.3, term_months=12, status='active') for i in range(5)]
+        for ll in loans: ll.approved_at = APPROVED
+        db.session.add_all(loans)
+        db.session.commit()
+        yield app, sorted(ll.loan_id for ll in loans)
+
+
+def _balances(ids):
+    db.session.expire_all()
+    return [float(db.session.get(Loan, lid).balance) for lid in ids]
+
+
+def test_accrues_simple_daily_interest(accrual_app):
+    app, ids = accrual_app
+    res = LoanAccrualManager(chunk_size=2, default_after_missed=0).run(date(2025, 1, 11))
+    assert res['status'] == 'completed' and res['processed'] == 5 and res['accrued'] == 5
+    # 10 days at 7.3% / 365 = 0.2% of the balance
+    assert sorted(_balances(ids)) == [1002, 2004, 3006, 4008, 5010]
+    acc = LoanAccrual.query.filter_by(loan_id=ids[0]).one()
+    assert (acc.period_start, acc.period_end, acc.days) == (date(2025, 1, 1), date(2025, 1, 11), 10)
+
+
+def test_runs_are_incremental_and_idempotent(accrual_app):
+    app, ids = accrual_app
+    manager = LoanAccrualManager(default_after_missed=0)
+    manager.run(date(2025, 1, 11))
+    first = _balances(ids)
+    assert manager.run(date(2025, 1, 11))['status'] == 'already_completed'
+    assert _balances(ids) == first
+    manager.run(date(2025, 1, 21))
+    rows = LoanAccrual.query.filter_by(loan_id=ids[0]).order_by(LoanAccrual.period_end).all()
+    assert [(rr.period_start, rr.days) for rr in rows] == [(date(2025, 1, 1), 10), (date(2025, 1, 11), 10)]
+    # an older date than the last accrual adds nothing
+    assert manager.run(date(2025, 1, 15))['accrued'] == 0
+    total = db.session.get(LoanAccrualTotal, ids[0]) # kept per loan → next run reads one row, not the history
+    assert (total.last_period_end, float(total.accrued_interest)) == (date(2025, 1, 21), float(sum(rr.interest for rr in rows)))
+
+
+def test_payment_during_chunk_is_not_overwritten(accrual_app):
+    app, ids = accrual_app
+    manager = LoanAccrualManager(default_after_missed=0)
+    original = manager._process_chunk
+    def pay_mid_chunk(rows, as_of, stats): # a payment landing between the chunk read and its UPDATE
+        db.session.execute(Loan.__table__.update().where(Loan.loan_id == ids[0]).values(balance=Loan.balance - 100))
+        original(rows, as_of, stats)
+    manager._process_chunk = pay_mid_chunk
+    before = _balances(ids)[0]
+    manager.run(date(2025, 1, 11))
+    assert _balances(ids)[0] == round(before - 100 + before * 0.002, 2) # balance + interest, not the stale absolute value
+
+
+def test_interrupted_run_resumes_from_cursor(accrual_app):
+    app, ids = accrual_app
+    manager = LoanAccrualManager(chunk_size=2, default_after_missed=0)
+    calls = []
+    original = manager._process_chunk
+    def crash_on_second(rows, as_of, stats):
+        calls.append(len(rows))
+        if len(calls) == 2: raise RuntimeError("worker killed")
+        original(rows, as_of, stats)
+    manager._process_chunk = crash_on_second
+    with pytest.raises(RuntimeError): manager.run(date(2025, 1, 11))
+    db.session.rollback()
+    job = db.session.get(JobRun, (LoanAccrualManager.JOB_NAME, '2025-01-11'))
+    assert (job.status, job.processed, job.cursor) == ('running', 2, ids[1])
+
+    manager._process_chunk = original
+    res = manager.run(date(2025, 1, 11))
+    assert res['processed'] == 5
+    assert LoanAccrual.query.count() == 5
+
+
+def test_marks_loans_behind_schedule_defaulted(accrual_app):
+    app, ids = accrual_app
+    db.session.get(Loan, ids[0]).balance = 0 # paid ahead | everyone else has paid nothing for 4 months
+    db.session.commit()
+    res = LoanAccrualManager(default_after_missed=3).run(date(2025, 5, 2))
+    assert res['defaulted'] == 4
+    db.session.expire_all()
+    assert [db.session.get(Loan, lid).status for lid in ids].count('defaulted') == 4
+    assert db.session.get(Loan, ids[0]).status == 'active'
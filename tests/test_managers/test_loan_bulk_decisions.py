@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import event
+from src.models import db, User, Loan
+from src.managers.LoanManager import LoanManager
+
+
+@pytest.fixture
+def pending_loans(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        loans = [Loan(user_id=uid, loan_type='Personal', amount=1000, interest_rate=5, term_months=12) for _ in range(4)]
+        db.session.add_all(loans)
+        db.session.commit()
+        yield app, [ll.loan_id for ll in loans]
+
+
+def _statuses(ids):
+    db.session.expire_all()
+    return [db.session.get(Loan, lid).status for lid in ids]
+
+
+def test_bulk_decide_one_select_one_commit(pending_loans):
+    app, ids = pending_loans
+    stmts, commits = [], []
+    on_exec = lambda conn, cursor, statement, *a: stmts.append(statement)
+    on_commit = lambda session: commits.append(1)
+    event.listen(db.engine, 'before_cursor_execute', on_exec)
+    event.listen(db.session, 'after_commit', on_commit)
+    try: results = LoanManager().bulk_decide([{'loan_id': lid, 'action': 'approve'} for lid in ids])
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', on_exec)
+        event.remove(db.session, 'after_commit', on_commit)
+    assert all(rr['ok'] and rr['status'] == 'approved' for rr in results)
+    assert sum(1 for ss in stmts if ss.lstrip().upper().startswith('SELECT')) == 1
+    assert len(commits) == 1
+    assert _statuses(ids) == ['approved'] * 4
+
+
+def test_bulk_decide_reports_each_item(pending_loans):
+    app, ids = pending_loans
+    results = LoanManager().bulk_decide([
+        {'loan_id': ids[0], 'action': 'approve'},
+        {'loan_id': ids[0], 'action': 'activate'}, # applied in order → same batch can approve then activate
+        {'loan_id': ids[1], 'action': 'activate'},
+        {'loan_id': ids[2], 'action': 'reject'},
+        {'loan_id': 'missing', 'action': 'approve'},
+        {'loan_id': ids[3], 'action': 'delete'},
+        'garbage',
+        {'loan_id': [ids[3]], 'action': 'approve'}, # unhashable → per-item error, not a 500
+        {'loan_id': ids[3], 'action': ['approve']},
+    ])
+    assert [rr['ok'] for rr in results] == [True, True, False, True, False, False, False, False, False]
+    assert results[2]['error'] == "Cannot activate loan with status 'pending'"
+    assert results[4]['error'] == "loan not found"
+    assert results[5]['error'] == "unknown action: delete"
+    assert results[7]['error'] == "loan_id must be a string"
+    assert results[8]['error'] == "action must be a string"
+    assert _statuses(ids) == ['active', 'pending', 'rejected', 'pending']
+
+
+def test_bulk_decide_chunks_lookups(pending_loans):
+    app, ids = pending_loans
+    results = LoanManager().bulk_decide([{'loan_id': lid, 'action': 'reject'} for lid in ids], chunk_size=3)
+    assert all(rr['ok'] for rr in results)
+    assert _statuses(ids) == ['rejected'] * 4
@@ -0,0 +1,58 @@
+import pytest
+from sqlalchemy import event
+from src.models import db, User, Account, Loan, Transaction
+from src.managers.LoanManager import LoanManager
+
+
+@pytest.fixture
+def loan_setup(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        acc = Account(user_id=uid, account_type='Checking', balance=500)
+        loan = Loan(user_id=uid, loan_type='Personal', amount=1000, interest_rate=5, term_months=12, status='active')
+        db.session.add_all([acc, loan])
+        db.session.commit()
+        yield app, acc.account_id, loan.loan_id
+
+
+def _state(acc_id, loan_id):
+    db.session.expire_all()
+    return float(db.session.get(Account, acc_id).balance), float(db.session.get(Loan, loan_id).balance), Transaction.query.filter_by(account_id=acc_id).count()
+
+
+def test_pay_from_account_single_commit(loan_setup):
+    app, acc_id, loan_id = loan_setup
+    commits = []
+    listener = lambda session: commits.append(1)
+    event.listen(db.session, 'after_commit', listener)
+    try: loan_bal, acc_bal, tx_id = LoanManager().pay_from_account(loan_id, acc_id, 200)
+    finally: event.remove(db.session, 'after_commit', listener)
+    assert (loan_bal, acc_bal) == (800, 300)
+    assert len(commits) == 1
+    assert _state(acc_id, loan_id) == (300, 800, 1)
+    assert db.session.get(Transaction, tx_id).transaction_type == 'withdrawal'
+
+
+@pytest.mark.parametrize('amount, status, msg', [
+    (600, 'active', 'insufficient funds'),
+    (100, 'pending', "Cannot make payment on loan with status 'pending'"),
+    (-5, 'active', 'must be positive'),
+])
+def test_failed_payment_moves_nothing(loan_setup, amount, status, msg):
+    app, acc_id, loan_id = loan_setup
+    db.session.get(Loan, loan_id).status = status
+    db.session.commit()
+    with pytest.raises(ValueError, match=msg):
+        LoanManager().pay_from_account(loan_id, acc_id, amount)
+    assert _state(acc_id, loan_id) == (500, 1000, 0)
+
+
+def test_overpayment_is_rejected(loan_setup):
+    app, acc_id, loan_id = loan_setup
+    db.session.get(Loan, loan_id).balance = 100
+    db.session.commit()
+    with pytest.raises(ValueError, match='exceeds outstanding balance'):
+        LoanManager().pay_from_account(loan_id, acc_id, 150)
+    assert _state(acc_id, loan_id) == (500, 100, 0)
+    assert LoanManager().pay_from_account(loan_id, acc_id, 100)[:2] == (0, 400) # paying it off exactly still works
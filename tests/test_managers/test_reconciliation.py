@@ -0,0 +1,67 @@
+import pytest
+from src.models import db, User, Account, Transaction, ReconciliationState
+from src.managers.AccountManager import AccountManager
+from src.managers.ReconciliationManager import ReconciliationManager, partition_ranges
+
+
+@pytest.fixture
+def ledger_app(make_app):
+    app = make_app()
+    with app.app_context():
+        # seed checking account is created with a balance its 'Initial deposit' doesn't explain -- line them up
+        for acc in Account.query.all(): acc.balance = sum(float(tx.amount) for tx in Transaction.query.filter_by(account_id=acc.account_id))
+        uid = User.query.filter_by(username='user').first().user_id
+        manager = AccountManager()
+        a = manager.create_account({'user_id': uid, 'account_type': 'Checking', 'balance': 500})
+        b = manager.create_account({'user_id': uid, 'account_type': 'Savings', 'balance': 0})
+        c = manager.create_account({'user_id': uid, 'account_type': 'Savings', 'balance': 0})
+        manager.transfer(a, b, 100)                                     # two rows
+        manager.multi_transfer(a, [{'to_account_id': b, 'amount': 20}, {'to_account_id': c, 'amount': 30}]) # one row each
+        manager.transfer(b, a, 100)                                     # same amount back
+        manager.withdraw(c, 5)
+        yield app, a, b, c
+
+
+def test_partition_ranges_cover_keyspace():
+    assert partition_ranges(1) == [(None, None)]
+    assert partition_ranges(4) == [(None, '4000'), ('4000', '8000'), ('8000', 'c000'), ('c000', None)]
+
+
+def test_consistent_ledger_has_no_discrepancies(ledger_app):
+    app, a, b, c = ledger_app
+    report = ReconciliationManager(workers=1, partitions=3).run(full=True)
+    assert report['accounts_checked'] == Account.query.count()
+    assert report['discrepancies'] == []
+    states = {ss.account_id: ss for ss in ReconciliationState.query}
+    assert (float(states[a].expected), float(states[b].expected), float(states[c].expected)) == (450, 20, 25)
+
+
+def test_reports_tampered_balance_and_rechecks_only_changes(ledger_app):
+    app, a, b, c = ledger_app
+    manager = ReconciliationManager(workers=1)
+    manager.run()
+    assert manager.run()['accounts_checked'] == 0
+
+    db.session.get(Account, b).balance = 999
+    db.session.commit()
+    report = manager.run()
+    assert report['accounts_checked'] == 1
+    assert [(dd['account_id'], dd['expected'], dd['difference']) for dd in report['discrepancies']] == [(b, 20, 979)]
+
+    AccountManager().deposit(c, 1) # new posting → c rechecked | b is rechecked until fixed
+    assert manager.run()['accounts_checked'] == 2
+    db.session.get(Account, b).balance = 20
+    db.session.commit()
+    report = manager.run()
+    assert (report['accounts_checked'], report['discrepancy_count']) == (1, 0)
+
+
+def test_worker_processes_match_in_process_run(ledger_app):
+    app, a, b, c = ledger_app
+    db.session.get(Account, c).balance = 1
+    db.session.commit()
+    single = ReconciliationManager(workers=1, partitions=4).run(full=True)
+    pooled = ReconciliationManager(workers=2, partitions=4).run(full=True)
+    assert pooled['workers'] == 2
+    assert pooled['discrepancies'] == single['discrepancies']
+    assert [dd['account_id'] for dd in pooled['discrepancies']] == [c]
@@ -0,0 +1,92 @@
+import os
+import json
+import pytest
+from datetime import date, datetime
+from src.models import db, User, Account, Transaction
+from src.managers.SavingsInterestManager import SavingsInterestManager, period_bounds
+
+TODAY = date(2025, 3, 10)
+
+
+def _tx(acc, tx_type, amount, at, dest=None, description=None):
+    return Transaction(account_id=acc, transaction_type=tx_type, amount=amount, destination_account_id=dest, created_at=at, description=description or tx_type)
+
+
+@pytest.fixture
+def savings_app(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        s1 = Account(uid, 'Savings', balance=1565)
+        s2 = Account(uid, 'Savings', balance=500)
+        chk = Account(uid, 'Checking', balance=900)
+        s1.created_at, s2.created_at, chk.created_at = datetime(2025, 1, 1), datetime(2025, 2, 25, 8), datetime(2025, 1, 1)
+        db.session.add_all([s1, s2, chk])
+        db.session.flush()
+        db.session.add_all([
+            _tx(s1.account_id, 'deposit', 1000, datetime(2025, 1, 1)),
+            _tx(chk.account_id, 'deposit', 1000, datetime(2025, 1, 1)),
+            _tx(chk.account_id, 'transfer', 100, datetime(2025, 2, 10, 12), s1.account_id, 'transfer'), # transfer() pair
+            _tx(s1.account_id, 'transfer', 100, datetime(2025, 2, 10, 12, 0, 0, 30), chk.account_id, 'transfer in'),
+            _tx(s1.account_id, 'deposit', 365, datetime(2025, 2, 15, 10)),
+            _tx(s2.account_id, 'deposit', 500, datetime(2025, 2, 25, 8)),
+            _tx(s1.account_id, 'deposit', 100, datetime(2025, 3, 5)), # after the period
+        ])
+        db.session.commit()
+        yield app, s1.account_id, s2.account_id, chk.account_id
+
+
+def _balance(acc_id):
+    db.session.expire_all()
+    return float(db.session.get(Account, acc_id).balance)
+
+
+def test_period_bounds():
+    assert period_bounds('2025-02') == (date(2025, 2, 1), date(2025, 3, 1))
+    assert period_bounds('2024-12') == (date(2024, 12, 1), date(2025, 1, 1))
+    with pytest.raises(ValueError): period_bounds('2025/02')
+
+
+def test_daily_balances_rebuilt_from_legs(savings_app):
+    app, s1, s2, chk = savings_app
+    rows = Account.query.filter(Account.account_id.in_([s1, s2])).all()
+    closing = SavingsInterestManager().daily_balances(rows, date(2025, 2, 1), date(2025, 3, 1))
+    by_id = {r.account_id: closing[i] for i, r in enumerate(rows)}
+    assert list(by_id[s1][[0, 9, 14, 27]]) == [1000, 1100, 1465, 1465]
+    assert list(by_id[s2][[23, 24, 27]]) == [0, 500, 500]
+
+
+def test_posts_interest_once_per_period(savings_app):
+    app, s1, s2, chk = savings_app
+    manager = SavingsInterestManager(annual_rate=3.65)
+    res = manager.run('2025-02', today=TODAY)
+    # rate / 365 = 0.01% per day → s1: 14x1000 + 14x1365 + 19x100 | s2: 4x500
+    assert (res['credited'], res['interest']) == (2, 3.7)
+    assert (_balance(s1), _balance(s2), _balance(chk)) == (1568.5, 500.2, 900)
+    tx = Transaction.query.filter_by(account_id=s1, transaction_type='interest').one()
+    assert (float(tx.amount), tx.description) == (3.5, 'Savings interest 2025-02')
+    with open(os.path.join(app.config['DATA_FOLDER'], 'transaction_hashes.json')) as f: assert tx.transaction_id in {hh['transaction_id'] for hh in json.load(f)}
+
+    assert manager.run('2025-02', today=TODAY)['status'] == 'already_completed'
+    assert _balance(s1) == 1568.5
+    assert Transaction.query.filter_by(transaction_type='interest').count() == 2
+
+
+def test_resumes_from_cursor(savings_app):
+    app, s1, s2, chk = savings_app
+    manager = SavingsInterestManager(annual_rate=3.65, chunk_size=1)
+    original, calls = manager._process_chunk, []
+    def crash_on_second(*args):
+        calls.append(1)
+        if len(calls) == 2: raise RuntimeError("worker killed")
+        return original(*args)
+    manager._process_chunk = crash_on_second
+    with pytest.raises(RuntimeError): manager.run('2025-02', today=TODAY)
+    db.session.rollback()
+    manager._process_chunk = original
+    assert manager.run('2025-02', today=TODAY)['processed'] == 2
+    assert (_balance(s1), _balance(s2)) == (1568.5, 500.2)
+
+
+def test_rejects_open_period(savings_app):
+    with pytest.raises(ValueError, match='has not ended'): SavingsInterestManager().run('2025-03', today=TODAY)
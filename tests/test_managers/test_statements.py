@@ -0,0 +1,89 @@
+import json
+import os
+import pytest
+from datetime import date, datetime
+from src.models import db, User, Account, Transaction, LedgerEntry, JobRun
+from src.managers.StatementManager import StatementManager
+from src.utils.jwt_auth import generate_token
+
+
+def _post(acc, tx_type, amount, balance_after, at, entry_type=None):
+    tx = Transaction(account_id=acc.account_id, transaction_type=tx_type, amount=abs(amount), description=f"{tx_type} {abs(amount)}", created_at=at)
+    return [tx, LedgerEntry(account_id=acc.account_id, transaction=tx, entry_type=entry_type or tx_type, amount=amount, balance_after=balance_after, created_at=at)]
+
+
+@pytest.fixture
+def statement_app(make_app):
+    app = make_app()
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        a, b = Account(uid, 'Checking', balance=75), Account(uid, 'Savings', balance=40)
+        a.created_at = b.created_at = datetime(2025, 1, 1)
+        db.session.add_all([a, b])
+        db.session.flush()
+        db.session.add_all(
+            _post(a, 'deposit', 100, 100, datetime(2025, 1, 20))
+            + _post(a, 'withdrawal', -30, 70, datetime(2025, 2, 3))
+            + _post(a, 'deposit', 10, 80, datetime(2025, 2, 10))
+            + _post(a, 'deposit', 15, 95, datetime(2025, 2, 11))
+            + _post(a, 'transfer', -20, 75, datetime(2025, 3, 1), 'transfer_out') # next month
+            + _post(b, 'deposit', 40, 40, datetime(2025, 1, 5))
+        )
+        db.session.commit()
+        yield app, a.account_id, b.account_id
+
+
+def _read(app, acc_id, period='2025-02'):
+    with open(os.path.join(app.config['DATA_FOLDER'], 'statements', period, f"{acc_id}.json")) as f: return json.load(f)
+
+
+def test_statement_balances_totals_and_entries(statement_app):
+    app, a, b = statement_app
+    res = StatementManager(workers=1, chunk_size=1).generate('2025-02', today=date(2025, 3, 5))
+    assert res['status'] == 'completed' and res['processed'] == 2
+    st = _read(app, a)
+    assert (st['opening_balance'], st['closing_balance']) == (100, 95)
+    assert st['totals'] == {'withdrawal': {'count': 1, 'amount': -30}, 'deposit': {'count': 2, 'amount': 25}}
+    assert [dict(zip(st['columns'], rr))['balance_after'] for rr in st['entries']] == [70, 80, 95]
+    quiet = _read(app, b) # no activity → still a statement
+    assert (quiet['opening_balance'], quiet['closing_balance'], quiet['entries']) == (40, 40, [])
+
+
+def test_generate_once_per_period(statement_app):
+    app, a, b = statement_app
+    mgr = StatementManager(workers=1)
+    with pytest.raises(ValueError): mgr.generate('2025-03', today=date(2025, 3, 5))
+    mgr.generate('2025-02', today=date(2025, 3, 5))
+    assert mgr.generate('2025-02', today=date(2025, 3, 5))['status'] == 'already_completed'
+    assert mgr.generate('2025-02', today=date(2025, 3, 5), regenerate=True)['processed'] == 2
+    assert mgr.get_periods(a) == ['2025-02']
+    assert mgr.statement_path(a, '2025-01') is None
+    with pytest.raises(ValueError): mgr.statement_path(a, '../../etc')
+
+
+def test_resumes_after_cursor(statement_app):
+    app, a, b = statement_app
+    first, second = sorted([a, b])
+    db.session.add(JobRun(job_name=StatementManager.JOB_NAME, period_key='2025-02', status='running', processed=1, cursor=first))
+    db.session.commit()
+    StatementManager(workers=1, chunk_size=1).generate('2025-02', today=date(2025, 3, 5))
+    written = os.listdir(os.path.join(app.config['DATA_FOLDER'], 'statements', '2025-02'))
+    assert written == [f"{second}.json"]
+    assert db.session.get(JobRun, (StatementManager.JOB_NAME, '2025-02')).processed == 2
+
+
+def test_worker_pool_writes_same_files(statement_app):
+    app, a, b = statement_app
+    StatementManager(workers=1).generate('2025-02', today=date(2025, 3, 5))
+    inline = {acc: {kk: vv for kk, vv in _read(app, acc).items() if kk != 'generated_at'} for acc in (a, b)}
+    StatementManager(workers=2, chunk_size=1).generate('2025-02', today=date(2025, 3, 5), regenerate=True)
+    assert {acc: {kk: vv for kk, vv in _read(app, acc).items() if kk != 'generated_at'} for acc in (a, b)} == inline
+
+
+def test_statement_download_is_privately_cached(statement_app):
+    app, a, b = statement_app
+    StatementManager(workers=1).generate('2025-02', today=date(2025, 3, 5))
+    user = User.query.filter_by(username='user').first()
+    resp = app.test_client().get(f'/api/v1/accounts/{a}/statements/2025-02', headers={'Authorization': f'Bearer {generate_token(user.user_id, user.username, user.role)}'})
+    assert resp.status_code == 200 and resp.get_json()['closing_balance'] == 95
+    assert resp.cache_control.private and not resp.cache_control.public and resp.cache_control.max_age == 3600
@@ -0,0 +1,61 @@
+import pytest
+from src.models import Account, User
+from src.utils.jwt_auth import generate_token
+
+
+@pytest.fixture
+def batch_client(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        headers = {'Authorization': f'Bearer {generate_token(user.user_id, user.username, user.role)}'}
+        acc_id = Account.query.filter_by(user_id=user.user_id).first().account_id
+    return app.test_client(), headers, acc_id
+
+
+def test_sub_requests_run_in_order_and_match_direct_calls(batch_client):
+    client, headers, acc_id = batch_client
+    resp = client.post('/api/v1/batch', headers=headers, json={'requests': [
+        {'id': 'deposit', 'method': 'POST', 'path': f'/api/v1/accounts/{acc_id}/deposit', 'body': {'amount': 40}},
+        {'id': 'account', 'method': 'GET', 'path': f'/api/v1/accounts/{acc_id}'},
+        {'id': 'admin', 'method': 'GET', 'path': '/api/v1/admin/profiles'},
+    ]})
+    assert resp.status_code == 200
+    deposit, account, admin = resp.get_json()['responses']
+    assert deposit['id'] == 'deposit' and deposit['status'] == 200
+    direct = client.get(f'/api/v1/accounts/{acc_id}', headers=headers)
+    assert account['body'] == direct.get_json() and account['body']['balance'] == deposit['body']['balance'] # read sees the write before it
+    assert account['headers']['ETag'] == direct.headers['ETag']
+    assert admin['status'] == 403 # each sub-request keeps its own route's checks
+
+    cached = client.post('/api/v1/batch', headers=headers, json={'requests': [
+        {'path': f'/api/v1/accounts/{acc_id}', 'headers': {'If-None-Match': direct.headers['ETag']}}]})
+    assert cached.get_json()['responses'][0]['status'] == 304
+
+
+def test_concurrent_reads(batch_client):
+    client, headers, acc_id = batch_client
+    paths = ['/api/v1/accounts', '/api/v1/dashboard/summary', '/api/v1/loans', '/api/v1/users/profile']
+    resp = client.post('/api/v1/batch', headers=headers, json={'concurrent': True, 'requests': [{'path': pp} for pp in paths]})
+    assert resp.status_code == 200 and int(resp.headers['X-Query-Count']) >= len(paths) # summed over the pool threads
+    bodies = [rr['body'] for rr in resp.get_json()['responses']]
+    assert bodies == [client.get(pp, headers=headers).get_json() for pp in paths]
+
+    write = {'method': 'POST', 'path': f'/api/v1/accounts/{acc_id}/deposit', 'body': {'amount': 1}}
+    assert client.post('/api/v1/batch', headers=headers, json={'concurrent': True, 'requests': [write]}).status_code == 400
+
+
+@pytest.mark.parametrize('body, status', [
+    ({'requests': []}, 400),
+    ({'requests': [{'method': 'POST', 'path': '/api/v1/batch'}]}, 400),
+    ({'requests': [{'path': '/api/v1/events/stream'}]}, 400),
+    ({'requests': [{'method': 'POST', 'path': '/api/v1/%62atch', 'body': {'requests': [{'path': '/api/v1/accounts'}]}}]}, 400), # encoded → same route
+    ({'requests': [{'path': '/api/v1/%65vents/stream'}]}, 400),
+    ({'requests': [{'path': '/health'}]}, 400),
+    ({'requests': [{'method': 'TRACE', 'path': '/api/v1/accounts'}]}, 400),
+    ({'requests': [{'path': '/api/v1/accounts'}] * 21}, 400),
+])
+def test_invalid_batches_are_rejected(batch_client, body, status):
+    client, headers, _ = batch_client
+    assert client.post('/api/v1/batch', headers=headers, json=body).status_code == status
+    assert client.post('/api/v1/batch', json={'requests': [{'path': '/api/v1/accounts'}]}).status_code == 401
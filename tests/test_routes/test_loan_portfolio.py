@@ -0,0 +1,38 @@
+import pytest
+from src.models import db, Loan, User
+from src.utils.jwt_auth import generate_token
+
+
+@pytest.fixture
+def admin_client(make_app):
+    app = make_app()
+    with app.app_context():
+        admin = User.query.filter_by(username='admin').first()
+        headers = {'Authorization': f'Bearer {generate_token(admin.user_id, admin.username, admin.role)}'}
+    return app.test_client(), headers
+
+
+@pytest.mark.parametrize('months, status', [('1', 200), ('600', 200), ('0', 400), ('601', 400), ('10000000', 400)])
+def test_portfolio_months_bounds(admin_client, months, status):
+    client, headers = admin_client
+    assert client.get(f'/api/v1/loans/portfolio?months={months}', headers=headers).status_code == status
+
+
+@pytest.mark.parametrize('term, status', [(12, 201), (600, 201), (0, 400), (-5, 400), (601, 400), (3000000, 400), ('x', 400)])
+def test_loan_term_bounds(admin_client, term, status):
+    client, headers = admin_client
+    body = {'loan_type': 'Personal', 'amount': 1000, 'interest_rate': 5, 'term_months': term}
+    assert client.post('/api/v1/loans', headers=headers, json=body).status_code == status
+
+
+def test_stored_out_of_range_terms_stay_bounded(admin_client):
+    client, headers = admin_client
+    with client.application.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        loan = Loan(user_id=uid, loan_type='Personal', amount=1000, interest_rate=5, term_months=12, status='active')
+        loan.term_months = 3000000 # written before the bound existed
+        db.session.add(loan)
+        db.session.commit()
+        loan_id = loan.loan_id
+    assert client.get(f'/api/v1/loans/{loan_id}/schedule', headers=headers).status_code == 400
+    assert client.get('/api/v1/loans/portfolio', headers=headers).get_json()['horizon_months'] == 600
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from src.core.Loan import Loan
+from src.utils.amortization import monthly_payments, amortize, portfolio_cashflows
+
+
+def test_payments_match_scalar_loan_formula():
+    loans = [Loan('u', 'Personal', 10000, 5.5, 36), Loan('u', 'Home', 250000, 3.2, 360), Loan('u', 'Auto', 1200, 0, 12)]
+    vec = monthly_payments([l.amount for l in loans], [l.interest_rate for l in loans], [l.term_months for l in loans])
+    assert np.allclose(np.round(vec, 2), [l.calculate_monthly_payment() for l in loans])
+
+
+def test_schedule_pays_down_to_zero():
+    sched = amortize([10000, 1200], [5.5, 0], [36, 12])
+    assert sched['balance'].shape == (2, 36)
+    assert np.allclose(sched['principal'].sum(axis=1), [10000, 1200])
+    assert np.allclose(sched['balance'][:, -1], 0)
+    assert np.all(sched['principal'][1, 12:] == 0)  # months past term are zero
+    assert np.allclose(sched['interest'][0, 0], 10000 * 0.055 / 12)
+    assert np.allclose(sched['interest'] + sched['principal'], np.where(np.arange(36) < [[36], [12]], sched['payment'][:, None], 0))
+
+
+def test_portfolio_chunking_matches_single_pass():
+    rng = np.random.default_rng(7)
+    p, r, n = rng.uniform(1e3, 1e5, 500), rng.uniform(0, 10, 500), rng.choice([12, 60, 120], 500)
+    flows = portfolio_cashflows(p, r, n, chunk_size=64)
+    full = amortize(p, r, n)
+    assert np.allclose(flows['balance'], full['balance'].sum(axis=0))
+    assert np.allclose(flows['loan_interest'], full['interest'].sum(axis=1))
+    assert np.isclose(flows['principal'].sum(), p.sum())
+
+
+def test_rejects_bad_input():
+    with pytest.raises(ValueError): amortize([1000], [5], [0])
+    with pytest.raises(ValueError): monthly_payments([1000, 2000], [5], [12])
@@ -0,0 +1,38 @@
+from src.utils.cache import LRUTTLCache
+
+
+class FakeClock:
+    def __init__(self): self.now = 0.0
+    def __call__(self): return self.now
+
+
+def test_hit_miss_and_lru_eviction():
+    cache = LRUTTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # a is now most recent
+    cache.set('c', 3)           # evicts b
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['size']) == (2, 1, 1, 2)
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = LRUTTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set('a', 1)
+    clock.now = 4.9
+    assert cache.get('a') == 1
+    clock.now = 5.0
+    assert cache.get('a', 'gone') == 'gone'
+    assert cache.stats()['expirations'] == 1
+
+
+def test_pop_and_disabled_cache():
+    cache = LRUTTLCache(maxsize=10)
+    cache.set('a', 1)
+    assert cache.pop('a') == 1 and cache.pop('a') is None
+    off = LRUTTLCache(maxsize=0)
+    off.set('a', 1)
+    assert off.get('a') is None
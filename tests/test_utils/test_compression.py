@@ -0,0 +1,35 @@
+import gzip
+import json
+import pytest
+from src.models import Account, User
+from src.managers.AccountManager import AccountManager
+from src.utils import compression
+from src.utils.jwt_auth import generate_token
+
+
+@pytest.fixture
+def client_and_headers(make_app):
+    app = make_app(COMPRESS_MIN_SIZE=800)
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        acc_id = Account.query.filter_by(user_id=user.user_id).first().account_id
+        for i in range(20): AccountManager().deposit(acc_id, 10 + i, f'deposit {i}')
+        headers = {'Authorization': f'Bearer {generate_token(user.user_id, user.username, user.role)}'}
+    return app, app.test_client(), headers
+
+
+def test_json_is_gzipped_above_threshold_only(client_and_headers, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None) # gzip only, whether or not brotli is installed
+    app, client, headers = client_and_headers
+    plain = client.get('/api/v1/accounts/user/transactions', headers=headers)
+    assert 'Content-Encoding' not in plain.headers and 'Accept-Encoding' in plain.headers['Vary']
+
+    resp = client.get('/api/v1/accounts/user/transactions', headers={**headers, 'Accept-Encoding': 'br, gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert int(resp.headers['Content-Length']) == len(resp.data) < len(plain.data) / 3
+    assert json.loads(gzip.decompress(resp.data)) == plain.get_json()
+
+    small = client.get('/health', headers={'Accept-Encoding': 'gzip'}) # below COMPRESS_MIN_SIZE
+    assert 'Content-Encoding' not in small.headers
+    refused = client.get('/api/v1/accounts/user/transactions', headers={**headers, 'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers
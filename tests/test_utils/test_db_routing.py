@@ -0,0 +1,43 @@
+import pytest
+from src.models import db, User
+from src.utils.db_routing import REPLICA_BIND, replica_session
+
+
+@pytest.fixture
+def replica_app(make_app, tmp_path):
+    # two local sqlite files -- primary gets the seed data, replica only the schema
+    app = make_app(DATABASE_READ_URL=f"sqlite:///{tmp_path / 'replica.db'}", DB_POOL_SIZE=3, DB_POOL_TIMEOUT=7)
+    with app.app_context():
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+    return app
+
+
+def test_pool_options_from_env(replica_app):
+    opts = replica_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+    assert opts['pool_size'] == 3 and opts['pool_timeout'] == 7 and opts['pool_pre_ping'] is True
+    assert 'max_overflow' not in opts
+
+
+def test_reads_default_to_primary(replica_app):
+    with replica_app.app_context():
+        assert User.query.count() == 2
+
+
+def test_replica_session_routes_selects(replica_app):
+    with replica_app.app_context():
+        with replica_session(): assert User.query.count() == 0
+        assert User.query.count() == 2
+
+
+def test_read_your_writes_after_flush(replica_app):
+    with replica_app.app_context():
+        with replica_session():
+            db.session.add(User(username='rw', password='pwd123', email='rw@example.com', full_name='R W'))
+            db.session.commit()
+            assert User.query.count() == 3  # session wrote → primary
+
+
+def test_health_reads_replica(replica_app):
+    resp = replica_app.test_client().get('/health')
+    assert resp.status_code == 200
+    assert resp.get_json()['users'] == 0 and resp.get_json()['replica'] is True
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+import pytest
+from src.models import db, Account, Loan, User
+from src.managers.AccountManager import AccountManager, account_ref_cache
+from src.managers.LoanAccrualManager import LoanAccrualManager
+from src.utils.etags import current_version, user_scope
+from src.utils.jwt_auth import generate_token
+
+
+@pytest.fixture
+def etag_app(make_app):
+    app = make_app()
+    with app.app_context():
+        users = {uu.role: uu for uu in User.query.all()}
+        ids = {role: uu.user_id for role, uu in users.items()}
+        headers = {role: {'Authorization': f'Bearer {generate_token(uu.user_id, uu.username, uu.role)}'} for role, uu in users.items()}
+        db.session.add(Account(ids['admin'], 'Checking', 100))
+        db.session.commit()
+        accounts = {role: Account.query.filter_by(user_id=uid).first().account_id for role, uid in ids.items()}
+    return app, app.test_client(), ids, headers, accounts
+
+
+def test_unchanged_reads_answer_304_without_loading_rows(etag_app):
+    app, client, ids, headers, accounts = etag_app
+    for url in ('/api/v1/accounts', f"/api/v1/accounts/{accounts['user']}", '/api/v1/users/profile', '/api/v1/loans'):
+        first = client.get(url, headers=headers['user'])
+        assert first.status_code == 200 and first.headers['Cache-Control'] == 'private, no-cache'
+        again = client.get(url, headers={**headers['user'], 'If-None-Match': first.headers['ETag']})
+        assert again.status_code == 304 and again.data == b''
+        assert again.headers['ETag'] == first.headers['ETag']
+        assert int(again.headers['X-Query-Count']) <= 2 # owner lookup + version counter, nothing else
+
+    first = client.get('/api/v1/accounts', headers=headers['user'])
+    with app.app_context(): AccountManager().transfer(accounts['admin'], accounts['user'], 5) # somebody else's transfer lands here
+    changed = client.get('/api/v1/accounts', headers={**headers['user'], 'If-None-Match': first.headers['ETag']})
+    assert changed.status_code == 200 and changed.headers['ETag'] != first.headers['ETag']
+
+
+def test_tag_is_per_caller_and_admin_lists_are_untagged(etag_app):
+    app, client, ids, headers, accounts = etag_app
+    url = f"/api/v1/accounts/{accounts['user']}"
+    admin_tag = client.get(url, headers=headers['admin']).headers['ETag']
+    assert client.get(url, headers={**headers['user'], 'If-None-Match': admin_tag}).status_code == 200
+    assert 'ETag' not in client.get('/api/v1/accounts?all=true', headers=headers['admin']).headers
+    assert 'ETag' not in client.get(f"/api/v1/accounts/{accounts['admin']}", headers=headers['user']).headers # 403 → no tag
+
+
+def test_revalidation_never_skips_the_access_check(etag_app):
+    app, client, ids, headers, accounts = etag_app
+    with app.app_context():
+        loan = Loan(ids['admin'], 'Personal', 1000, 12, 12)
+        db.session.add(loan)
+        db.session.commit()
+        loan_id = loan.loan_id
+    star = {**headers['user'], 'If-None-Match': '*'}
+    assert client.get(f"/api/v1/accounts/{accounts['admin']}", headers=star).status_code == 403
+    assert client.get(f"/api/v1/loans/{loan_id}", headers=star).status_code == 403
+    assert client.get('/api/v1/accounts/no-such-account', headers=star).status_code == 404
+    assert client.get(f"/api/v1/accounts/{accounts['user']}", headers=star).status_code == 200 # * never stands in for a tag
+
+
+def test_moving_an_account_revalidates_the_old_owner(etag_app):
+    app, client, ids, headers, accounts = etag_app
+    acc_url = f"/api/v1/accounts/{accounts['user']}"
+    with app.app_context(): old_ref = AccountManager().get_account_ref(accounts['user'])
+    tags = {url: client.get(url, headers=headers['user']).headers['ETag'] for url in ('/api/v1/accounts', acc_url)}
+    assert client.put(acc_url, headers=headers['admin'], json={'user_id': ids['admin']}).status_code == 200
+    account_ref_cache.set(accounts['user'], old_ref) # another worker's cache still names the old owner
+    lst = client.get('/api/v1/accounts', headers={**headers['user'], 'If-None-Match': tags['/api/v1/accounts']})
+    assert lst.status_code == 200 and accounts['user'] not in [aa['account_id'] for aa in lst.get_json()['accounts']]
+    assert client.get(acc_url, headers={**headers['user'], 'If-None-Match': tags[acc_url]}).status_code == 403
+
+
+def test_bulk_jobs_bump_owner_versions(etag_app):
+    app, client, ids, headers, accounts = etag_app
+    with app.app_context():
+        loan = Loan(ids['user'], 'Personal', 1000, 12, 12, status='active')
+        loan.approved_at = datetime.utcnow() - timedelta(days=40)
+        db.session.add(loan)
+        db.session.commit()
+        before = current_version(user_scope(ids['user']))
+        LoanAccrualManager().run() # bulk Core UPDATE of loans
+        assert current_version(user_scope(ids['user'])) == before + 1
@@ -0,0 +1,107 @@
+import json
+import pytest
+from src.models import db, Account, User
+from src.managers.AccountManager import AccountManager
+from src.utils.event_bus import EventBus, SQLiteBroker, Subscriber
+from src.utils.jwt_auth import generate_token
+
+
+@pytest.fixture
+def live_app(make_app):
+    app = make_app(EVENT_HEARTBEAT_SECONDS=1)
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        token = generate_token(user.user_id, user.username, user.role)
+        acc_id = Account.query.filter_by(user_id=user.user_id).first().account_id
+    return app, token, acc_id
+
+
+def _events(chunks, n): # next n non-ping SSE events as (type, data)
+    out = []
+    while len(out) < n:
+        chunk = next(chunks).decode()
+        if chunk.startswith(':'): continue
+        fields = dict(line.split(': ', 1) for line in chunk.strip().splitlines() if not line.startswith('retry'))
+        out.append((fields['event'], json.loads(fields['data'])))
+    return out
+
+
+def _ticket(client, token): return client.post('/api/v1/events/ticket', headers={'Authorization': f'Bearer {token}'}).get_json()['ticket']
+
+
+def test_stream_pushes_committed_balance_and_transaction(live_app):
+    app, token, acc_id = live_app
+    client = app.test_client()
+    threaded = {'wsgi.multithread': True}
+    ticket = _ticket(client, token)
+    assert client.get(f'/api/v1/events/stream?ticket={ticket}').status_code == 503 # single-threaded server → no streams, ticket kept
+    assert client.get('/api/v1/events/stream?ticket=nope', environ_overrides=threaded).status_code == 401
+    assert client.get(f'/api/v1/events/stream?token={token}', environ_overrides=threaded).status_code == 401 # access tokens don't open streams
+    assert client.get('/api/v1/accounts', headers={'Authorization': f'Bearer {ticket}'}).status_code in (401, 422) # ...and tickets open nothing else
+
+    resp = client.get(f'/api/v1/events/stream?ticket={ticket}', buffered=False, environ_overrides=threaded)
+    assert resp.status_code == 200 and resp.mimetype == 'text/event-stream'
+    chunks = iter(resp.response)
+    assert _events(chunks, 1)[0][0] == 'ready'
+    with app.app_context(): balance, tx_id = AccountManager().deposit(acc_id, 25)
+    events = dict(_events(chunks, 2))
+    assert events['balance'] == {**events['balance'], 'account_id': acc_id, 'balance': balance}
+    assert events['transaction']['transaction']['transaction_id'] == tx_id
+    resp.close()
+    assert app.extensions['event_bus'].subscriber_count() == 0
+    assert client.get(f'/api/v1/events/stream?ticket={ticket}', environ_overrides=threaded).status_code == 401 # single use
+
+
+def test_rolled_back_changes_are_not_published(live_app):
+    app, token, acc_id = live_app
+    bus = app.extensions['event_bus']
+    with app.app_context():
+        uid = db.session.get(Account, acc_id).user_id
+        sub = bus.subscribe(uid)
+        try:
+            db.session.get(Account, acc_id).balance = 1
+            db.session.flush()
+            db.session.rollback()
+            assert sub.get(0.2) is None
+        finally: bus.unsubscribe(sub)
+
+
+def _drain(sub): # queued events until the subscriber is idle
+    out = []
+    while (event := sub.get(0.2)) is not None: out.append(event)
+    return out
+
+
+def test_transfer_recipients_hear_of_each_transaction_once(live_app):
+    app, token, acc_id = live_app
+    bus = app.extensions['event_bus']
+    with app.app_context():
+        admin_id = User.query.filter_by(username='admin').first().user_id
+        dest = Account(admin_id, 'Checking', 0)
+        db.session.add(dest)
+        db.session.commit()
+        dest_id, sub = dest.account_id, bus.subscribe(admin_id)
+        try:
+            AccountManager().multi_transfer(acc_id, [{'to_account_id': dest_id, 'amount': 5}]) # one sender-side row
+            txs = [ee for ee in _drain(sub) if ee['type'] == 'transaction']
+            assert [tt['transaction']['destination_account_id'] for tt in txs] == [dest_id]
+            AccountManager().transfer(acc_id, dest_id, 5) # a row per side → only the recipient's own
+            txs = [ee for ee in _drain(sub) if ee['type'] == 'transaction']
+            assert [tt['transaction']['account_id'] for tt in txs] == [dest_id]
+        finally: bus.unsubscribe(sub)
+
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    sub = Subscriber('u1', size=3)
+    for i in range(5): sub.offer({'type': 'balance', 'n': i})
+    # 0-2 fill the buffer, 3 overflows → backlog replaced by resync, 4 queues behind it
+    assert [sub.get(0), sub.get(0), sub.get(0)] == [{'type': 'resync'}, {'type': 'balance', 'n': 4}, None]
+
+
+def test_sqlite_broker_fans_out_across_buses(tmp_path):
+    path = str(tmp_path / 'events.db')
+    worker_a, worker_b = EventBus(broker=SQLiteBroker(path, poll_interval=0.01)), EventBus(broker=SQLiteBroker(path, poll_interval=0.01))
+    sub = worker_a.subscribe('u1') # tail thread of worker a starts here
+    worker_b.publish([('u1', {'type': 'transaction', 'n': 1}), ('u2', {'type': 'transaction', 'n': 2})])
+    assert sub.get(2) == {'type': 'transaction', 'n': 1}
+    assert sub.get(0.1) is None # other users' events stay with them
@@ -0,0 +1,78 @@
+import subprocess
+import sys
+import textwrap
+from prometheus_client import multiprocess
+from src.models import Account, User
+from src.utils import metrics
+from src.utils.jwt_auth import generate_token
+
+
+def _sample(text, name, **labels):
+    want = ','.join(f'{kk}="{vv}"' for kk, vv in labels.items())
+    for line in text.splitlines():
+        if line.startswith(f'{name}{{{want}}} ') or (not labels and line.startswith(f'{name} ')): return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+def test_metrics_endpoint_reports_routes_and_money(make_app, monkeypatch):
+    monkeypatch.delenv('PROMETHEUS_MULTIPROC_DIR', raising=False)
+    monkeypatch.setenv('METRICS_TOKEN', 's3cret')
+    app = make_app()
+    client = app.test_client()
+    with app.app_context():
+        user = User.query.filter_by(username='user').first()
+        headers = {'Authorization': f'Bearer {generate_token(user.user_id, user.username, user.role)}'}
+        acc_id = Account.query.first().account_id
+    scrape = {'Authorization': 'Bearer s3cret'}
+    before = client.get('/metrics', headers=scrape).get_data(as_text=True)
+    client.get('/api/v1/dashboard/summary', headers=headers)
+    client.post(f'/api/v1/accounts/{acc_id}/deposit', json={'amount': 12.5}, headers=headers)
+    after = client.get('/metrics', headers=scrape).get_data(as_text=True)
+
+    route = dict(blueprint='dashboard', endpoint='dashboard.get_summary', method='GET')
+    assert _sample(after, 'http_requests_total', **route, status='200') == _sample(before, 'http_requests_total', **route, status='200') + 1
+    assert _sample(after, 'http_request_duration_seconds_count', **route) >= 1
+    assert _sample(after, 'money_amount_total', kind='deposit') - _sample(before, 'money_amount_total', kind='deposit') == 12.5
+    assert _sample(after, 'tx_hash_store_write_seconds_count', mode='single') > _sample(before, 'tx_hash_store_write_seconds_count', mode='single')
+    assert 'endpoint="metrics"' not in after # scrapes don't count themselves
+
+
+def test_metrics_token(make_app, monkeypatch):
+    monkeypatch.setenv('METRICS_TOKEN', 's3cret')
+    client = make_app().test_client()
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer s3cret'}).status_code == 200
+
+
+def test_metrics_admin_only_without_token(make_app, monkeypatch):
+    monkeypatch.delenv('METRICS_TOKEN', raising=False)
+    app = make_app()
+    client = app.test_client()
+    with app.app_context():
+        headers = {uu.role: {'Authorization': f'Bearer {generate_token(uu.user_id, uu.username, uu.role)}'} for uu in User.query.all()}
+    assert client.get('/metrics').status_code == 401 # deny by default
+    assert client.get('/metrics', headers=headers['user']).status_code == 401
+    assert client.get('/metrics', headers=headers['admin']).status_code == 200
+
+
+def test_multiprocess_dir_merges_workers(tmp_path, monkeypatch):
+    worker = textwrap.dedent('''
+        from src.utils.metrics import record_money, BCRYPT_IN_FLIGHT
+        record_money('transfer', 10)
+        BCRYPT_IN_FLIGHT.inc()
+        import os; print(os.getpid())
+    ''')
+    env = {'PROMETHEUS_MULTIPROC_DIR': str(tmp_path), 'PATH': '', 'PYTHONPATH': '.'}
+    pids = [int(subprocess.run([sys.executable, '-c', worker], env=env, check=True, capture_output=True, text=True).stdout) for _ in range(2)]
+
+    monkeypatch.setenv('PROMETHEUS_MULTIPROC_DIR', str(tmp_path))
+    text = metrics.render_latest().decode()
+    assert _sample(text, 'money_movements_total', kind='transfer') == 2
+    assert _sample(text, 'money_amount_total', kind='transfer') == 20
+    assert _sample(text, 'bcrypt_in_flight') == 2
+
+    for pid in pids: multiprocess.mark_process_dead(pid, str(tmp_path)) # what gunicorn.conf.py child_exit does
+    text = metrics.render_latest().decode()
+    assert _sample(text, 'bcrypt_in_flight') == 0 # livesum → dead workers drop out
+    assert _sample(text, 'money_movements_total', kind='transfer') == 2 # counters survive them
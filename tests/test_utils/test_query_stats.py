@@ -0,0 +1,58 @@
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from src.models import db, Account, User
+from src.managers.AccountManager import AccountManager
+from src.utils.jwt_auth import generate_token
+from src.utils.query_stats import assert_max_queries, count_queries
+
+
+@pytest.fixture
+def stats_app(make_app):
+    app = make_app()
+    with app.app_context(): # token straight from generate_token -- the login route's user lookup is patched by other tests
+        user = User.query.filter_by(username='user').first()
+        token = generate_token(user.user_id, user.username, user.role)
+    return app, app.test_client(), {'Authorization': f'Bearer {token}'}
+
+
+def test_response_headers(stats_app):
+    app, client, headers = stats_app
+    resp = client.get('/api/v1/dashboard/summary', headers=headers)
+    assert resp.status_code == 200
+    assert int(resp.headers['X-Query-Count']) >= 2
+    assert resp.headers['Server-Timing'].startswith('db;dur=') and ', app;dur=' in resp.headers['Server-Timing']
+    assert client.get('/health').headers['X-Query-Count'] == '1'
+
+
+def test_slow_queries_logged_with_route(stats_app, caplog):
+    app, client, headers = stats_app
+    app.config['SLOW_QUERY_MS'] = 1e-6
+    with caplog.at_level(logging.WARNING, logger='src.utils.query_stats'):
+        client.get('/api/v1/dashboard/summary', headers=headers)
+    assert any('on GET dashboard.get_summary: SELECT' in rr.getMessage() for rr in caplog.records)
+
+
+def test_assert_max_queries(stats_app):
+    app, client, headers = stats_app
+    with app.app_context():
+        acc_id = Account.query.first().account_id
+        with count_queries() as rec: AccountManager().deposit(acc_id, 5)
+        with assert_max_queries(rec.count): AccountManager().deposit(acc_id, 5) # same path → same count
+        with pytest.raises(AssertionError, match='expected at most 1 queries, got 2'):
+            with assert_max_queries(1):
+                User.query.count()
+                User.query.count()
+
+
+def test_failed_statement_leaves_no_stamp(stats_app):
+    app, client, headers = stats_app
+    with app.app_context():
+        conn = db.session.connection()
+        with count_queries() as rec:
+            with pytest.raises(OperationalError): conn.execute(text('SELECT * FROM no_such_table'))
+            conn.execute(text('SELECT 1'))
+        assert rec.count == 1 # only the statement that finished
+        assert not conn.info.get('query_started') # nothing pooled connections carry into the next request
+        db.session.rollback()
@@ -0,0 +1,52 @@
+import os
+import time
+from src.models import User
+from src.utils.jwt_auth import generate_token
+
+
+def _busy():
+    time.sleep(0.05)
+    return 'done'
+
+
+def _app(make_app, **env):
+    app = make_app(PROFILE_INTERVAL_MS=1, **env)
+    app.add_url_rule('/busy', 'busy', _busy)
+    with app.app_context():
+        admin, user = User.query.filter_by(username='admin').first(), User.query.filter_by(username='user').first()
+        tokens = {uu.role: {'Authorization': f'Bearer {generate_token(uu.user_id, uu.username, uu.role)}'} for uu in (admin, user)}
+    return app, app.test_client(), tokens
+
+
+def test_admin_inline_profile_returns_collapsed_stacks(make_app):
+    app, client, tokens = _app(make_app)
+    resp = client.get('/busy', headers={**tokens['admin'], 'X-Profile': 'inline'})
+    assert resp.status_code == 200 and resp.headers['X-Profile-Status'] == '200'
+    lines = resp.get_data(as_text=True).splitlines()
+    assert int(resp.headers['X-Profile-Samples']) == sum(int(ll.rsplit(' ', 1)[1]) for ll in lines) > 0
+    assert any('tests/test_utils/test_request_profiler.py:_busy' in ll for ll in lines) # root first, leaf last
+
+    plain = client.get('/busy', headers={**tokens['user'], 'X-Profile': 'inline'}) # flag from a non-admin → ignored
+    assert plain.get_data(as_text=True) == 'done' and 'X-Profile-Samples' not in plain.headers
+
+
+def test_profile_file_is_listed_and_served(make_app):
+    app, client, tokens = _app(make_app)
+    resp = client.get('/busy?profile=1', headers=tokens['admin'])
+    assert resp.get_data(as_text=True) == 'done'
+    name = resp.headers['X-Profile-File']
+
+    listed = client.get('/api/v1/admin/profiles', headers=tokens['admin']).get_json()['profiles']
+    assert [pp['name'] for pp in listed] == [name]
+    assert '_busy' in client.get(f'/api/v1/admin/profiles/{name}', headers=tokens['admin']).get_data(as_text=True)
+    assert client.get('/api/v1/admin/profiles/missing.folded', headers=tokens['admin']).status_code == 404
+    assert client.get('/api/v1/admin/profiles', headers=tokens['user']).status_code == 403
+
+
+def test_continuous_mode_samples_one_in_n_into_rotating_buffer(make_app, tmp_path):
+    app, client, tokens = _app(make_app, PROFILE_SAMPLE_RATE=2, PROFILE_ENDPOINTS='busy', PROFILE_BUFFER_BYTES=1, PROFILE_BUFFER_FILES=2)
+    for _ in range(8): assert client.get('/busy').status_code == 200
+    buffer = tmp_path / 'profiles' / f'continuous-{os.getpid()}.folded'
+    # 4 profiled requests, each bigger than the 1 byte limit → current file + 2 rotated copies, the oldest dropped
+    assert sorted(pp.name for pp in buffer.parent.iterdir()) == [buffer.name, f'{buffer.name}.1', f'{buffer.name}.2']
+    assert '_busy' in buffer.read_text()
@@ -0,0 +1,60 @@
+import threading
+from sqlalchemy import text
+from src.models import db, User, Account
+from src.managers.AccountManager import AccountManager
+from src.utils import sqlite_tuning
+
+
+def test_default_mode_untouched(make_app):
+    app = make_app()
+    with app.app_context():
+        assert db.session.execute(text('PRAGMA journal_mode')).scalar() != 'wal'
+
+
+def test_production_mode_pragmas(make_app):
+    app = make_app(SQLITE_PRODUCTION_MODE=1, SQLITE_BUSY_TIMEOUT_MS=1234)
+    with app.app_context():
+        conn = db.session
+        assert conn.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert conn.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+        assert conn.execute(text('PRAGMA busy_timeout')).scalar() == 1234
+
+
+def test_write_lock_held_until_commit(make_app):
+    app = make_app(SQLITE_PRODUCTION_MODE=1)
+    with app.app_context():
+        db.session.add(User(username='lk', password='pwd123', email='lk@example.com', full_name='L K'))
+        db.session.flush()
+        assert sqlite_tuning._write_lock.locked()
+        db.session.commit()
+        assert not sqlite_tuning._write_lock.locked()
+        db.session.add(User(username='lk2', password='pwd123', email='lk2@example.com', full_name='L K'))
+        db.session.flush()
+        db.session.rollback()
+        assert not sqlite_tuning._write_lock.locked()
+
+
+def test_concurrent_transfers_no_lock_errors(make_app, monkeypatch):
+    app = make_app(SQLITE_PRODUCTION_MODE=1)
+    monkeypatch.setattr('src.managers.AccountManager.record_transaction_hash', lambda *a, **k: True)
+    with app.app_context():
+        uid = User.query.filter_by(username='user').first().user_id
+        a, b = Account(user_id=uid, account_type='Checking', balance=1000), Account(user_id=uid, account_type='Checking', balance=1000)
+        db.session.add_all([a, b])
+        db.session.commit()
+        ids = (a.account_id, b.account_id)
+
+    errors = []
+    def worker(i):
+        with app.app_context():
+            for _ in range(10):
+                try: AccountManager().transfer(ids[i % 2], ids[(i + 1) % 2], 1.0)
+                except Exception as e: errors.append(e)
+                finally: db.session.remove()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(6)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert errors == []
+    with app.app_context():
+        assert sum(float(acc.balance) for acc in Account.query.filter(Account.account_id.in_(ids))) == 2000
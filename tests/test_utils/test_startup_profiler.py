@@ -0,0 +1,38 @@
+import sys
+import json
+from src.utils.startup_profiler import StartupProfiler
+
+
+def test_disabled_profiler_is_noop():
+    profiler = StartupProfiler(enabled=False).start()
+    with profiler.phase('config'): pass
+    profiler.stop()
+    assert profiler.report() == {'total_ms': 0.0, 'phases': {}, 'imports': {}}
+
+
+def test_records_imports_and_phases(tmp_path, monkeypatch):
+    (tmp_path / 'sp_fake_child.py').write_text('import time\ntime.sleep(0.01)\n')
+    (tmp_path / 'sp_fake_parent.py').write_text('import sp_fake_child\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = StartupProfiler().start()
+    try:
+        with profiler.phase('extensions'):
+            import sp_fake_parent  # noqa: F401
+    finally:
+        profiler.stop()
+        sys.modules.pop('sp_fake_parent', None)
+        sys.modules.pop('sp_fake_child', None)
+
+    report = profiler.report()
+    parent, child = report['imports']['sp_fake_parent'], report['imports']['sp_fake_child']
+    assert child['cumulative_ms'] >= 10
+    assert parent['cumulative_ms'] >= child['cumulative_ms']
+    assert parent['self_ms'] < child['cumulative_ms']  # child time not double counted
+    assert report['phases']['extensions'] >= 10
+    assert profiler._timer not in sys.meta_path
+
+    out = tmp_path / 'report.json'
+    profiler.write_report(str(out))
+    assert json.loads(out.read_text())['imports']['sp_fake_child'] == child
+    assert 'sp_fake_parent' in profiler.format_report()
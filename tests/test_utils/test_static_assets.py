@@ -0,0 +1,58 @@
+import gzip
+import json
+import os
+import pytest
+from src.utils import compression
+from src.utils.static_assets import AssetManifest
+
+
+@pytest.fixture
+def static_app(make_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None) # gzip only, whether or not brotli is installed
+    static = tmp_path / 'static'
+    (static / 'js').mkdir(parents=True)
+    (static / 'index.html').write_text('<script src="js/app.js"></script>')
+    (static / 'js' / 'app.js').write_text('console.log("hello");\n' * 100)
+    (static / 'build' / 'js').mkdir(parents=True) # what scripts/build_static.py leaves behind
+    (static / 'build' / 'js' / 'app.0123abcd.js').write_text('console.log("hello");\n' * 100)
+    (static / 'build' / 'index.html').write_text('<script src="js/app.0123abcd.js"></script>')
+    (static / 'build' / 'manifest.json').write_text(json.dumps({'index': 'index.html', 'assets': {'js/app.js': 'js/app.0123abcd.js'}}))
+    app = make_app()
+    app.static_folder = str(static)
+
+    def reload():
+        app.extensions['static_assets'] = AssetManifest(app.static_folder)
+        return app.test_client()
+    return static, reload
+
+
+def test_hashed_assets_are_immutable_and_index_is_rewritten(static_app):
+    static, reload = static_app
+    client = reload()
+    hashed = client.get('/js/app.0123abcd.js')
+    assert hashed.status_code == 200 and hashed.mimetype in ('text/javascript', 'application/javascript')
+    assert hashed.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+    for path in ('/', '/index.html', '/accounts/deep/link', '/manifest.json', '/build/index.html'): # SPA fallback, build/ only via the manifest
+        resp = client.get(path)
+        assert resp.status_code == 200 and resp.data == b'<script src="js/app.0123abcd.js"></script>', path
+        assert 'immutable' not in resp.headers.get('Cache-Control', '')
+    assert 'immutable' not in client.get('/js/app.js').headers.get('Cache-Control', '') # sources still served, revalidated
+
+    os.remove(static / 'build' / 'manifest.json') # no build → sources as-is
+    assert reload().get('/').data == b'<script src="js/app.js"></script>'
+
+
+def test_fresh_precompressed_variant_is_served(static_app):
+    static, reload = static_app
+    asset = static / 'build' / 'js' / 'app.0123abcd.js'
+    (static / 'build' / 'js' / 'app.0123abcd.js.gz').write_bytes(gzip.compress(asset.read_bytes()))
+    client = reload()
+    resp = client.get('/js/app.0123abcd.js', headers={'Accept-Encoding': 'gzip'})
+    assert resp.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in resp.headers['Vary']
+    assert gzip.decompress(resp.data) == asset.read_bytes()
+    assert 'Content-Encoding' not in client.get('/js/app.0123abcd.js').headers
+
+    os.utime(asset, (os.path.getmtime(asset) + 10,) * 2) # asset newer than its variant → stale, ignored
+    stale = reload().get('/js/app.0123abcd.js', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in stale.headers and stale.data == asset.read_bytes()
@@ -0,0 +1,58 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+from src.utils.tx_legs import signed_legs
+
+Row = namedtuple('Row', 'transaction_id account_id transaction_type amount destination_account_id created_at description')
+T0 = datetime(2025, 3, 1, 12, 0, 0)
+
+
+def _net(rows):
+    net = {}
+    for _, acc, amount, _ in signed_legs(rows): net[acc] = net.get(acc, 0) + amount
+    return net
+
+
+def test_deposit_withdrawal_interest():
+    rows = [Row('1', 'A', 'deposit', 100, None, T0, 'deposit'), Row('2', 'A', 'withdrawal', 30, None, T0, 'w'), Row('3', 'A', 'interest', 1.5, None, T0, 'i')]
+    assert _net(rows) == {'A': 71.5}
+
+
+def test_transfer_pair_counts_once():
+    us = timedelta(microseconds=20)
+    rows = [Row('in', 'B', 'transfer', 40, 'A', T0 + us, 'rent'), Row('out', 'A', 'transfer', 40, 'B', T0, 'rent')]
+    assert _net(rows) == {'A': -40, 'B': 40}
+
+
+def test_equal_timestamps_use_default_in_description():
+    rows = [Row('z', 'A', 'transfer', 40, 'B', T0, 'transfer'), Row('a', 'B', 'transfer', 40, 'A', T0, 'transfer in')]
+    assert _net(rows) == {'A': -40, 'B': 40}
+
+
+def test_single_row_transfers_and_round_trips():
+    rows = [
+        Row('m1', 'A', 'transfer', 10, 'B', T0, 'multi-transfer'), # multi_transfer → one row
+        Row('m2', 'A', 'transfer', 10, 'C', T0 + timedelta(microseconds=5), 'multi-transfer'),
+        # B sends the 10 back a minute later through transfer() → out + in rows
+        Row('o', 'B', 'transfer', 10, 'A', T0 + timedelta(minutes=1), 'back'),
+        Row('i', 'A', 'transfer', 10, 'B', T0 + timedelta(minutes=1, microseconds=9), 'back'),
+    ]
+    assert _net(rows) == {'A': -10, 'B': 0, 'C': 10}
+
+
+def test_ledger_link_beats_timing():
+    Linked = namedtuple('Linked', Row._fields + ('linked', 'moves'))
+    rows = [ # two multi-transfers a microsecond apart, back and forth -- timing alone reads the second as a mirror
+        Linked('m1', 'A', 'transfer', 10, 'B', T0, 'multi-transfer', True, True),
+        Linked('m2', 'B', 'transfer', 10, 'A', T0 + timedelta(microseconds=1), 'multi-transfer', True, True),
+    ]
+    assert _net(rows) == {'A': 0, 'B': 0}
+    assert _net([Row(*rr[:7]) for rr in rows]) == {'A': -10, 'B': 10} # unlinked legacy rows → paired
+
+
+def test_is_mirror_compiles_for_any_dialect():
+    from sqlalchemy import select
+    from sqlalchemy.dialects import mysql
+    from src.models import Transaction
+    from src.utils.tx_legs import is_mirror
+    t = Transaction.__table__.alias('t')
+    assert 'EXISTS' in str(select(t.c.transaction_id).where(is_mirror(t, 'mysql')).compile(dialect=mysql.dialect()))